@@ -311,6 +311,8 @@ class SummaryCfdaNumbersView(models.Model):
 class SummaryTransactionMonthView(models.Model):
     action_date = models.DateField()
     fiscal_year = models.IntegerField()
+    fiscal_quarter = models.IntegerField()
+    fiscal_month = models.IntegerField()
     type = models.TextField()
     pulled_from = models.TextField()
 
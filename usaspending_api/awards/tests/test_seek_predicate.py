@@ -0,0 +1,22 @@
+from usaspending_api.awards.v2.filters.filter_helpers import seek_predicate
+
+
+def test_seek_predicate_row_comparison():
+    sql, params = seek_predicate(['a', 'b', 'id'], [1, 2, 3], descending=True)
+    assert sql == '((a, b, id) < (%s, %s, %s))'
+    assert params == [1, 2, 3]
+
+    # ascending, NULLs are ordered after every value
+    sql, params = seek_predicate(['a', 'b', 'id'], [1, 2, 3])
+    assert sql == '((a, b, id) > (%s, %s, %s) OR (a IS NULL) OR (a = %s AND b IS NULL))'
+    assert params == [1, 2, 3, 1]
+
+
+def test_seek_predicate_null_values():
+    sql, params = seek_predicate(['a', 'id'], [None, 3])
+    assert sql == '(a IS NULL AND ((id) > (%s)))'
+    assert params == [3]
+
+    sql, params = seek_predicate(['a', 'id'], [None, 3], descending=True)
+    assert sql == '(a IS NOT NULL OR (a IS NULL AND ((id) < (%s))))'
+    assert params == [3]
@@ -0,0 +1,33 @@
+import pytest
+
+from usaspending_api.awards.v2.filters import view_selector
+from usaspending_api.common.exceptions import InvalidParameterException
+
+
+@pytest.fixture
+def row_estimates(monkeypatch):
+    estimates = {}
+    monkeypatch.setattr(view_selector, 'get_row_estimate', lambda view: estimates.get(view))
+    return estimates
+
+
+def test_plan_view_chooses_fewest_rows(row_estimates):
+    filters = {'time_period': [{'start_date': '2017-10-01', 'end_date': '2018-09-30'}]}
+    row_estimates.update({'SummaryView': 5000, 'SummaryTransactionGeoView': 1000, 'UniversalTransactionView': 10})
+
+    assert view_selector.plan_view(filters, view_selector.TRANSACTION_VIEWS) == 'UniversalTransactionView'
+
+
+def test_plan_view_only_chooses_views_supporting_filters(row_estimates):
+    filters = {'naics_codes': ['336411']}
+    row_estimates.update({'SummaryView': 10, 'SummaryTransactionView': 1000})
+
+    assert view_selector.plan_view(filters, view_selector.TRANSACTION_VIEWS) == 'SummaryTransactionView'
+
+
+def test_plan_view_without_estimates_keeps_listed_order(row_estimates):
+    assert view_selector.plan_view({}, view_selector.TRANSACTION_VIEWS) == 'SummaryView'
+    assert view_selector.plan_view({}, view_selector.AWARD_VIEWS, columns=['counts']) == 'SummaryAwardView'
+
+    with pytest.raises(InvalidParameterException):
+        view_selector.plan_view({'keyword': 'test'}, view_selector.TRANSACTION_VIEWS, columns=['no_such_column'])
@@ -1,4 +1,4 @@
-from django.db.models import Sum, F, Q, Case, When
+from django.db.models import Sum, F, Q, Case, When, Func, IntegerField
 from django.db.models.functions import Coalesce
 
 from usaspending_api.common.exceptions import InvalidParameterException
@@ -11,6 +11,36 @@ from usaspending_api.awards.v2.lookups.lookups import award_type_mapping, loan_t
 from usaspending_api.awards.models import TransactionNormalized
 
 
+class FiscalMonth(Func):
+    """Fiscal month (October is 1) of a date, computed the same way as summary_transaction_month_view.fiscal_month"""
+    template = '(MOD(CAST(EXTRACT(MONTH FROM %(expressions)s) AS INTEGER) + 2, 12) + 1)'
+
+    def __init__(self, expression, **extra):
+        super(FiscalMonth, self).__init__(expression, output_field=IntegerField(), **extra)
+
+
+class FiscalQuarter(Func):
+    """Fiscal quarter (October to December is 1) of a date"""
+    template = '((MOD(CAST(EXTRACT(MONTH FROM %(expressions)s) AS INTEGER) + 2, 12) + 3) / 3)'
+
+    def __init__(self, expression, **extra):
+        super(FiscalQuarter, self).__init__(expression, output_field=IntegerField(), **extra)
+
+
+FISCAL_PERIODS = {'month': FiscalMonth, 'quarter': FiscalQuarter}
+
+
+def fiscal_period(model, period):
+    """
+    Expression for the fiscal 'month' or 'quarter' of a view's action_date, using the view's precomputed fiscal_month
+    or fiscal_quarter column when it has one
+    """
+    column = 'fiscal_' + period
+    if column in {field.name for field in model._meta.get_fields()}:
+        return F(column)
+    return FISCAL_PERIODS[period]('action_date')
+
+
 def date_or_fy_queryset(date_dict, table, fiscal_year_column, action_date_column):
     full_fiscal_years = []
     for v in date_dict:
@@ -182,3 +212,40 @@ def can_use_total_obligation_enum(amount_obj):
     except Exception:
         pass
     return False
+
+
+def seek_predicate(columns, values, descending=False):
+    """
+    SQL (and params) for keyset pagination, matching the rows ordered after the row with these values of the ordered
+    columns. The last column must be unique and not null. NULLs are placed where Postgres orders them: last ascending
+    and first descending
+    """
+    op = '<' if descending else '>'
+    if None not in values:
+        sql = '({}) {} ({})'.format(', '.join(columns), op, ', '.join(['%s'] * len(values)))
+        params = list(values)
+        if not descending:
+            # rows with a NULL after the equal columns are ordered last, but compare as NULL
+            for i, column in enumerate(columns[:-1]):
+                conditions = ['{} = %s'.format(equal_column) for equal_column in columns[:i]]
+                sql += ' OR ({})'.format(' AND '.join(conditions + ['{} IS NULL'.format(column)]))
+                params += values[:i]
+        return '({})'.format(sql), params
+
+    column, value = columns[0], values[0]
+    rest_sql, rest_params = seek_predicate(columns[1:], values[1:], descending)
+    if value is None and descending:
+        return '({0} IS NOT NULL OR ({0} IS NULL AND {1}))'.format(column, rest_sql), rest_params
+    elif value is None:
+        return '({} IS NULL AND {})'.format(column, rest_sql), rest_params
+    elif descending:
+        return '({0} < %s OR ({0} = %s AND {1}))'.format(column, rest_sql), [value, value] + rest_params
+    return '({0} > %s OR {0} IS NULL OR ({0} = %s AND {1}))'.format(column, rest_sql), [value, value] + rest_params
+
+
+def seek_after(queryset, fields, values, descending=False):
+    """Filters a queryset ordered by fields to the rows after the row with these values, see seek_predicate()"""
+    model = queryset.model
+    columns = ['"{}"."{}"'.format(model._meta.db_table, model._meta.get_field(field).column) for field in fields]
+    sql, params = seek_predicate(columns, values, descending)
+    return queryset.extra(where=[sql], params=params)
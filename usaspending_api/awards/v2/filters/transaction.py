@@ -1,4 +1,3 @@
-import itertools
 import logging
 
 from django.db.models import Q
@@ -111,14 +110,11 @@ def transaction_filter(filters):
 
         elif key == "elasticsearch_keyword":
             keyword = value
-            transaction_ids = elasticsearch_helper.get_download_ids(keyword=keyword, field='transaction_id')
-            # flatten IDs
-            transaction_ids = list(itertools.chain.from_iterable(transaction_ids))
-            logger.info('Found {} transactions based on keyword: {}'.format(len(transaction_ids), keyword))
-            transaction_ids = [str(transaction_id) for transaction_id in transaction_ids]
+            # the IDs are streamed from ES into a table, rather than written into the query
+            ids_table = elasticsearch_helper.store_download_ids(keyword=keyword, field='transaction_id')
             queryset = queryset.filter(id__isnull=False)
             queryset &= queryset.extra(
-                where=['"transaction_normalized"."id" = ANY(\'{{{}}}\'::int[])'.format(','.join(transaction_ids))])
+                where=['"transaction_normalized"."id" IN (SELECT id FROM {})'.format(ids_table)])
 
         # time_period
         elif key == "time_period":
@@ -11,10 +11,27 @@ from usaspending_api.awards.models_matviews import UniversalTransactionView
 from usaspending_api.awards.v2.filters.filter_helpers import can_use_month_aggregation, can_use_total_obligation_enum
 from usaspending_api.awards.v2.filters.matview_filters import matview_search_filter
 from usaspending_api.common.exceptions import InvalidParameterException
+from django.db import connections, router
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Row estimates only change when a matview is refreshed and analyzed, so they're only looked up hourly
+ROW_ESTIMATE_TIMEOUT = 3600
+ROW_ESTIMATE_SQL = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+row_estimates = {}
+
+# Views which contain every transaction, at some grain, so that their totals are the same
+TRANSACTION_VIEWS = [
+    'SummaryView',
+    'SummaryTransactionGeoView',
+    'SummaryTransactionMonthView',
+    'SummaryTransactionView',
+    'UniversalTransactionView'
+]
+AWARD_VIEWS = ['SummaryAwardView', 'UniversalAwardView']
+
 MATVIEW_SELECTOR = {
     'SummaryView': {
         'allowed_filters': ['time_period', 'award_type_codes', 'agencies'],
@@ -205,92 +222,71 @@ def can_use_view(filters, view_name):
     return True
 
 
-def spending_over_time(filters):
-    view_chain = [
-        'SummaryView',
-        'SummaryTransactionGeoView',
-        'SummaryTransactionMonthView',
-        'SummaryTransactionView',
-        'UniversalTransactionView'
-    ]
-    for view in view_chain:
-        if can_use_view(filters, view):
-            queryset = get_view_queryset(filters, view)
-            break
-    else:
-        raise InvalidParameterException
+def get_row_estimate(view_name):
+    """Returns the planner's estimate of a view's rows from pg_class, or None if it hasn't been analyzed"""
+    model = MATVIEW_SELECTOR[view_name]['model']
+    table = model._meta.db_table
+    expires, rows = row_estimates.get(table, (0, None))
+    if expires < time.time():
+        try:
+            with connections[router.db_for_read(model)].cursor() as cursor:
+                cursor.execute(ROW_ESTIMATE_SQL, [table])
+                row = cursor.fetchone()
+            rows = row[0] if row and row[0] > 0 else None
+        except Exception:
+            logger.exception('Unable to estimate the rows of {}'.format(table))
+            rows = None
+        row_estimates[table] = (time.time() + ROW_ESTIMATE_TIMEOUT, rows)
+    return rows
 
-    return queryset
 
+def has_columns(view_name, columns):
+    field_names = {field.name for field in MATVIEW_SELECTOR[view_name]['model']._meta.get_fields()}
+    return set(columns) <= field_names
 
-def spending_by_geography(filters):
-    view_chain = [
-        'SummaryTransactionGeoView',
-        'SummaryTransactionMonthView',
-        'SummaryTransactionView',
-        'UniversalTransactionView'
-    ]
-    model = None
-    for view in view_chain:
-        if can_use_view(filters, view):
-            queryset = get_view_queryset(filters, view)
-            model = view
-            break
-    else:
+
+def plan_view(filters, views, columns=()):
+    """
+    Returns the name of the view, out of views, with the fewest estimated rows which supports the filters and has all
+    of the columns grouped on or aggregated. Views without estimates are only chosen after those with them, in the
+    order they're listed
+    """
+    candidates = [view for view in views if can_use_view(filters, view) and has_columns(view, columns)]
+    if not candidates:
         raise InvalidParameterException
+    estimates = {view: get_row_estimate(view) for view in candidates}
+    view = min(candidates, key=lambda view: (estimates[view] is None, estimates[view] or 0, views.index(view)))
+    logger.debug('Planned {} with an estimated {} rows'.format(view, estimates[view]))
+    return view
 
-    return queryset, model
 
+def get_plan_header(model):
+    """Value of the Matview-Plan debug header describing the view a queryset was planned on"""
+    table = model._meta.db_table
+    return '{}; estimated-rows={}'.format(table, row_estimates.get(table, (0, None))[1])
 
-def spending_by_award_count(filters):
-    view_chain = ['SummaryAwardView', 'UniversalAwardView']
-    model = None
-    for view in view_chain:
-        if can_use_view(filters, view):
-            queryset = get_view_queryset(filters, view)
-            model = view
-            break
-    else:
-        raise InvalidParameterException
 
-    return queryset, model
+def spending_over_time(filters, columns=()):
+    view = plan_view(filters, TRANSACTION_VIEWS, columns)
+    return get_view_queryset(filters, view)
 
 
-def download_transaction_count(filters):
-    view_chain = [
-        'SummaryView',
-        'SummaryTransactionGeoView',
-        'SummaryTransactionMonthView',
-        'SummaryTransactionView',
-        'UniversalTransactionView'
-    ]
-    model = None
-    for view in view_chain:
-        if can_use_view(filters, view):
-            queryset = get_view_queryset(filters, view)
-            model = view
-            break
-    else:
-        raise InvalidParameterException
+def spending_by_geography(filters):
+    # SummaryView has no locations to aggregate by
+    view = plan_view(filters, TRANSACTION_VIEWS[1:])
+    return get_view_queryset(filters, view), view
 
-    return queryset, model
 
+def spending_by_award_count(filters):
+    view = plan_view(filters, AWARD_VIEWS)
+    return get_view_queryset(filters, view), view
 
-def transaction_spending_summary(filters):
-    view_chain = [
-        'SummaryView',
-        'SummaryTransactionGeoView',
-        'SummaryTransactionMonthView',
-        'SummaryTransactionView',
-        'UniversalTransactionView'
-    ]
-    model = None
-    for view in view_chain:
-        if can_use_view(filters, view):
-            queryset = get_view_queryset(filters, view)
-            model = view
-            break
-    else:
-        raise InvalidParameterException
 
-    return queryset, model
+def download_transaction_count(filters):
+    view = plan_view(filters, TRANSACTION_VIEWS)
+    return get_view_queryset(filters, view), view
+
+
+def transaction_spending_summary(filters):
+    view = plan_view(filters, TRANSACTION_VIEWS)
+    return get_view_queryset(filters, view), view
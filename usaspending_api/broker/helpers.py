@@ -1,4 +1,9 @@
+from collections import OrderedDict
 from distutils.util import strtobool
+from django.db import connections, transaction
+
+from usaspending_api.awards.models import TransactionNormalized
+from usaspending_api.broker.models import ChangedActionDate
 
 
 def build_legal_entity_booleans_dict(row):
@@ -554,3 +559,34 @@ def set_legal_entity_boolean_fields(row):
     legal_entity_bool_dict = build_legal_entity_booleans_dict(row)
     for key in legal_entity_bool_dict:
         row[key] = legal_entity_bool_dict[key]
+
+
+def award_action_dates(award_ids):
+    """The distinct action dates of every transaction of the awards"""
+    if not award_ids:
+        return set()
+    return set(TransactionNormalized.objects.filter(award_id__in=set(award_ids))
+               .values_list('action_date', flat=True).distinct())
+
+
+def record_changed_action_dates(action_dates):
+    """Records the action dates of loaded and deleted transactions, for incremental matview refreshes"""
+    ChangedActionDate.objects.bulk_create([ChangedActionDate(action_date=action_date)
+                                           for action_date in sorted(set(action_dates) - {None})])
+
+
+def stream_broker_rows(query, args, batch_size):
+    """
+    Yields the rows of a Broker query as lists of up to batch_size OrderedDicts, read from a server-side cursor so
+    that only one batch is held in memory however many rows the query returns
+    """
+    # Within a transaction the cursor isn't WITH HOLD, which would have Postgres materialize every row up front
+    with transaction.atomic(using='data_broker'):
+        with connections['data_broker'].chunked_cursor() as cursor:
+            cursor.execute(query, args)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = [col[0] for col in cursor.description]
+                yield [OrderedDict(zip(columns, row)) for row in rows]
@@ -10,12 +10,11 @@ from usaspending_api.common.helpers import fy
 from usaspending_api.common.helpers import timer
 from usaspending_api.etl.award_helpers import update_awards, update_contract_awards, update_award_categories
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
+from usaspending_api.etl.copy_helpers import copy_rows
 from usaspending_api.etl.management.load_base import load_data_into_model, format_date
 from usaspending_api.references.helpers import canonicalize_location_dict
-from usaspending_api.references.models import RefCountryCode, Location, LegalEntity, Agency, ToptierAgency, \
-    SubtierAgency
-
-BATCH_SIZE = 100000
+from usaspending_api.references.models import RefCityCountyCode, RefCountryCode, Location, LegalEntity, Agency, \
+    ToptierAgency, SubtierAgency, LocationRegistry
 
 logger = logging.getLogger('console')
 exception_logger = logging.getLogger("exceptions")
@@ -77,6 +76,7 @@ class Command(BaseCommand):
 
     def set_lookup_maps(self):
         self.country_code_map = {country.country_code: country for country in RefCountryCode.objects.all()}
+        self.location_registry = LocationRegistry()
         self.subtier_agency_map = {
             subtier_agency['subtier_code']: subtier_agency['subtier_agency_id']
             for subtier_agency in SubtierAgency.objects.values('subtier_code', 'subtier_agency_id')
@@ -253,12 +253,11 @@ class Command(BaseCommand):
             else:
                 lel_bulk.append(loc_instance)
 
-        if pop_flag:
-            logger.info('Bulk creating POP Locations (batch_size: {})...'.format(BATCH_SIZE))
-            Location.objects.bulk_create(pop_bulk, batch_size=BATCH_SIZE)
-        else:
-            logger.info('Bulk creating LE Locations (batch_size: {})...'.format(BATCH_SIZE))
-            Location.objects.bulk_create(lel_bulk, batch_size=BATCH_SIZE)
+        # Rows at the same address share one Location, reusing it if an earlier load already inserted it
+        new_locations = self.location_registry.resolve(pop_bulk if pop_flag else lel_bulk)
+        logger.info('Copying {} new {} Locations...'.format(len(new_locations), 'POP' if pop_flag else 'LE'))
+        copy_rows(Location, new_locations)
+        self.location_registry.remember(new_locations)
 
     def load_legal_entity(self, fpds_broker_data, total_rows):
 
@@ -297,8 +296,8 @@ class Command(BaseCommand):
                 legal_entity_bulk.append(legal_entity)
             legal_entity_lookup.append(legal_entity)
 
-        logger.info('Bulk creating Legal Entities (batch_size: {})...'.format(BATCH_SIZE))
-        LegalEntity.objects.bulk_create(legal_entity_bulk, batch_size=BATCH_SIZE)
+        logger.info('Copying Legal Entities...')
+        copy_rows(LegalEntity, legal_entity_bulk)
 
     def load_parent_awards(self, fpds_broker_data, total_rows):
         start_time = datetime.now()
@@ -339,8 +338,8 @@ class Command(BaseCommand):
 
             parent_award_lookup.append(parent_award)
 
-        logger.info('Bulk creating Parent Awards (batch_size: {})...'.format(BATCH_SIZE))
-        Award.objects.bulk_create(parent_award_bulk, batch_size=BATCH_SIZE)
+        logger.info('Copying Parent Awards...')
+        copy_rows(Award, parent_award_bulk)
 
     def load_awards(self, fpds_broker_data, total_rows):
         start_time = datetime.now()
@@ -415,8 +414,8 @@ class Command(BaseCommand):
 
             award_lookup.append(award)
 
-        logger.info('Bulk creating Awards (batch_size: {})...'.format(BATCH_SIZE))
-        Award.objects.bulk_create(award_bulk, batch_size=BATCH_SIZE)
+        logger.info('Copying Awards...')
+        copy_rows(Award, award_bulk)
 
     def load_transaction_normalized(self, fpds_broker_data, total_rows):
         start_time = datetime.now()
@@ -453,8 +452,8 @@ class Command(BaseCommand):
             transaction_normalized.fiscal_year = fy(transaction_normalized.action_date)
             transaction_normalized_bulk.append(transaction_normalized)
 
-        logger.info('Bulk creating Transaction Normalized (batch_size: {})...'.format(BATCH_SIZE))
-        TransactionNormalized.objects.bulk_create(transaction_normalized_bulk, batch_size=BATCH_SIZE)
+        logger.info('Copying Transaction Normalized...')
+        copy_rows(TransactionNormalized, transaction_normalized_bulk)
 
     def load_transaction_fpds(self, fpds_broker_data, total_rows):
         logger.info('Starting bulk loading for FPDS data')
@@ -471,12 +470,11 @@ class Command(BaseCommand):
                 row,
                 as_dict=True)
 
-            fpds_instance = TransactionFPDS(**fpds_instance_data)
-            fpds_instance.transaction = transaction_normalized_bulk[index - 1]
-            fpds_bulk.append(fpds_instance)
+            fpds_instance_data['transaction_id'] = transaction_normalized_bulk[index - 1].id
+            fpds_bulk.append(fpds_instance_data)
 
-        logger.info('Bulk creating Transaction FPDS (batch_size: {})...'.format(BATCH_SIZE))
-        TransactionFPDS.objects.bulk_create(fpds_bulk, batch_size=BATCH_SIZE)
+        logger.info('Copying Transaction FPDS...')
+        copy_rows(TransactionFPDS, fpds_bulk)
 
     def delete_stale_fpds(self, to_delete=None):
 
@@ -497,6 +495,7 @@ class Command(BaseCommand):
         )
 
     @db_transaction.atomic
+    @RefCityCountyCode.indexed()
     def handle(self, *args, **options):
         logger.info('Starting FPDS bulk data load...')
 
@@ -8,14 +8,14 @@ from django.db import connections, transaction
 from django.conf import settings
 
 from usaspending_api.common.helpers import fy, timer
-from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.awards.models import TransactionFABS, TransactionNormalized, Award
 from usaspending_api.broker.models import ExternalDataLoadDate
 from usaspending_api.broker import lookups
-from usaspending_api.broker.helpers import (get_business_categories, get_business_type_description,
-                                            get_assistance_type_description)
+from usaspending_api.broker.helpers import (award_action_dates, get_business_categories,
+                                            get_business_type_description, get_assistance_type_description,
+                                            record_changed_action_dates, stream_broker_rows)
 from usaspending_api.etl.management.load_base import load_data_into_model, format_date, create_location
-from usaspending_api.references.models import LegalEntity, Agency
+from usaspending_api.references.models import LegalEntity, Agency, RefCityCountyCode
 from usaspending_api.etl.award_helpers import update_awards, update_award_categories
 
 
@@ -23,40 +23,46 @@ logger = logging.getLogger('console')
 exception_logger = logging.getLogger("exceptions")
 
 award_update_id_list = []
+changed_action_dates = set()
+
+# Broker rows loaded and committed at a time
+BATCH_SIZE = 10000
 
 
 class Command(BaseCommand):
     help = "Update FABS data nightly"
 
     @staticmethod
-    def get_fabs_data(date):
-        db_cursor = connections['data_broker'].cursor()
-
+    def get_fabs_data(date, batch_size=BATCH_SIZE):
+        """Yields the active Broker rows created since the date, other than deletions, in batches of batch_size rows"""
         # The ORDER BY is important here because deletions must happen in a specific order and that order is defined
         # by the Broker's PK since every modification is a new row
         db_query = 'SELECT * ' \
                    'FROM published_award_financial_assistance ' \
                    'WHERE created_at >= %s ' \
-                   'AND (is_active IS True OR UPPER(correction_late_delete_ind) = \'D\')'
+                   'AND is_active IS True ' \
+                   'AND COALESCE(UPPER(correction_late_delete_ind), \'\') != \'D\' ' \
+                   'ORDER BY published_award_financial_assistance_id'
         db_args = [date]
 
-        db_cursor.execute(db_query, db_args)
-        db_rows = dictfetchall(db_cursor)  # this returns an OrderedDict
+        return stream_broker_rows(db_query, db_args, batch_size)
 
-        ids_to_delete = []
-        final_db_rows = []
+    @staticmethod
+    def get_deleted_fabs_ids(date):
+        db_cursor = connections['data_broker'].cursor()
 
-        # Iterate through the result dict and determine what needs to be deleted and what needs to be added
-        for row in db_rows:
-            if row['correction_late_delete_ind'] and row['correction_late_delete_ind'].upper() == 'D':
-                ids_to_delete.append(row['afa_generated_unique'].upper())
-            else:
-                final_db_rows.append(row)
+        db_query = 'SELECT UPPER(afa_generated_unique) ' \
+                   'FROM published_award_financial_assistance ' \
+                   'WHERE created_at >= %s ' \
+                   'AND UPPER(correction_late_delete_ind) = \'D\''
+        db_args = [date]
+
+        db_cursor.execute(db_query, db_args)
+        ids_to_delete = [row[0] for row in db_cursor.fetchall()]
 
-        logger.info('Number of records to insert/update: %s' % str(len(final_db_rows)))
         logger.info('Number of records to delete: %s' % str(len(ids_to_delete)))
 
-        return final_db_rows, ids_to_delete
+        return ids_to_delete
 
     @staticmethod
     def delete_stale_fabs(ids_to_delete=None):
@@ -66,7 +72,20 @@ class Command(BaseCommand):
             return
 
         # This cascades deletes for TransactionFABS & Awards in addition to deleting TransactionNormalized records
-        TransactionNormalized.objects.filter(assistance_data__afa_generated_unique__in=ids_to_delete).delete()
+        stale_transactions = TransactionNormalized.objects.filter(
+            assistance_data__afa_generated_unique__in=ids_to_delete)
+        changed_action_dates.update(stale_transactions.values_list('action_date', flat=True))
+        stale_transactions.delete()
+
+    @staticmethod
+    def record_changes():
+        """Records the action dates changed, for incremental_refresh_matviews, and starts the next batch afresh"""
+        # Award level columns such as the type are grouped on by the matviews, so every transaction of an updated
+        # award has its action date recomputed
+        changed_action_dates.update(award_action_dates(award_update_id_list))
+        record_changed_action_dates(changed_action_dates)
+        changed_action_dates.clear()
+        award_update_id_list.clear()
 
     def insert_new_fabs(self, to_insert, total_rows):
         logger.info('Starting insertion of new FABS data')
@@ -209,12 +228,15 @@ class Command(BaseCommand):
             afa_generated_unique = financial_assistance_data['afa_generated_unique']
             unique_fabs = TransactionFABS.objects.filter(afa_generated_unique=afa_generated_unique)
 
-            if unique_fabs.first():
+            changed_action_dates.add(transaction_normalized_dict['action_date'])
+            existing_fabs = unique_fabs.select_related('transaction').first()
+            if existing_fabs:
+                changed_action_dates.add(existing_fabs.transaction.action_date)
                 transaction_normalized_dict["update_date"] = datetime.utcnow()
                 transaction_normalized_dict["fiscal_year"] = fy(transaction_normalized_dict["action_date"])
 
                 # Update TransactionNormalized
-                TransactionNormalized.objects.filter(id=unique_fabs.first().transaction.id).\
+                TransactionNormalized.objects.filter(id=existing_fabs.transaction_id).\
                     update(**transaction_normalized_dict)
 
                 # Update TransactionFABS
@@ -261,8 +283,15 @@ class Command(BaseCommand):
             type=str,
             help="(OPTIONAL) Date from which to start the nightly loader. Expected format: MM/DD/YYYY"
         )
+        parser.add_argument(
+            '--batch-size',
+            dest="batch_size",
+            type=int,
+            default=BATCH_SIZE,
+            help="(OPTIONAL) Rows read from the Broker and committed at a time, which bounds the memory used"
+        )
 
-    @transaction.atomic
+    @RefCityCountyCode.indexed()
     def handle(self, *args, **options):
         logger.info('Starting FABS nightly data load...')
 
@@ -280,41 +309,49 @@ class Command(BaseCommand):
 
         logger.info('Processing data for FABS starting from %s' % date)
 
-        # Retrieve FABS data
-        with timer('retrieving/diff-ing FABS Data', logger.info):
-            to_insert, ids_to_delete = self.get_fabs_data(date=date)
-
-        total_rows = len(to_insert)
-        total_rows_delete = len(ids_to_delete)
+        # Retrieve FABS deletions
+        with timer('retrieving FABS deletions', logger.info):
+            ids_to_delete = self.get_deleted_fabs_ids(date=date)
 
-        if total_rows_delete > 0:
+        if len(ids_to_delete) > 0:
             # Create a file with the deletion IDs and place in a bucket for ElasticSearch
             self.send_deletes_to_elasticsearch(ids_to_delete)
 
             # Delete FABS records by ID
-            with timer('deleting stale FABS data', logger.info):
+            with timer('deleting stale FABS data', logger.info), transaction.atomic():
                 self.delete_stale_fabs(ids_to_delete=ids_to_delete)
+                self.record_changes()
         else:
             logger.info('Nothing to delete...')
 
-        if total_rows > 0:
-            # Add FABS records
-            with timer('inserting new FABS data', logger.info):
-                self.insert_new_fabs(to_insert=to_insert, total_rows=total_rows)
+        # Each batch is committed before the next one is read, so a delta of any size is loaded in bounded memory.
+        # Until the load date is updated at the end, a failed load is picked up again by the next run
+        total_rows = 0
+        for to_insert in self.get_fabs_data(date=date, batch_size=options['batch_size']):
+            with transaction.atomic():
+                # Add FABS records
+                with timer('inserting new FABS data', logger.info):
+                    self.insert_new_fabs(to_insert=to_insert, total_rows=len(to_insert))
 
-            # Update Awards based on changed FABS records
-            with timer('updating awards to reflect their latest associated transaction info', logger.info):
-                update_awards(tuple(award_update_id_list))
+                # Update Awards based on changed FABS records
+                with timer('updating awards to reflect their latest associated transaction info', logger.info):
+                    update_awards(tuple(award_update_id_list))
 
-            # Update AwardCategories based on changed FABS records
-            with timer('updating award category variables', logger.info):
-                update_award_categories(tuple(award_update_id_list))
-        else:
+                # Update AwardCategories based on changed FABS records
+                with timer('updating award category variables', logger.info):
+                    update_award_categories(tuple(award_update_id_list))
+
+                self.record_changes()
+            total_rows += len(to_insert)
+            logger.info('Number of records inserted/updated so far: %s' % str(total_rows))
+
+        if total_rows == 0:
             logger.info('Nothing to insert...')
 
         # Update the date for the last time the data load was run
-        ExternalDataLoadDate.objects.filter(external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fabs']).delete()
-        ExternalDataLoadDate(last_load_date=start_date,
-                             external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fabs']).save()
+        with transaction.atomic():
+            ExternalDataLoadDate.objects.filter(external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fabs']).delete()
+            ExternalDataLoadDate(last_load_date=start_date,
+                                 external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fabs']).save()
 
         logger.info('FABS NIGHTLY UPDATE FINISHED!')
@@ -8,6 +8,8 @@ import time
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from usaspending_api.references.management.commands.backfill_location_hashes import backfill_location_hashes
+
 logger = logging.getLogger('console')
 exception_logger = logging.getLogger("exceptions")
 
@@ -32,6 +34,10 @@ class Command(BaseCommand):
                     elapsed = time.time() - start
                     logger.info('{}: ID {} to {}, {} s'.format(descrip, floor, ceiling, elapsed))
 
+        # The fixed Locations' hashes were cleared, as they can only be computed by the model
+        backfill_location_hashes()
+        logger.info('Rehashed fixed locations, {} s'.format(time.time() - start))
+
     def find_batches(self, curs, table, options):
         batch = options['batch']
         curs.execute(self.BOUNDARY_FINDER.format(table))
@@ -49,7 +55,8 @@ class Command(BaseCommand):
     UPDATERS = (('Place of performance for FABS', 'transaction_fabs', """
             UPDATE references_location l
             SET    state_name = UPPER(tf.place_of_perform_state_nam),
-                state_code = sa.abbrev
+                state_code = sa.abbrev,
+                location_hash = NULL
             FROM   transaction_normalized tn
             JOIN   transaction_fabs tf ON (tf.transaction_id = tn.id)
             JOIN   state_abbrevs sa ON (UPPER(tf.place_of_perform_state_nam) = sa.name)
@@ -63,7 +70,8 @@ class Command(BaseCommand):
             """), ('Recipient for FABS (get state code from name)', 'transaction_fabs', """
         UPDATE references_location l
         SET    state_name = UPPER(tf.legal_entity_state_name),
-               state_code = sa.abbrev
+               state_code = sa.abbrev,
+               location_hash = NULL
         FROM   transaction_normalized tn
         JOIN   transaction_fabs tf ON (tf.transaction_id = tn.id)
         JOIN   legal_entity le ON (tn.recipient_id = le.legal_entity_id)
@@ -79,7 +87,8 @@ class Command(BaseCommand):
         """), ('Recipient for FABS (get state name from code)', 'transaction_fabs', """
         UPDATE references_location l
         SET    state_name = sa.name,
-               state_code = UPPER(REPLACE(tf.legal_entity_state_code, '.', ''))
+               state_code = UPPER(REPLACE(tf.legal_entity_state_code, '.', '')),
+               location_hash = NULL
         FROM   transaction_normalized tn
         JOIN   transaction_fabs tf ON (tf.transaction_id = tn.id)
         JOIN   legal_entity le ON (tn.recipient_id = le.legal_entity_id)
@@ -95,7 +104,8 @@ class Command(BaseCommand):
         """), ('Place of performance for FPDS', 'transaction_fpds', """
         UPDATE references_location l
         SET    state_name = sa.name,
-               state_code = UPPER(REPLACE(tf.place_of_performance_state, '.', ''))
+               state_code = UPPER(REPLACE(tf.place_of_performance_state, '.', '')),
+               location_hash = NULL
         FROM   transaction_normalized tn
         JOIN   transaction_fpds tf ON (tf.transaction_id = tn.id)
         JOIN   state_abbrevs sa ON UPPER(REPLACE(tf.place_of_performance_state, '.', '')) = sa.abbrev
@@ -109,7 +119,8 @@ class Command(BaseCommand):
         """), ('Recipient for FPDS (get state name from code)', 'transaction_fpds', """
         UPDATE references_location l
         SET    state_name = sa.name,
-               state_code = UPPER(REPLACE(tf.legal_entity_state_code, '.', ''))
+               state_code = UPPER(REPLACE(tf.legal_entity_state_code, '.', '')),
+               location_hash = NULL
         FROM   transaction_normalized tn
         JOIN   transaction_fpds tf ON (tf.transaction_id = tn.id)
         JOIN   legal_entity le ON (tn.recipient_id = le.legal_entity_id)
@@ -6,17 +6,18 @@ import re
 import urllib.request
 from datetime import datetime, timedelta
 from django.core.management.base import BaseCommand
-from django.db import connections, transaction
+from django.db import transaction
 from django.conf import settings
 
 from usaspending_api.common.helpers import fy, timer
-from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.awards.models import TransactionFPDS, TransactionNormalized, Award
 from usaspending_api.broker.models import ExternalDataLoadDate
 from usaspending_api.broker import lookups
-from usaspending_api.broker.helpers import get_business_categories, set_legal_entity_boolean_fields
+from usaspending_api.broker.helpers import (award_action_dates, get_business_categories,
+                                            set_legal_entity_boolean_fields, record_changed_action_dates,
+                                            stream_broker_rows)
 from usaspending_api.etl.management.load_base import load_data_into_model, format_date, create_location
-from usaspending_api.references.models import LegalEntity, Agency
+from usaspending_api.references.models import LegalEntity, Agency, RefCityCountyCode
 from usaspending_api.etl.award_helpers import update_awards, update_contract_awards, update_award_categories
 
 
@@ -24,27 +25,32 @@ logger = logging.getLogger('console')
 exception_logger = logging.getLogger("exceptions")
 
 award_update_id_list = []
+changed_action_dates = set()
+
+# Broker rows loaded and committed at a time
+BATCH_SIZE = 10000
 
 
 class Command(BaseCommand):
     help = "Update FPDS data nightly"
 
     @staticmethod
-    def get_fpds_data(date):
-        if not hasattr(date, 'month'):
-            date = datetime.strptime(date, '%Y-%m-%d').date()
-
-        db_cursor = connections['data_broker'].cursor()
-
+    def get_fpds_data(date, batch_size=BATCH_SIZE):
+        """Yields the Broker rows updated since the date, in batches of up to batch_size rows"""
         # The ORDER BY is important here because deletions must happen in a specific order and that order is defined
         # by the Broker's PK since every modification is a new row
         db_query = 'SELECT * ' \
                    'FROM detached_award_procurement ' \
-                   'WHERE updated_at >= %s'
+                   'WHERE updated_at >= %s ' \
+                   'ORDER BY detached_award_procurement_id'
         db_args = [date]
 
-        db_cursor.execute(db_query, db_args)
-        db_rows = dictfetchall(db_cursor)  # this returns an OrderedDict
+        return stream_broker_rows(db_query, db_args, batch_size)
+
+    @staticmethod
+    def get_deleted_fpds_ids(date):
+        if not hasattr(date, 'month'):
+            date = datetime.strptime(date, '%Y-%m-%d').date()
 
         ids_to_delete = []
 
@@ -95,10 +101,9 @@ class Command(BaseCommand):
 
                     ids_to_delete += unique_key_list
 
-        logger.info('Number of records to insert/update: %s' % str(len(db_rows)))
         logger.info('Number of records to delete: %s' % str(len(ids_to_delete)))
 
-        return db_rows, ids_to_delete
+        return ids_to_delete
 
     @staticmethod
     def delete_stale_fpds(ids_to_delete=None):
@@ -107,7 +112,20 @@ class Command(BaseCommand):
         if not ids_to_delete:
             return
 
-        TransactionNormalized.objects.filter(contract_data__detached_award_procurement_id__in=ids_to_delete).delete()
+        stale_transactions = TransactionNormalized.objects.filter(
+            contract_data__detached_award_procurement_id__in=ids_to_delete)
+        changed_action_dates.update(stale_transactions.values_list('action_date', flat=True))
+        stale_transactions.delete()
+
+    @staticmethod
+    def record_changes():
+        """Records the action dates changed, for incremental_refresh_matviews, and starts the next batch afresh"""
+        # Award level columns such as the type are grouped on by the matviews, so every transaction of an updated
+        # award has its action date recomputed
+        changed_action_dates.update(award_action_dates(award_update_id_list))
+        record_changed_action_dates(changed_action_dates)
+        changed_action_dates.clear()
+        award_update_id_list.clear()
 
     def insert_new_fpds(self, to_insert, total_rows):
         logger.info('Starting insertion of new FPDS data')
@@ -233,12 +251,15 @@ class Command(BaseCommand):
             detached_award_proc_unique = contract_instance['detached_award_proc_unique']
             unique_fpds = TransactionFPDS.objects.filter(detached_award_proc_unique=detached_award_proc_unique)
 
-            if unique_fpds.first():
+            changed_action_dates.add(transaction_normalized_dict['action_date'])
+            existing_fpds = unique_fpds.select_related('transaction').first()
+            if existing_fpds:
+                changed_action_dates.add(existing_fpds.transaction.action_date)
                 transaction_normalized_dict["update_date"] = datetime.utcnow()
                 transaction_normalized_dict["fiscal_year"] = fy(transaction_normalized_dict["action_date"])
 
                 # update TransactionNormalized
-                TransactionNormalized.objects.filter(id=unique_fpds.first().transaction.id).\
+                TransactionNormalized.objects.filter(id=existing_fpds.transaction_id).\
                     update(**transaction_normalized_dict)
 
                 # update TransactionFPDS
@@ -260,8 +281,15 @@ class Command(BaseCommand):
             type=str,
             help="(OPTIONAL) Date from which to start the nightly loader. Expected format: MM/DD/YYYY"
         )
+        parser.add_argument(
+            '--batch-size',
+            dest="batch_size",
+            type=int,
+            default=BATCH_SIZE,
+            help="(OPTIONAL) Rows read from the Broker and committed at a time, which bounds the memory used"
+        )
 
-    @transaction.atomic
+    @RefCityCountyCode.indexed()
     def handle(self, *args, **options):
         logger.info('Starting FPDS nightly data load...')
 
@@ -279,36 +307,44 @@ class Command(BaseCommand):
 
         logger.info('Processing data for FPDS starting from %s' % date)
 
-        with timer('retrieving/diff-ing FPDS Data', logger.info):
-            to_insert, ids_to_delete = self.get_fpds_data(date=date)
+        with timer('retrieving FPDS deletions', logger.info):
+            ids_to_delete = self.get_deleted_fpds_ids(date=date)
 
-        total_rows = len(to_insert)
-        total_rows_delete = len(ids_to_delete)
-
-        if total_rows_delete > 0:
-            with timer('deleting stale FPDS data', logger.info):
+        if len(ids_to_delete) > 0:
+            with timer('deleting stale FPDS data', logger.info), transaction.atomic():
                 self.delete_stale_fpds(ids_to_delete=ids_to_delete)
+                self.record_changes()
         else:
             logger.info('Nothing to delete...')
 
-        if total_rows > 0:
-            with timer('inserting new FPDS data', logger.info):
-                self.insert_new_fpds(to_insert=to_insert, total_rows=total_rows)
+        # Each batch is committed before the next one is read, so a delta of any size is loaded in bounded memory.
+        # Until the load date is updated at the end, a failed load is picked up again by the next run
+        total_rows = 0
+        for to_insert in self.get_fpds_data(date=date, batch_size=options['batch_size']):
+            with transaction.atomic():
+                with timer('inserting new FPDS data', logger.info):
+                    self.insert_new_fpds(to_insert=to_insert, total_rows=len(to_insert))
 
-            with timer('updating awards to reflect their latest associated transaction info', logger.info):
-                update_awards(tuple(award_update_id_list))
+                with timer('updating awards to reflect their latest associated transaction info', logger.info):
+                    update_awards(tuple(award_update_id_list))
 
-            with timer('updating contract-specific awards to reflect their latest transaction info', logger.info):
-                update_contract_awards(tuple(award_update_id_list))
+                with timer('updating contract-specific awards to reflect their latest transaction info', logger.info):
+                    update_contract_awards(tuple(award_update_id_list))
 
-            with timer('updating award category variables', logger.info):
-                update_award_categories(tuple(award_update_id_list))
-        else:
+                with timer('updating award category variables', logger.info):
+                    update_award_categories(tuple(award_update_id_list))
+
+                self.record_changes()
+            total_rows += len(to_insert)
+            logger.info('Number of records inserted/updated so far: %s' % str(total_rows))
+
+        if total_rows == 0:
             logger.info('Nothing to insert...')
 
         # Update the date for the last time the data load was run
-        ExternalDataLoadDate.objects.filter(external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fpds']).delete()
-        ExternalDataLoadDate(last_load_date=start_date,
-                             external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fpds']).save()
+        with transaction.atomic():
+            ExternalDataLoadDate.objects.filter(external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fpds']).delete()
+            ExternalDataLoadDate(last_load_date=start_date,
+                                 external_data_type_id=lookups.EXTERNAL_DATA_TYPE_DICT['fpds']).save()
 
         logger.info('FPDS NIGHTLY UPDATE FINISHED!')
@@ -0,0 +1,65 @@
+import glob
+import logging
+import os
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from usaspending_api.broker.models import ChangedActionDate
+from usaspending_api.common.helpers import timer
+
+logger = logging.getLogger('console')
+
+INCREMENTAL_SQL_PATH = 'usaspending_api/database_scripts/matviews/componentized/'
+INCREMENTAL_SQL_SUFFIX = '__incremental.sql'
+
+
+class Command(BaseCommand):
+    help = "Refresh the incremental summary matviews for only the action dates changed since their last refresh"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--matviews',
+            dest='matviews',
+            nargs='+',
+            default=None,
+            help='Refresh only these matviews (default: every matview with an incremental refresh)'
+        )
+
+    @staticmethod
+    def get_incremental_sql_files(matviews=None):
+        file_paths = sorted(glob.glob(INCREMENTAL_SQL_PATH + '*' + INCREMENTAL_SQL_SUFFIX))
+        if matviews:
+            file_paths = [path for path in file_paths
+                          if os.path.basename(path)[:-len(INCREMENTAL_SQL_SUFFIX)] in matviews]
+        return file_paths
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        file_paths = self.get_incremental_sql_files(options['matviews'])
+        if not file_paths:
+            logger.info('No incremental matviews to refresh')
+            return
+
+        # Dates recorded while the matviews refresh are left for the next run
+        last_id = ChangedActionDate.objects.order_by('-changed_action_date_id') \
+            .values_list('changed_action_date_id', flat=True).first()
+        if last_id is None:
+            logger.info('No changed action dates, nothing to refresh')
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE TEMPORARY TABLE matview_refresh_dates ON COMMIT DROP AS '
+                           'SELECT DISTINCT action_date FROM changed_action_date WHERE changed_action_date_id <= %s',
+                           [last_id])
+            cursor.execute('SELECT COUNT(*) FROM matview_refresh_dates')
+            logger.info('Refreshing {} changed action dates'.format(cursor.fetchone()[0]))
+
+            for file_path in file_paths:
+                with timer('refreshing {}'.format(os.path.basename(file_path)), logger.info):
+                    with open(file_path) as infile:
+                        cursor.execute(infile.read())
+
+        # The other matviews still need these dates when only some of them were refreshed
+        if not options['matviews']:
+            ChangedActionDate.objects.filter(changed_action_date_id__lte=last_id).delete()
+        logger.info('INCREMENTAL MATVIEW REFRESH FINISHED!')
@@ -139,7 +139,8 @@ def update_location_table(file_type, loc_scope, database_columns, unique_identif
     sql_statement = """
     UPDATE references_location AS loc
     SET
-        {location_update_code}
+        {location_update_code},
+        location_hash = NULL
     FROM {file_type}_transactions_to_update_{fiscal_year} broker,
         transaction_{file_type},
         transaction_normalized
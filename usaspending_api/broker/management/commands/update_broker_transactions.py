@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand, CommandError
 
 from usaspending_api.broker.management.commands.update_broker_location_data import \
     update_tmp_table_location_changes, update_location_table
+from usaspending_api.references.management.commands.backfill_location_hashes import backfill_location_hashes
 
 logger = logging.getLogger('console')
 
@@ -151,6 +152,8 @@ class Command(BaseCommand):
                                                         unique_identifier, fiscal_year))
                 ds_cursor.execute(update_location_table(file_type, 'place_of_performance',
                                                         database_columns, unique_identifier, fiscal_year))
+                # The updated Locations' hashes were cleared, as they can only be computed by the model
+                backfill_location_hashes()
 
         logger.info("Completed updating: {} {} rows in {} seconds".format(file_type.upper(), db_rows,
                                                                           datetime.now() - start))
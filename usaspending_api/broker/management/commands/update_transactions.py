@@ -9,6 +9,7 @@ from usaspending_api.awards.models import TransactionNormalized, TransactionFABS
 from usaspending_api.awards.models import Award
 from usaspending_api.common.helpers import timer
 from usaspending_api.references.models import Agency, LegalEntity, SubtierAgency, ToptierAgency, Location
+from usaspending_api.references.models import RefCityCountyCode
 from usaspending_api.etl.management.load_base import copy, get_or_create_location, format_date, load_data_into_model
 from usaspending_api.etl.award_helpers import update_awards, update_contract_awards, update_award_categories
 
@@ -523,6 +524,7 @@ class Command(BaseCommand):
         )
 
     # @transaction.atomic
+    @RefCityCountyCode.indexed()
     def handle(self, *args, **options):
         logger.info('Starting historical data load...')
 
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.4 on 2018-03-22 14:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangedActionDate',
+            fields=[
+                ('changed_action_date_id', models.AutoField(primary_key=True, serialize=False)),
+                ('action_date', models.DateField()),
+                ('create_date', models.DateTimeField(auto_now_add=True, null=True)),
+            ],
+            options={
+                'db_table': 'changed_action_date',
+                'managed': True,
+            },
+        ),
+    ]
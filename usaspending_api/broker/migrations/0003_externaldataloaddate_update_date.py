@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.4 on 2018-03-29 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('broker', '0002_changedactiondate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='externaldataloaddate',
+            name='update_date',
+            field=models.DateTimeField(auto_now=True, null=True),
+        ),
+    ]
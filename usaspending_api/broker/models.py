@@ -18,8 +18,21 @@ class ExternalDataLoadDate(models.Model):
     external_data_load_date_id = models.AutoField(primary_key=True)
     last_load_date = models.DateField(blank=False, null=False)
     external_data_type = models.ForeignKey(ExternalDataType, models.DO_NOTHING, blank=False, null=False)
+    update_date = models.DateTimeField(auto_now=True, null=True)
 
     class Meta:
         managed = True
         unique_together = (('last_load_date', 'external_data_type'),)
         db_table = 'external_data_load_date'
+
+
+class ChangedActionDate(models.Model):
+    """Action dates of transactions changed by the nightly loaders, until the summary matviews are refreshed"""
+
+    changed_action_date_id = models.AutoField(primary_key=True)
+    action_date = models.DateField(blank=False, null=False)
+    create_date = models.DateTimeField(auto_now_add=True, blank=True, null=True)
+
+    class Meta:
+        managed = True
+        db_table = 'changed_action_date'
@@ -0,0 +1,78 @@
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from model_mommy import mommy
+
+from usaspending_api.broker.management.commands.incremental_refresh_matviews import Command
+from usaspending_api.broker.models import ChangedActionDate
+from usaspending_api.database_scripts.matview_generator import matview_sql_generator as generator
+
+MONTH = "cast(date_trunc('month', {}) as date)"
+
+MONTH_VIEW_SQL = [
+    'SELECT',
+    '  {} AS action_date,'.format(MONTH.format('"transaction_normalized"."action_date"')),
+    '  count(*) AS counts',
+    'FROM',
+    '  "transaction_normalized"',
+    'WHERE',
+    '  "transaction_normalized"."action_date" >= \'2007-10-01\'',
+    'GROUP BY',
+    '  {}'.format(MONTH.format('"transaction_normalized"."action_date"')),
+]
+
+MONTH_INCREMENTAL = {'source_column': '"transaction_normalized"."action_date"', 'view_column': '"action_date"',
+                     'partition': MONTH, 'interval': '1 month'}
+
+
+def test_make_partition_filter():
+    day = {'partition': '{}'}
+    assert generator.make_partition_filter('"action_date"', day) == \
+        '"action_date" IN (SELECT action_date FROM matview_refresh_dates)'
+
+    # Month partitions are matched on a range of the column itself, so its index can be used
+    assert generator.make_partition_filter('"tn"."action_date"', MONTH_INCREMENTAL) == (
+        "EXISTS (SELECT 1 FROM (SELECT DISTINCT cast(date_trunc('month', action_date) as date) FROM "
+        "matview_refresh_dates) AS refresh_partitions (partition_start) WHERE \"tn\".\"action_date\" >= "
+        "partition_start AND \"tn\".\"action_date\" < partition_start + interval '1 month')")
+
+
+def test_make_incremental_refresh():
+    create_delta, delete, insert, analyze = generator.make_incremental_refresh('month_view', MONTH_VIEW_SQL,
+                                                                               MONTH_INCREMENTAL)
+
+    lines = create_delta.splitlines()
+    assert lines[0] == 'CREATE TEMPORARY TABLE month_view_delta ON COMMIT DROP AS'
+    assert lines[lines.index('WHERE') + 1] == '  {} AND'.format(
+        generator.make_partition_filter('"transaction_normalized"."action_date"', MONTH_INCREMENTAL))
+    assert lines[lines.index('WHERE') + 2] == MONTH_VIEW_SQL[6]
+    view_filter = generator.make_partition_filter('"action_date"', MONTH_INCREMENTAL)
+    assert delete == 'DELETE FROM month_view WHERE {};'.format(view_filter)
+    assert insert == 'INSERT INTO month_view SELECT * FROM month_view_delta;'
+    assert analyze == 'ANALYZE VERBOSE month_view;'
+
+
+@pytest.mark.django_db
+def test_incremental_refresh_matviews_recomputes_changed_months(tmpdir):
+    mommy.make('awards.TransactionNormalized', action_date=date(2018, 1, 2), _quantity=2)
+    mommy.make('awards.TransactionNormalized', action_date=date(2018, 2, 3))
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE TABLE month_view AS {}'.format('\n'.join(MONTH_VIEW_SQL)))
+
+    # Only the recorded month is recomputed; February's new transaction waits for its date to be recorded
+    mommy.make('awards.TransactionNormalized', action_date=date(2018, 1, 31))
+    mommy.make('awards.TransactionNormalized', action_date=date(2018, 2, 28))
+    ChangedActionDate.objects.create(action_date=date(2018, 1, 31))
+
+    sql_file = tmpdir.join('month_view__incremental.sql')
+    sql_file.write('\n'.join(generator.make_incremental_refresh('month_view', MONTH_VIEW_SQL, MONTH_INCREMENTAL)))
+    with patch.object(Command, 'get_incremental_sql_files', return_value=[str(sql_file)]):
+        call_command('incremental_refresh_matviews')
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT action_date, counts FROM month_view ORDER BY action_date')
+        assert cursor.fetchall() == [(date(2018, 1, 1), 3), (date(2018, 2, 1), 1)]
+    assert not ChangedActionDate.objects.exists()
@@ -1,10 +1,7 @@
-import hashlib
-import json
-
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
-from usaspending_api.common.helpers import order_nested_object
+from usaspending_api.common.helpers import canonical_digest
 
 
 class PathKeyBit(bits.QueryParamsKeyBit):
@@ -23,11 +20,16 @@ class GetPostQueryParamsKeyBit(bits.QueryParamsKeyBit):
     """
 
     def get_source_dict(self, params, view_instance, view_method, request, args, kwargs):
-        params = dict(request.query_params)
-        params.update(dict(request.data))
-        if 'auditTrail' in params:
-            del params['auditTrail']
-        return {'request': json.dumps(order_nested_object(params))}
+        # Large filters are only digested once per request, however many times the key is calculated
+        digest = getattr(request, '_params_key_digest', None)
+        if digest is None:
+            params = dict(request.query_params)
+            params.update(dict(request.data))
+            if 'auditTrail' in params:
+                del params['auditTrail']
+            digest = canonical_digest(params)
+            request._params_key_digest = digest
+        return {'request': digest}
 
 
 class USAspendingKeyConstructor(DefaultKeyConstructor):
@@ -39,10 +41,8 @@ class USAspendingKeyConstructor(DefaultKeyConstructor):
     request_params = GetPostQueryParamsKeyBit()
 
     def prepare_key(self, key_dict):
-        # Order the key_dict using the order_nested_object function to make sure cache keys are always exactly the same
-        ordered_key_dict = json.dumps(order_nested_object(key_dict))
-        key_hex = hashlib.md5(ordered_key_dict.encode('utf-8')).hexdigest()
-        return key_hex
+        # Digest the canonical encoding of the key_dict to make sure cache keys are always exactly the same
+        return canonical_digest(key_dict)
 
 
 usaspending_key_func = USAspendingKeyConstructor()
@@ -1,42 +1,156 @@
 # -*- coding: utf-8 -*-
 import logging
+import threading
+import time
+
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache.backends.dummy import DummyCache
+from django.http import HttpResponse
 from rest_framework_extensions.cache.decorators import CacheResponse
 
 logger = logging.getLogger('console')
 
+# Paths beyond this many are counted together, so paths containing ids can't grow the stats without bound
+MAX_TRACKED_PATHS = 1000
+OTHER_PATHS = '(other)'
+
+
+class LocalResponseCache:
+    """
+    Per-process, bounded LRU of rendered responses with a short TTL, kept in front of the shared usaspending-cache
+    so that hot keys don't pay a network round trip on every hit
+    """
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.time() + self.timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class CacheStats:
+    """Per-process hit, miss and byte counters of cached responses by path"""
+
+    def __init__(self):
+        self.paths = {}
+        self.lock = threading.Lock()
+
+    def record(self, path, trace, size):
+        with self.lock:
+            if path not in self.paths and len(self.paths) >= MAX_TRACKED_PATHS:
+                path = OTHER_PATHS
+            counters = self.paths.setdefault(path, {'local_hits': 0, 'hits': 0, 'misses': 0, 'bytes': 0})
+            if trace == 'hit-local-cache':
+                counters['local_hits'] += 1
+            elif trace == 'hit-cache':
+                counters['hits'] += 1
+            else:
+                counters['misses'] += 1
+            counters['bytes'] += size
+            return dict(counters)
+
+    def as_dict(self):
+        with self.lock:
+            return {path: dict(counters) for path, counters in self.paths.items()}
+
+    def clear(self):
+        with self.lock:
+            self.paths.clear()
+
+
+local_response_cache = LocalResponseCache(max_entries=settings.LOCAL_RESPONSE_CACHE_MAX_ENTRIES,
+                                          timeout=settings.LOCAL_RESPONSE_CACHE_TIMEOUT)
+cache_stats = CacheStats()
+
+
+def serialize_response(response):
+    """
+    Only what's needed to rebuild the rendered response is cached, rather than pickling the whole Response: its
+    content, status and every header the view set
+    """
+    return {'content': response.content, 'content_type': response['Content-Type'], 'status': response.status_code,
+            'headers': list(response.items())}
+
+
+def deserialize_response(cached):
+    if not isinstance(cached, dict):
+        # Responses cached whole, before only their rendered content was stored
+        return cached
+    response = HttpResponse(cached['content'], content_type=cached['content_type'], status=cached['status'])
+    for header, value in cached.get('headers', []):
+        response[header] = value
+    return response
+
 
 class CustomCacheResponse(CacheResponse):
     def process_cache_response(self, view_instance, view_method, request, args, kwargs):
         key = self.calculate_key(view_instance=view_instance, view_method=view_method,
                                  request=request, args=args, kwargs=kwargs)
-        response = None
-        try:
-            response = self.cache.get(key)
-        except Exception as e:
-            msg = 'Problem while retrieving key [{k}] from cache for path:\'{p}\''
-            logger.exception(msg.format(k=key, p=str(request.path)))
-
-        if not response:
+        # The local cache only sits in front of a real shared cache, so it's also disabled along with it
+        use_local_cache = not isinstance(self.cache, DummyCache) and settings.LOCAL_RESPONSE_CACHE_TIMEOUT > 0
+        cached = local_response_cache.get(key) if use_local_cache else None
+        trace = 'hit-local-cache'
+        if not cached:
+            trace = 'hit-cache'
+            try:
+                cached = self.cache.get(key)
+            except Exception as e:
+                msg = 'Problem while retrieving key [{k}] from cache for path:\'{p}\''
+                logger.exception(msg.format(k=key, p=str(request.path)))
+            if isinstance(cached, dict) and use_local_cache:
+                local_response_cache.set(key, cached)
+
+        if not cached:
             response = view_method(view_instance, request, *args, **kwargs)
             response = view_instance.finalize_response(request, response, *args, **kwargs)
-            response['Cache-Trace'] = 'no-cache'
-            response.render()  # should be rendered, before picklining while storing to cache
+            trace = 'no-cache'
+            response.render()  # should be rendered, before storing its content to cache
 
             if not response.status_code >= 400 or self.cache_errors:
                 if self.cache_errors:
                     logger.error(self.cache_errors)
                 try:
-                    self.cache.set(key, response, self.timeout)
-                    response['Cache-Trace'] = 'set-cache'
+                    cached = serialize_response(response)
+                    self.cache.set(key, cached, self.timeout)
+                    if use_local_cache:
+                        local_response_cache.set(key, cached)
+                    trace = 'set-cache'
                 except Exception as e:
                     msg = 'Problem while writing to cache: path:\'{p}\' data:\'{d}\''
                     logger.exception(msg.format(p=str(request.path), d=str(request.data)))
         else:
-            response['Cache-Trace'] = 'hit-cache'
+            response = deserialize_response(cached)
 
         if not hasattr(response, '_closable_objects'):
             response._closable_objects = []
 
+        counters = cache_stats.record(str(request.path), trace, len(response.content))
+        response['Cache-Trace'] = '{}; path-hits={}; path-misses={}; path-bytes={}'.format(
+            trace, counters['local_hits'] + counters['hits'], counters['misses'], counters['bytes'])
         response['key'] = key
         return response
 
@@ -1,10 +1,14 @@
+import base64
 import contextlib
+import hashlib
+import json
 import logging
 import time
 import timeit
 
 from calendar import monthrange, isleap
 from collections import OrderedDict
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import DEFAULT_DB_ALIAS
 from django.utils.dateparse import parse_date
 from fiscalyear import FiscalDateTime, FiscalQuarter, datetime
@@ -15,6 +19,7 @@ from usaspending_api.references.models import Agency
 logger = logging.getLogger(__name__)
 
 QUOTABLE_TYPES = (str, datetime.date)
+CANONICAL_JSON_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
 
 
 def check_valid_toptier_agency(agency_id):
@@ -142,6 +147,31 @@ def order_nested_object(nested_object):
         return nested_object
 
 
+def canonical_json(nested_object):
+    """
+    Single-pass, stable JSON encoding of the item for use in keys: dict keys are sorted and list items, including
+    dicts, are sorted by their own canonical encodings
+    """
+    if isinstance(nested_object, dict):
+        if not any(isinstance(value, (dict, list, tuple)) for value in nested_object.values()):
+            # Flat dicts, such as locations, encode the same way with json's C encoder
+            return CANONICAL_JSON_ENCODER.encode(nested_object)
+        return '{' + ','.join('{}:{}'.format(json.dumps(str(key)), canonical_json(nested_object[key]))
+                              for key in sorted(nested_object)) + '}'
+    elif isinstance(nested_object, (list, tuple)):
+        if all(isinstance(subitem, str) for subitem in nested_object):
+            # Lists of strings, such as award ids, are by far the most common and are sorted by value instead
+            return CANONICAL_JSON_ENCODER.encode(sorted(nested_object))
+        return '[' + ','.join(sorted(canonical_json(subitem) for subitem in nested_object)) + ']'
+    else:
+        return json.dumps(nested_object)
+
+
+def canonical_digest(nested_object):
+    """ Hex digest of the item's canonical_json() """
+    return hashlib.md5(canonical_json(nested_object).encode('utf-8')).hexdigest()
+
+
 def generate_last_completed_fiscal_quarter(fiscal_year, fiscal_quarter=None):
     """ Generate the most recently completed fiscal quarter """
 
@@ -246,6 +276,28 @@ def get_simple_pagination_metadata(results_plus_one, limit, page):
     return page_metadata
 
 
+def encode_page_cursor(sort_key, after):
+    """
+    Opaque keyset pagination token for the page after the row with the sort values in after. sort_key identifies the
+    ordering the values belong to, so a cursor can't be used with a different sort or order
+    """
+    payload = json.dumps({'sort': sort_key, 'after': after}, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_page_cursor(cursor, sort_key):
+    """ Sort values of the row an encode_page_cursor() token starts after, checking it matches the ordering """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        raise InvalidParameterException('Invalid cursor: {}'.format(cursor))
+    if not isinstance(payload, dict) or not isinstance(payload.get('after'), list):
+        raise InvalidParameterException('Invalid cursor: {}'.format(cursor))
+    if payload.get('sort') != json.loads(json.dumps(sort_key, cls=DjangoJSONEncoder)):
+        raise InvalidParameterException('cursor was not made for this sort and order')
+    return payload['after']
+
+
 def fy(raw_date):
     """Federal fiscal year corresponding to date"""
 
@@ -0,0 +1,67 @@
+"""
+Compares the cache key digest of POST bodies against the previous order_nested_object() and json.dumps() approach.
+
+    python -m usaspending_api.common.tests.benchmark_cache_key [--payloads requests.jsonl] [--number 200]
+
+Payloads are read from a JSON lines file of request bodies when one is given, otherwise representative search
+filters with hundreds of award ids and locations are generated.
+"""
+import argparse
+import django
+import hashlib
+import json
+import os
+import timeit
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+from usaspending_api.common.helpers import canonical_digest, order_nested_object  # noqa: E402
+
+
+def generated_payloads():
+    locations = [{'country': 'USA', 'state': 'S{}'.format(i % 50), 'county': str(i)} for i in range(200)]
+    return [
+        {'filters': {'award_type_codes': ['A', 'B', 'C', 'D'],
+                     'time_period': [{'start_date': '2017-10-01', 'end_date': '2018-09-30'}]},
+         'limit': 10, 'page': 1},
+        {'filters': {'award_ids': ['AWARD{:06d}'.format(i) for i in range(500)],
+                     'time_period': [{'start_date': '2007-10-01', 'end_date': '2018-09-30'}]},
+         'fields': ['Award ID', 'Recipient Name', 'Award Amount'], 'limit': 100, 'page': 1},
+        {'filters': {'place_of_performance_locations': locations, 'recipient_locations': locations},
+         'category': 'awarding_agency', 'limit': 10, 'page': 1},
+    ]
+
+
+def read_payloads(path):
+    with open(path) as f:
+        payloads = [json.loads(line) for line in f if line.strip()]
+    # Backlog style files wrap the request body, so use it where there is one
+    return [payload.get('body', payload) if isinstance(payload.get('body'), dict) else payload for payload in payloads]
+
+
+def previous_key(payload):
+    request = json.dumps(order_nested_object(payload))
+    key_dict = {'path_bit': {'path': '/api/v2/search/'}, 'request_params': {'request': request}}
+    return hashlib.md5(json.dumps(order_nested_object(key_dict)).encode('utf-8')).hexdigest()
+
+
+def canonical_key(payload):
+    key_dict = {'path_bit': {'path': '/api/v2/search/'}, 'request_params': {'request': canonical_digest(payload)}}
+    return canonical_digest(key_dict)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--payloads', help='JSON lines file of request bodies')
+    parser.add_argument('--number', type=int, default=200, help='Times each payload is keyed')
+    args = parser.parse_args()
+
+    payloads = read_payloads(args.payloads) if args.payloads else generated_payloads()
+    for name, key_func in (('order_nested_object', previous_key), ('canonical_digest', canonical_key)):
+        seconds = timeit.timeit(lambda: [key_func(payload) for payload in payloads], number=args.number)
+        print('{:<20} {:.1f} us per key'.format(name, seconds / (args.number * len(payloads)) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
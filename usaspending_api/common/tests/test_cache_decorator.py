@@ -0,0 +1,62 @@
+import time
+
+import pytest
+from django.http import HttpResponse
+
+from usaspending_api.common.cache_decorator import (CacheStats, LocalResponseCache, deserialize_response,
+                                                    serialize_response)
+
+
+def test_local_response_cache_evicts_least_recently_used():
+    cache = LocalResponseCache(max_entries=2, timeout=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_local_response_cache_expires_entries():
+    cache = LocalResponseCache(max_entries=2, timeout=0)
+    cache.set('a', 1)
+    time.sleep(0.01)
+    assert cache.get('a') is None
+
+
+def test_cache_stats_counts_by_path():
+    stats = CacheStats()
+    stats.record('/api/v2/a/', 'set-cache', 10)
+    stats.record('/api/v2/a/', 'hit-cache', 10)
+    counters = stats.record('/api/v2/a/', 'hit-local-cache', 10)
+    stats.record('/api/v2/b/', 'no-cache', 5)
+
+    assert counters == {'local_hits': 1, 'hits': 1, 'misses': 1, 'bytes': 30}
+    assert stats.as_dict()['/api/v2/b/'] == {'local_hits': 0, 'hits': 0, 'misses': 1, 'bytes': 5}
+
+
+def test_serialized_response_round_trip():
+    original = HttpResponse(b'{"results": []}', content_type='application/json', status=201)
+    original['Matview-Plan'] = 'summary_view'
+    response = deserialize_response(serialize_response(original))
+
+    assert response.content == b'{"results": []}'
+    assert response['Content-Type'] == 'application/json'
+    assert response.status_code == 201
+    assert response['Matview-Plan'] == 'summary_view'
+
+
+def test_serialized_response_cached_before_headers():
+    cached = {'content': b'{}', 'content_type': 'application/json', 'status': 200}
+
+    assert deserialize_response(cached)['Content-Type'] == 'application/json'
+
+
+@pytest.mark.django_db
+def test_cache_stats_view_is_admin_only(client, admin_client):
+    assert client.get('/status/cache/').status_code == 403
+    response = admin_client.get('/status/cache/')
+    assert response.status_code == 200
+    assert 'paths' in response.json()
@@ -1,10 +1,13 @@
 import datetime as dt
 import re
 import time
+from decimal import Decimal
 
 import pytest
 
-from usaspending_api.common.helpers import fy, get_pagination, timer
+from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers import canonical_digest, canonical_json, fy, get_pagination, timer
+from usaspending_api.common.helpers import decode_page_cursor, encode_page_cursor
 
 legal_dates = {
     dt.datetime(2017, 2, 2, 16, 43, 28, 377373): 2017,
@@ -104,3 +107,28 @@ def test_timer_times(capsys):
 
 def test_fy_none():
     assert fy(None) is None
+
+
+def test_canonical_json_ignores_order():
+    first = {'filters': {'award_ids': ['b', 'a'], 'place_of_performance_locations': [
+        {'country': 'USA', 'state': 'VA'}, {'state': 'MD', 'country': 'USA'}]}, 'page': 1}
+    second = {'page': 1, 'filters': {'place_of_performance_locations': [
+        {'country': 'USA', 'state': 'MD'}, {'state': 'VA', 'country': 'USA'}], 'award_ids': ['a', 'b']}}
+
+    assert canonical_json(first) == canonical_json(second)
+    assert canonical_digest(first) == canonical_digest(second)
+    assert canonical_digest(first) != canonical_digest(dict(second, page=2))
+
+
+def test_canonical_json_mixed_lists():
+    assert canonical_json([2, 'a', None, {'b': [1.5, True]}]) == '["a",2,null,{"b":[1.5,true]}]'
+
+
+def test_page_cursor():
+    cursor = encode_page_cursor(['-total_obligation', '-award_id'], [Decimal('10.50'), dt.date(2017, 2, 2), None, 7])
+
+    assert decode_page_cursor(cursor, ['-total_obligation', '-award_id']) == ['10.50', '2017-02-02', None, 7]
+    with pytest.raises(InvalidParameterException):
+        decode_page_cursor(cursor, ['total_obligation', 'award_id'])
+    with pytest.raises(InvalidParameterException):
+        decode_page_cursor('not a cursor', ['-total_obligation', '-award_id'])
@@ -1,5 +1,9 @@
+import hashlib
 import logging
 import json
+import random
+import threading
+import time
 from django.conf import settings
 from elasticsearch import ConnectionError
 from elasticsearch import ConnectionTimeout
@@ -8,6 +12,8 @@ from elasticsearch import NotFoundError
 from elasticsearch import TransportError
 from urllib3.exceptions import LocationValueError
 
+from usaspending_api.common.cache_decorator import LocalResponseCache
+
 logger = logging.getLogger('console')
 client_timeout = settings.ES_TIMEOUT or 15
 
@@ -19,32 +25,200 @@ except Exception as e:
     logger.exception('Error creating the elasticsearch client')
 
 
+class CircuitBreaker:
+    """
+    Fails requests fast once the cluster has failed failure_threshold times in a row. After reset_timeout seconds a
+    single trial request is let through (another one every reset_timeout seconds while it's unanswered), which closes
+    the circuit again if it succeeds or opens it for another reset_timeout seconds if it fails
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.time() - self.opened_at < self.reset_timeout:
+                return False
+            self.opened_at = time.time()
+            return True
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                logger.info('Elasticsearch circuit breaker closed')
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.error('Elasticsearch circuit breaker opened after {} failures'.format(self.failures))
+                self.opened_at = time.time()
+
+
+class SingleFlight:
+    """Runs a function once for concurrent calls with the same key, every caller getting the first call's result"""
+
+    class Flight:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+
+    def __init__(self):
+        self.flights = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, func):
+        with self.lock:
+            flight = self.flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[key] = self.Flight()
+        if not leader:
+            flight.done.wait()
+            return flight.result
+        try:
+            flight.result = func()
+        finally:
+            with self.lock:
+                del self.flights[key]
+            flight.done.set()
+        return flight.result
+
+
+circuit_breaker = CircuitBreaker(settings.ES_CIRCUIT_BREAKER_FAILURES, settings.ES_CIRCUIT_BREAKER_RESET_TIMEOUT)
+query_cache = LocalResponseCache(settings.ES_QUERY_CACHE_MAX_ENTRIES, settings.ES_QUERY_CACHE_TIMEOUT)
+in_flight_queries = SingleFlight()
+
+
 def es_client_query(index, body, timeout='1m', retries=1):
-    if retries > 20:
-        retries = 20
-    elif retries < 1:
-        retries = 1
-    for attempt in range(retries):
-        response = _es_search(index=index, body=body, timeout=timeout)
+    """
+    Responses are cached for ES_QUERY_CACHE_TIMEOUT seconds by index and canonical body, and concurrent identical
+    queries share a single request. Responses may be shared between callers, so they must not be modified
+    """
+    def search():
+        response = _es_retry(retries, CLIENT.search, index=index, body=body, timeout=timeout)
         if response is None:
             logger.info('Failure using these: Index=\'{}\', body={}'.format(index, json.dumps(body)))
-        else:
+        return response
+
+    return _cached_query(query_digest({'index': index, 'body': body, 'timeout': timeout}), search)
+
+
+def es_client_msearch(searches, timeout='1m', retries=1):
+    """
+    Runs several searches, each an (index, body) pair, in a single _msearch round trip. Returns the response of each
+    search in order (an 'error' instead of 'hits' if that search failed), or None if the cluster couldn't be reached.
+    Cached and shared like es_client_query(), unless a search failed
+    """
+    body = []
+    for index, query in searches:
+        body.append({'index': index})
+        body.append(dict(query, timeout=timeout))
+
+    def msearch():
+        response = _es_retry(retries, CLIENT.msearch, body=body)
+        if response is None:
+            logger.info('Failure using these: searches={}'.format(json.dumps(body)))
+            return None
+        return response['responses']
+
+    def succeeded(responses):
+        return not any('error' in response for response in responses)
+
+    return _cached_query(query_digest({'msearch': body}), msearch, succeeded)
+
+
+def es_client_scroll(index, body, size=10000, scroll='3m', retries=1):
+    """
+    Generator of every hit matching the search, as pages of up to size hits. The hits are read with a scroll, so they
+    come from a snapshot of the indices as of the first request. Only the first request is retried: a failed scroll
+    request may still have advanced the scroll, so retrying it could silently skip a page. Raises an exception if the
+    cluster can't be reached or a page fails, so that the caller fails rather than returning partial results
+    """
+    response = _es_retry(retries, CLIENT.search, index=index, body=body, size=size, scroll=scroll)
+    if response is None:
+        raise Exception('Breaking generator, unable to reach cluster')
+    scroll_id = response.get('_scroll_id')
+    try:
+        while response['hits']['hits']:
+            yield response['hits']['hits']
+            scroll_id = response['_scroll_id']
+            response = _es_request(CLIENT.scroll, scroll_id=scroll_id, scroll=scroll)
+            if response is None:
+                raise Exception('Breaking generator, scroll request failed')
+    finally:
+        if scroll_id:
+            _es_request(CLIENT.clear_scroll, scroll_id=scroll_id)
+
+
+def query_digest(request):
+    """
+    Cache key of an Elasticsearch request. Only object keys are sorted: the order of lists such as sort, search_after
+    and the _msearch lines changes the response, so it's kept
+    """
+    return hashlib.md5(json.dumps(request, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+
+def _cached_query(key, query, succeeded=None):
+    if settings.ES_QUERY_CACHE_TIMEOUT <= 0:
+        return query()
+    response = query_cache.get(key)
+    if response is None:
+        response = in_flight_queries.do(key, query)
+        # failures aren't cached, so that the next query tries the cluster again
+        if response is not None and (succeeded is None or succeeded(response)):
+            query_cache.set(key, response)
+    return response
+
+
+def get_backoff(attempt):
+    """Seconds to wait before a retry: exponential backoff with full jitter, so that retries don't arrive together"""
+    return random.uniform(0, min(settings.ES_RETRY_MAX_BACKOFF, settings.ES_RETRY_BACKOFF * 2 ** attempt))
+
+
+def _es_retry(retries, method, **kwargs):
+    retries = min(max(retries, 1), 20)
+    for attempt in range(retries):
+        if attempt > 0:
+            time.sleep(get_backoff(attempt - 1))
+        if not circuit_breaker.allow():
+            logger.error('Elasticsearch circuit breaker is open, failing fast')
+            return None
+        response = _es_request(method, **kwargs)
+        if response is not None:
             return response
     logger.error('Unable to reach elasticsearch cluster. {} attempt(s) made'.format(retries))
     return None
 
 
-def _es_search(index, body, timeout):
+def _es_request(method, **kwargs):
     error_template = '[ERROR] ({type}) with ElasticSearch cluster: {e}'
     result = None
     try:
-        result = CLIENT.search(index=index, body=body, timeout=timeout)
+        result = method(**kwargs)
+        circuit_breaker.record_success()
     except (ConnectionError, ConnectionTimeout) as e:
         logger.error(error_template.format(type='Connection', e=str(e)))
-    except TransportError as e:
-        logger.error(error_template.format(type='Transport', e=str(e)))
+        circuit_breaker.record_failure()
     except NotFoundError as e:
         logger.error(error_template.format(type='404 Not Found', e=str(e)))
+        circuit_breaker.record_success()
+    except TransportError as e:
+        logger.error(error_template.format(type='Transport', e=str(e)))
+        # Bad requests are the caller's problem, but server errors mean the cluster is unhealthy
+        if isinstance(e.status_code, int) and e.status_code < 500:
+            circuit_breaker.record_success()
+        else:
+            circuit_breaker.record_failure()
     except Exception as e:
         logger.error(error_template.format(type='Generic', e=str(e)))
     return result
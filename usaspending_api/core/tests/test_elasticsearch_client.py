@@ -0,0 +1,168 @@
+import pytest
+import threading
+from unittest.mock import Mock, patch
+
+from elasticsearch import ConnectionError, TransportError
+
+from usaspending_api.common.cache_decorator import LocalResponseCache
+from usaspending_api.core.elasticsearch import client
+
+RESPONSE = {'hits': {'total': 3, 'hits': []}}
+
+
+def fresh_client_state(failures=5):
+    return [
+        patch.object(client, 'circuit_breaker', client.CircuitBreaker(failures, reset_timeout=60)),
+        patch.object(client, 'query_cache', LocalResponseCache(max_entries=10, timeout=60)),
+        patch.object(client, 'in_flight_queries', client.SingleFlight()),
+        patch.object(client.time, 'sleep'),
+    ]
+
+
+def run_patched(patches, func):
+    for p in patches:
+        p.start()
+    try:
+        return func()
+    finally:
+        for p in reversed(patches):
+            p.stop()
+
+
+def test_es_client_query_caches_identical_queries():
+    search = Mock(return_value=RESPONSE)
+
+    def query():
+        with patch.object(client, 'CLIENT', Mock(search=search)):
+            first = client.es_client_query('index', {'query': {'a': 1, 'b': 2}})
+            second = client.es_client_query('index', {'query': {'b': 2, 'a': 1}})
+            other = client.es_client_query('other-index', {'query': {'a': 1, 'b': 2}})
+        return first, second, other
+
+    assert run_patched(fresh_client_state(), query) == (RESPONSE, RESPONSE, RESPONSE)
+    assert search.call_count == 2
+
+
+def test_es_client_query_keeps_list_order_in_cache_keys():
+    search = Mock(side_effect=lambda **kwargs: {'hits': {'total': 3, 'hits': [kwargs['body']['search_after']]}})
+
+    def query():
+        with patch.object(client, 'CLIENT', Mock(search=search)):
+            return [client.es_client_query('index', {'sort': ['action_date', 'transaction_id'], 'search_after': after})
+                    for after in ([7, 5], [5, 7], [7, 5])]
+
+    responses = run_patched(fresh_client_state(), query)
+    assert [response['hits']['hits'] for response in responses] == [[[7, 5]], [[5, 7]], [[7, 5]]]
+    assert search.call_count == 2
+
+
+def test_es_client_query_does_not_cache_failures():
+    search = Mock(side_effect=[ConnectionError('N/A', 'down', None), RESPONSE])
+
+    def query():
+        with patch.object(client, 'CLIENT', Mock(search=search)):
+            return client.es_client_query('index', {}), client.es_client_query('index', {})
+
+    assert run_patched(fresh_client_state(), query) == (None, RESPONSE)
+
+
+def test_es_client_msearch_does_not_cache_failed_searches():
+    failed = {'responses': [RESPONSE, {'error': {'type': 'search_phase_execution_exception'}}]}
+    msearch = Mock(side_effect=[failed, {'responses': [RESPONSE, RESPONSE]}, failed])
+    searches = [('index', {'size': 0}), ('other-index', {'size': 0})]
+
+    def query():
+        with patch.object(client, 'CLIENT', Mock(msearch=msearch)):
+            return [client.es_client_msearch(searches) for _ in range(3)]
+
+    assert run_patched(fresh_client_state(), query) == [failed['responses'], [RESPONSE, RESPONSE], [RESPONSE, RESPONSE]]
+    assert msearch.call_count == 2
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    in_flight = client.SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return RESPONSE
+
+    leader = threading.Thread(target=lambda: results.append(in_flight.do('key', slow)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(in_flight.do('key', slow))) for _ in range(3)]
+    for follower in followers:
+        follower.start()
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [RESPONSE] * 4
+
+
+def test_retries_back_off_with_jitter():
+    search = Mock(side_effect=[ConnectionError('N/A', 'down', None)] * 3 + [RESPONSE])
+    patches = fresh_client_state()
+
+    def query():
+        with patch.object(client, 'CLIENT', Mock(search=search)):
+            return client.es_client_query('index', {}, retries=4)
+
+    with patch.object(client.random, 'uniform', side_effect=lambda low, high: high) as uniform:
+        assert run_patched(patches, query) == RESPONSE
+    assert [call[0][1] for call in uniform.call_args_list] == [0.1, 0.2, 0.4]
+
+
+def test_circuit_breaker_fails_fast_while_open():
+    search = Mock(side_effect=ConnectionError('N/A', 'down', None))
+
+    def query():
+        with patch.object(client, 'CLIENT', Mock(search=search)):
+            client.es_client_query('index', {}, retries=2)
+            return client.es_client_query('other-index', {}, retries=5)
+
+    assert run_patched(fresh_client_state(failures=2), query) is None
+    assert search.call_count == 2
+
+
+def test_circuit_breaker_ignores_bad_requests():
+    breaker = client.CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    search = Mock(side_effect=TransportError(400, 'parsing_exception', None))
+
+    with patch.object(client, 'circuit_breaker', breaker), patch.object(client, 'CLIENT', Mock(search=search)):
+        assert client._es_request(client.CLIENT.search, index='index', body={}) is None
+    assert breaker.allow()
+
+
+def test_circuit_breaker_lets_a_trial_through_after_reset_timeout():
+    breaker = client.CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    with patch.object(client.time, 'time', return_value=1000):
+        breaker.record_failure()
+        assert not breaker.allow()
+    with patch.object(client.time, 'time', return_value=1061):
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+
+
+def test_es_client_scroll_does_not_retry_scroll_requests():
+    page = {'_scroll_id': 'scroll', 'hits': {'hits': [{'_id': 1}]}}
+    es = Mock(search=Mock(side_effect=[ConnectionError('N/A', 'down', None), page]),
+              scroll=Mock(side_effect=ConnectionError('N/A', 'down', None)))
+
+    def scroll():
+        pages = []
+        with patch.object(client, 'CLIENT', es), pytest.raises(Exception):
+            for hits in client.es_client_scroll('index', {}, retries=3):
+                pages.append(hits)
+        return pages
+
+    assert run_patched(fresh_client_state(), scroll) == [[{'_id': 1}]]
+    assert es.search.call_count == 2
+    assert es.scroll.call_count == 1
+    es.clear_scroll.assert_called_once_with(scroll_id='scroll')
@@ -35,6 +35,12 @@ EXAMPLE SQL DESCRIPTION JSON FILE:
     "  \"action_date\" DESC"
 
     ],
+    "incremental": {
+        "source_column": "\"transaction_normalized\".\"action_date\"",
+        "view_column": "\"action_date\"",
+        "partition": "<expression of {} grouping the view, ex: cast(date_trunc('month', {}) as date)>",
+        "interval": "<(optional) span of a partition starting on its expression, ex: 1 month>"
+    },
     "index": {
         "name": "<name>",
         "columns": [
@@ -56,6 +62,17 @@ TEMPLATE = {
     'create_matview': 'CREATE MATERIALIZED VIEW {} AS\n{};',
     'drop_matview': 'DROP MATERIALIZED VIEW IF EXISTS {} CASCADE;',
     'rename_matview': 'ALTER MATERIALIZED VIEW {}{} RENAME TO {};',
+    'create_table': 'CREATE TABLE {} AS\n{};',
+    'drop_table': 'DO $$ BEGIN\n'
+                  '  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = \'{0}\') THEN\n'
+                  '    DROP MATERIALIZED VIEW {0} CASCADE;\n'
+                  '  END IF;\n'
+                  'END $$;\n'
+                  'DROP TABLE IF EXISTS {0} CASCADE;',
+    'rename_table': 'ALTER TABLE {}{} RENAME TO {};',
+    'create_delta': 'CREATE TEMPORARY TABLE {} ON COMMIT DROP AS\n{};',
+    'delete_partitions': 'DELETE FROM {} WHERE {};',
+    'insert_delta': 'INSERT INTO {} SELECT * FROM {};',
     'cluster_matview': 'CLUSTER VERBOSE {} USING {};',
     'refresh_matview': 'REFRESH MATERIALIZED VIEW CONCURRENTLY {} WITH DATA;',
     'analyze': 'ANALYZE VERBOSE {};',
@@ -144,20 +161,25 @@ def make_sql_header():
     return ['\n'.join(HEADER)]
 
 
-def make_matview_drops(final_matview_name):
+def get_template(action, incremental):
+    # Incrementally refreshed "matviews" are tables, since rows can't be deleted from or inserted into a matview
+    return TEMPLATE[action + ('_table' if incremental else '_matview')]
+
+
+def make_matview_drops(final_matview_name, incremental=False):
     matview_temp_name = final_matview_name + '_temp'
     matview_archive_name = final_matview_name + '_old'
 
     return [
-        TEMPLATE['drop_matview'].format(matview_temp_name),
-        TEMPLATE['drop_matview'].format(matview_archive_name)
+        get_template('drop', incremental).format(matview_temp_name),
+        get_template('drop', incremental).format(matview_archive_name)
     ]
 
 
-def make_matview_create(final_matview_name, sql):
+def make_matview_create(final_matview_name, sql, incremental=False):
     matview_sql = '\n'.join(sql)
     matview_temp_name = final_matview_name + '_temp'
-    return [TEMPLATE['create_matview'].format(matview_temp_name, matview_sql)]
+    return [get_template('create', incremental).format(matview_temp_name, matview_sql)]
 
 
 def make_matview_refresh(matview_name):
@@ -167,6 +189,40 @@ def make_matview_refresh(matview_name):
     ]
 
 
+def make_partition_filter(column, incremental):
+    '''
+    Condition on column selecting the partitions listed in matview_refresh_dates. Partitions spanning an interval are
+    matched on a range of column, rather than on an expression of it, so an index on the column can be used
+    '''
+    refresh_partitions = 'SELECT {} FROM matview_refresh_dates'.format(incremental['partition'].format('action_date'))
+    if 'interval' not in incremental:
+        return '{} IN ({})'.format(incremental['partition'].format(column), refresh_partitions)
+    refresh_partitions = refresh_partitions.replace('SELECT ', 'SELECT DISTINCT ', 1)
+    return ('EXISTS (SELECT 1 FROM ({0}) AS refresh_partitions (partition_start) '
+            'WHERE {1} >= partition_start AND {1} < partition_start + interval \'{2}\')').format(
+        refresh_partitions, column, incremental['interval'])
+
+
+def make_incremental_refresh(matview_name, sql, incremental):
+    '''
+    Recomputes only the partitions of the view (days or months of action_date) holding transactions changed since the
+    last refresh, listed in the matview_refresh_dates temporary table, and swaps them in from a delta table
+    '''
+    where_index = sql.index('WHERE')
+    delta_sql = sql[:where_index + 1]
+    delta_sql.append('  {} AND'.format(make_partition_filter(incremental['source_column'], incremental)))
+    delta_sql += sql[where_index + 1:]
+
+    matview_delta_name = matview_name + '_delta'
+    return [
+        TEMPLATE['create_delta'].format(matview_delta_name, '\n'.join(delta_sql)),
+        TEMPLATE['delete_partitions'].format(matview_name, make_partition_filter(incremental['view_column'],
+                                                                                 incremental)),
+        TEMPLATE['insert_delta'].format(matview_name, matview_delta_name),
+        TEMPLATE['analyze'].format(matview_name)
+    ]
+
+
 def make_indexes_sql(sql_json, matview_name):
     unique_name_list = []
     create_indexes = []
@@ -205,14 +261,14 @@ def make_modification_sql(matview_name):
     return sql_strings
 
 
-def make_rename_sql(matview_name, old_indexes, new_indexes):
+def make_rename_sql(matview_name, old_indexes, new_indexes, incremental=False):
     matview_temp_name = matview_name + '_temp'
     matview_archive_name = matview_name + '_old'
     sql_strings = []
-    sql_strings.append(TEMPLATE['rename_matview'].format('IF EXISTS ', matview_name, matview_archive_name))
+    sql_strings.append(get_template('rename', incremental).format('IF EXISTS ', matview_name, matview_archive_name))
     sql_strings += old_indexes
     sql_strings.append('')
-    sql_strings.append(TEMPLATE['rename_matview'].format('', matview_temp_name, matview_name))
+    sql_strings.append(get_template('rename', incremental).format('', matview_temp_name, matview_name))
     sql_strings += new_indexes
     return sql_strings
 
@@ -233,18 +289,19 @@ def create_all_sql_strings(sql_json):
 
     matview_name = sql_json['final_name']
     matview_temp_name = matview_name + '_temp'
+    incremental = 'incremental' in sql_json
 
     create_indexes, rename_old_indexes, rename_new_indexes = make_indexes_sql(sql_json, matview_temp_name)
 
     final_sql_strings.extend(make_sql_header())
-    final_sql_strings.extend(make_matview_drops(matview_name))
+    final_sql_strings.extend(make_matview_drops(matview_name, incremental))
     final_sql_strings.append('')
-    final_sql_strings.extend(make_matview_create(matview_name, sql_json['matview_sql']))
+    final_sql_strings.extend(make_matview_create(matview_name, sql_json['matview_sql'], incremental))
 
     final_sql_strings.append('')
     final_sql_strings += create_indexes
     final_sql_strings.append('')
-    final_sql_strings.extend(make_rename_sql(matview_name, rename_old_indexes, rename_new_indexes))
+    final_sql_strings.extend(make_rename_sql(matview_name, rename_old_indexes, rename_new_indexes, incremental))
     final_sql_strings.append('')
     final_sql_strings.extend(make_modification_sql(matview_name))
     return final_sql_strings
@@ -270,13 +327,14 @@ def create_componentized_files(sql_json):
 
     matview_name = sql_json['final_name']
     matview_temp_name = matview_name + '_temp'
+    incremental = 'incremental' in sql_json
 
     create_indexes, rename_old_indexes, rename_new_indexes = make_indexes_sql(sql_json, matview_temp_name)
 
-    sql_strings = make_sql_header() + make_matview_drops(matview_name)
+    sql_strings = make_sql_header() + make_matview_drops(matview_name, incremental)
     write_sql_file(sql_strings, filename_base + '__drops')
 
-    sql_strings = make_sql_header() + make_matview_create(matview_name, sql_json['matview_sql'])
+    sql_strings = make_sql_header() + make_matview_create(matview_name, sql_json['matview_sql'], incremental)
     write_sql_file(sql_strings, filename_base + '__matview')
 
     sql_strings = make_sql_header() + create_indexes
@@ -285,10 +343,16 @@ def create_componentized_files(sql_json):
     sql_strings = make_sql_header() + make_modification_sql(matview_name)
     write_sql_file(sql_strings, filename_base + '__mods')
 
-    sql_strings = make_sql_header() + make_rename_sql(matview_name, rename_old_indexes, rename_new_indexes)
+    sql_strings = make_sql_header() + make_rename_sql(matview_name, rename_old_indexes, rename_new_indexes,
+                                                      incremental)
     write_sql_file(sql_strings, filename_base + '__renames')
 
-    if 'refresh' in sql_json and sql_json['refresh'] is True:
+    if incremental:
+        # Tables can't be refreshed; changed partitions are refreshed by the incremental_refresh_matviews command
+        sql_strings = make_sql_header() + make_incremental_refresh(matview_name, sql_json['matview_sql'],
+                                                                   sql_json['incremental'])
+        write_sql_file(sql_strings, filename_base + '__incremental')
+    elif 'refresh' in sql_json and sql_json['refresh'] is True:
         sql_strings = make_sql_header() + make_matview_refresh(matview_name)
         write_sql_file(sql_strings, filename_base + '__refresh')
 
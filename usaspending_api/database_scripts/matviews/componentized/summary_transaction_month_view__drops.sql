@@ -5,5 +5,15 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS summary_transaction_month_view_temp CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS summary_transaction_month_view_old CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_transaction_month_view_temp') THEN
+    DROP MATERIALIZED VIEW summary_transaction_month_view_temp CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_transaction_month_view_temp CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_transaction_month_view_old') THEN
+    DROP MATERIALIZED VIEW summary_transaction_month_view_old CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_transaction_month_view_old CASCADE;
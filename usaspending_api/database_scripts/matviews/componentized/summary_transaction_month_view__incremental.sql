@@ -0,0 +1,148 @@
+--------------------------------------------------------
+-- Created using matview_sql_generator.py             --
+--    The SQL definition is stored in a json file     --
+--    Look in matview_generator for the code.         --
+--                                                    --
+--         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
+--------------------------------------------------------
+CREATE TEMPORARY TABLE summary_transaction_month_view_delta ON COMMIT DROP AS
+SELECT
+  MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
+  cast(date_trunc('month', "transaction_normalized"."action_date") as date) as "action_date",
+  "transaction_normalized"."fiscal_year",
+  ((MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 3) / 3) AS "fiscal_quarter",
+  (MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 1) AS "fiscal_month",
+  "transaction_normalized"."type",
+  "transaction_fpds"."pulled_from",
+
+  recipient_location."location_country_code" AS "recipient_location_country_code",
+  recipient_location."country_name" AS "recipient_location_country_name",
+  recipient_location."state_code" AS "recipient_location_state_code",
+  recipient_location."county_code" AS "recipient_location_county_code",
+  recipient_location."county_name" AS "recipient_location_county_name",
+  recipient_location."congressional_code" AS "recipient_location_congressional_code",
+  recipient_location."zip5" AS "recipient_location_zip5",
+
+  place_of_performance."location_country_code" AS "pop_country_code",
+  place_of_performance."country_name" AS "pop_country_name",
+  place_of_performance."state_code" AS "pop_state_code",
+  place_of_performance."county_code" AS "pop_county_code",
+  place_of_performance."county_name" AS "pop_county_name",
+  place_of_performance."congressional_code" AS "pop_congressional_code",
+  place_of_performance."zip5" AS "pop_zip5",
+
+  "transaction_normalized"."awarding_agency_id",
+  "transaction_normalized"."funding_agency_id",
+  TAA."name" AS awarding_toptier_agency_name,
+  TFA."name" AS funding_toptier_agency_name,
+  SAA."name" AS awarding_subtier_agency_name,
+  SFA."name" AS funding_subtier_agency_name,
+  TAA."abbreviation" AS awarding_toptier_agency_abbreviation,
+  TFA."abbreviation" AS funding_toptier_agency_abbreviation,
+  SAA."abbreviation" AS awarding_subtier_agency_abbreviation,
+  SFA."abbreviation" AS funding_subtier_agency_abbreviation,
+
+  "legal_entity"."business_categories",
+  "transaction_fabs"."cfda_number",
+  "references_cfda"."program_title" AS "cfda_title",
+  "references_cfda"."popular_name" AS "cfda_popular_name",
+  "transaction_fpds"."product_or_service_code",
+  "psc"."description" AS product_or_service_description,
+  "transaction_fpds"."naics" AS "naics_code",
+  "naics"."description" AS "naics_description",
+
+  obligation_to_enum("awards"."total_obligation") AS "total_obl_bin",
+  "transaction_fpds"."type_of_contract_pricing",
+  "transaction_fpds"."type_set_aside",
+  "transaction_fpds"."extent_competed",
+  SUM(COALESCE("transaction_normalized"."federal_action_obligation", 0))::NUMERIC(20, 2) AS "federal_action_obligation",
+  SUM(COALESCE("transaction_normalized"."original_loan_subsidy_cost", 0))::NUMERIC(20, 2) AS "original_loan_subsidy_cost",
+  count(*) AS counts
+FROM
+  "transaction_normalized"
+LEFT OUTER JOIN
+  "transaction_fabs" ON ("transaction_normalized"."id" = "transaction_fabs"."transaction_id")
+LEFT OUTER JOIN
+  "transaction_fpds" ON ("transaction_normalized"."id" = "transaction_fpds"."transaction_id")
+LEFT OUTER JOIN
+  "references_cfda" ON ("transaction_fabs"."cfda_number" = "references_cfda"."program_number")
+LEFT OUTER JOIN
+  "legal_entity" ON ("transaction_normalized"."recipient_id" = "legal_entity"."legal_entity_id")
+LEFT OUTER JOIN
+  "references_location" AS recipient_location ON ("legal_entity"."location_id" = recipient_location."location_id")
+LEFT OUTER JOIN
+  "awards" ON ("transaction_normalized"."award_id" = "awards"."id")
+LEFT OUTER JOIN
+  "references_location" AS place_of_performance ON ("transaction_normalized"."place_of_performance_id" = place_of_performance."location_id")
+LEFT OUTER JOIN
+  "agency" AS AA ON ("transaction_normalized"."awarding_agency_id" = AA."id")
+LEFT OUTER JOIN
+  "toptier_agency" AS TAA ON (AA."toptier_agency_id" = TAA."toptier_agency_id")
+LEFT OUTER JOIN
+  "subtier_agency" AS SAA ON (AA."subtier_agency_id" = SAA."subtier_agency_id")
+LEFT OUTER JOIN
+  "agency" AS FA ON ("transaction_normalized"."funding_agency_id" = FA."id")
+LEFT OUTER JOIN
+  "toptier_agency" AS TFA ON (FA."toptier_agency_id" = TFA."toptier_agency_id")
+LEFT OUTER JOIN
+  "subtier_agency" AS SFA ON (FA."subtier_agency_id" = SFA."subtier_agency_id")
+LEFT OUTER JOIN
+  "naics" ON ("transaction_fpds"."naics" = "naics"."code")
+LEFT OUTER JOIN
+  "psc" ON ("transaction_fpds"."product_or_service_code" = "psc"."code")
+WHERE
+  EXISTS (SELECT 1 FROM (SELECT DISTINCT cast(date_trunc('month', action_date) as date) FROM matview_refresh_dates) AS refresh_partitions (partition_start) WHERE "transaction_normalized"."action_date" >= partition_start AND "transaction_normalized"."action_date" < partition_start + interval '1 month') AND
+  "transaction_normalized"."action_date" >= '2007-10-01'
+GROUP BY
+  cast(date_trunc('month', "transaction_normalized"."action_date") as date),
+  "transaction_normalized"."fiscal_year",
+  ((MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 3) / 3),
+  (MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 1),
+  "transaction_normalized"."type",
+  "transaction_fpds"."pulled_from",
+
+  recipient_location."location_country_code",
+  recipient_location."country_name",
+  recipient_location."state_code",
+  recipient_location."county_code",
+  recipient_location."county_name",
+  recipient_location."congressional_code",
+  recipient_location."zip5",
+
+  place_of_performance."location_country_code",
+  place_of_performance."country_name",
+  place_of_performance."state_code",
+  place_of_performance."county_code",
+  place_of_performance."county_name",
+  place_of_performance."congressional_code",
+  place_of_performance."zip5",
+
+  "transaction_normalized"."awarding_agency_id",
+  "transaction_normalized"."funding_agency_id",
+  TAA."name",
+  TFA."name",
+  SAA."name",
+  SFA."name",
+  TAA."abbreviation",
+  TFA."abbreviation",
+  SAA."abbreviation",
+  SFA."abbreviation",
+
+  "legal_entity"."business_categories",
+  "transaction_fabs"."cfda_number",
+  "references_cfda"."program_title",
+  "references_cfda"."popular_name",
+  "transaction_fpds"."product_or_service_code",
+  "psc"."description",
+  "transaction_fpds"."naics",
+  "naics"."description",
+
+  obligation_to_enum("awards"."total_obligation"),
+  "transaction_fpds"."type_of_contract_pricing",
+  "transaction_fpds"."type_set_aside",
+  "transaction_fpds"."extent_competed"
+ORDER BY
+  cast(date_trunc('month', "transaction_normalized"."action_date") as date) DESC;
+DELETE FROM summary_transaction_month_view WHERE EXISTS (SELECT 1 FROM (SELECT DISTINCT cast(date_trunc('month', action_date) as date) FROM matview_refresh_dates) AS refresh_partitions (partition_start) WHERE "action_date" >= partition_start AND "action_date" < partition_start + interval '1 month');
+INSERT INTO summary_transaction_month_view SELECT * FROM summary_transaction_month_view_delta;
+ANALYZE VERBOSE summary_transaction_month_view;
@@ -5,11 +5,13 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-CREATE MATERIALIZED VIEW summary_transaction_month_view_temp AS
+CREATE TABLE summary_transaction_month_view_temp AS
 SELECT
   MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
   cast(date_trunc('month', "transaction_normalized"."action_date") as date) as "action_date",
   "transaction_normalized"."fiscal_year",
+  ((MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 3) / 3) AS "fiscal_quarter",
+  (MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 1) AS "fiscal_month",
   "transaction_normalized"."type",
   "transaction_fpds"."pulled_from",
 
@@ -93,6 +95,8 @@ WHERE
 GROUP BY
   cast(date_trunc('month', "transaction_normalized"."action_date") as date),
   "transaction_normalized"."fiscal_year",
+  ((MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 3) / 3),
+  (MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 1),
   "transaction_normalized"."type",
   "transaction_fpds"."pulled_from",
 
@@ -5,7 +5,7 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-CREATE UNIQUE INDEX idx_1b698194$f60_unique_pk_temp ON summary_view_cfda_number_temp USING BTREE("pk") WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$f60_action_date_temp ON summary_view_cfda_number_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$f60_type_temp ON summary_view_cfda_number_temp USING BTREE("type") WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$f60_pulled_from_temp ON summary_view_cfda_number_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
+CREATE UNIQUE INDEX idx_e831a0f8$9b7_unique_pk_temp ON summary_view_cfda_number_temp USING BTREE("pk") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$9b7_action_date_temp ON summary_view_cfda_number_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$9b7_type_temp ON summary_view_cfda_number_temp USING BTREE("type") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$9b7_pulled_from_temp ON summary_view_cfda_number_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
@@ -5,7 +5,7 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-CREATE MATERIALIZED VIEW summary_view_cfda_number_temp AS
+CREATE TABLE summary_view_cfda_number_temp AS
 SELECT
   MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
   "transaction_normalized"."action_date",
@@ -5,14 +5,14 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-ALTER MATERIALIZED VIEW IF EXISTS summary_view_cfda_number RENAME TO summary_view_cfda_number_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_unique_pk RENAME TO idx_1b698194$f60_unique_pk_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_action_date RENAME TO idx_1b698194$f60_action_date_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_type RENAME TO idx_1b698194$f60_type_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_pulled_from RENAME TO idx_1b698194$f60_pulled_from_old;
+ALTER TABLE IF EXISTS summary_view_cfda_number RENAME TO summary_view_cfda_number_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_unique_pk RENAME TO idx_e831a0f8$9b7_unique_pk_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_action_date RENAME TO idx_e831a0f8$9b7_action_date_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_type RENAME TO idx_e831a0f8$9b7_type_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_pulled_from RENAME TO idx_e831a0f8$9b7_pulled_from_old;
 
-ALTER MATERIALIZED VIEW summary_view_cfda_number_temp RENAME TO summary_view_cfda_number;
-ALTER INDEX idx_1b698194$f60_unique_pk_temp RENAME TO idx_1b698194$f60_unique_pk;
-ALTER INDEX idx_1b698194$f60_action_date_temp RENAME TO idx_1b698194$f60_action_date;
-ALTER INDEX idx_1b698194$f60_type_temp RENAME TO idx_1b698194$f60_type;
-ALTER INDEX idx_1b698194$f60_pulled_from_temp RENAME TO idx_1b698194$f60_pulled_from;
+ALTER TABLE summary_view_cfda_number_temp RENAME TO summary_view_cfda_number;
+ALTER INDEX idx_e831a0f8$9b7_unique_pk_temp RENAME TO idx_e831a0f8$9b7_unique_pk;
+ALTER INDEX idx_e831a0f8$9b7_action_date_temp RENAME TO idx_e831a0f8$9b7_action_date;
+ALTER INDEX idx_e831a0f8$9b7_type_temp RENAME TO idx_e831a0f8$9b7_type;
+ALTER INDEX idx_e831a0f8$9b7_pulled_from_temp RENAME TO idx_e831a0f8$9b7_pulled_from;
@@ -5,5 +5,15 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS summary_view_naics_codes_temp CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS summary_view_naics_codes_old CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_naics_codes_temp') THEN
+    DROP MATERIALIZED VIEW summary_view_naics_codes_temp CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_naics_codes_temp CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_naics_codes_old') THEN
+    DROP MATERIALIZED VIEW summary_view_naics_codes_old CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_naics_codes_old CASCADE;
@@ -0,0 +1,34 @@
+--------------------------------------------------------
+-- Created using matview_sql_generator.py             --
+--    The SQL definition is stored in a json file     --
+--    Look in matview_generator for the code.         --
+--                                                    --
+--         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
+--------------------------------------------------------
+CREATE TEMPORARY TABLE summary_view_psc_codes_delta ON COMMIT DROP AS
+SELECT
+  MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
+  "transaction_normalized"."action_date",
+  "transaction_normalized"."fiscal_year",
+  "transaction_normalized"."type",
+  "transaction_fpds"."pulled_from",
+  "transaction_fpds"."product_or_service_code",
+  SUM(COALESCE("transaction_normalized"."federal_action_obligation", 0))::NUMERIC(20, 2) AS "federal_action_obligation",
+  0::NUMERIC(20, 2) AS "original_loan_subsidy_cost",
+  COUNT(*) counts
+FROM
+  "transaction_normalized"
+INNER JOIN
+  "transaction_fpds" ON ("transaction_normalized"."id" = "transaction_fpds"."transaction_id")
+WHERE
+  "transaction_normalized"."action_date" IN (SELECT action_date FROM matview_refresh_dates) AND
+  "transaction_normalized".action_date >= '2007-10-01'
+GROUP BY
+  "transaction_normalized"."action_date",
+  "transaction_normalized"."fiscal_year",
+  "transaction_normalized"."type",
+  "transaction_fpds"."pulled_from",
+  "transaction_fpds"."product_or_service_code";
+DELETE FROM summary_view_psc_codes WHERE "action_date" IN (SELECT action_date FROM matview_refresh_dates);
+INSERT INTO summary_view_psc_codes SELECT * FROM summary_view_psc_codes_delta;
+ANALYZE VERBOSE summary_view_psc_codes;
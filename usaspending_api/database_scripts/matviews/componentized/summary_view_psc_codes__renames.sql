@@ -5,14 +5,14 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-ALTER MATERIALIZED VIEW IF EXISTS summary_view_psc_codes RENAME TO summary_view_psc_codes_old;
-ALTER INDEX IF EXISTS idx_1b698194$c4b_unique_pk RENAME TO idx_1b698194$c4b_unique_pk_old;
-ALTER INDEX IF EXISTS idx_1b698194$c4b_action_date RENAME TO idx_1b698194$c4b_action_date_old;
-ALTER INDEX IF EXISTS idx_1b698194$c4b_type RENAME TO idx_1b698194$c4b_type_old;
-ALTER INDEX IF EXISTS idx_1b698194$c4b_pulled_from RENAME TO idx_1b698194$c4b_pulled_from_old;
+ALTER TABLE IF EXISTS summary_view_psc_codes RENAME TO summary_view_psc_codes_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$6e4_unique_pk RENAME TO idx_e831a0f8$6e4_unique_pk_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$6e4_action_date RENAME TO idx_e831a0f8$6e4_action_date_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$6e4_type RENAME TO idx_e831a0f8$6e4_type_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$6e4_pulled_from RENAME TO idx_e831a0f8$6e4_pulled_from_old;
 
-ALTER MATERIALIZED VIEW summary_view_psc_codes_temp RENAME TO summary_view_psc_codes;
-ALTER INDEX idx_1b698194$c4b_unique_pk_temp RENAME TO idx_1b698194$c4b_unique_pk;
-ALTER INDEX idx_1b698194$c4b_action_date_temp RENAME TO idx_1b698194$c4b_action_date;
-ALTER INDEX idx_1b698194$c4b_type_temp RENAME TO idx_1b698194$c4b_type;
-ALTER INDEX idx_1b698194$c4b_pulled_from_temp RENAME TO idx_1b698194$c4b_pulled_from;
+ALTER TABLE summary_view_psc_codes_temp RENAME TO summary_view_psc_codes;
+ALTER INDEX idx_e831a0f8$6e4_unique_pk_temp RENAME TO idx_e831a0f8$6e4_unique_pk;
+ALTER INDEX idx_e831a0f8$6e4_action_date_temp RENAME TO idx_e831a0f8$6e4_action_date;
+ALTER INDEX idx_e831a0f8$6e4_type_temp RENAME TO idx_e831a0f8$6e4_type;
+ALTER INDEX idx_e831a0f8$6e4_pulled_from_temp RENAME TO idx_e831a0f8$6e4_pulled_from;
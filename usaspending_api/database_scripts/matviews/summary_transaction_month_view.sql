@@ -5,14 +5,26 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS summary_transaction_month_view_temp CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS summary_transaction_month_view_old CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_transaction_month_view_temp') THEN
+    DROP MATERIALIZED VIEW summary_transaction_month_view_temp CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_transaction_month_view_temp CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_transaction_month_view_old') THEN
+    DROP MATERIALIZED VIEW summary_transaction_month_view_old CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_transaction_month_view_old CASCADE;
 
-CREATE MATERIALIZED VIEW summary_transaction_month_view_temp AS
+CREATE TABLE summary_transaction_month_view_temp AS
 SELECT
   MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
   cast(date_trunc('month', "transaction_normalized"."action_date") as date) as "action_date",
   "transaction_normalized"."fiscal_year",
+  ((MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 3) / 3) AS "fiscal_quarter",
+  (MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 1) AS "fiscal_month",
   "transaction_normalized"."type",
   "transaction_fpds"."pulled_from",
 
@@ -96,6 +108,8 @@ WHERE
 GROUP BY
   cast(date_trunc('month', "transaction_normalized"."action_date") as date),
   "transaction_normalized"."fiscal_year",
+  ((MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 3) / 3),
+  (MOD(CAST(EXTRACT(MONTH FROM "transaction_normalized"."action_date") AS INTEGER) + 2, 12) + 1),
   "transaction_normalized"."type",
   "transaction_fpds"."pulled_from",
 
@@ -142,118 +156,118 @@ GROUP BY
 ORDER BY
   cast(date_trunc('month', "transaction_normalized"."action_date") as date) DESC;
 
-CREATE UNIQUE INDEX idx_c2817a5a$ad6_unique_pk_temp ON summary_transaction_month_view_temp USING BTREE("pk") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_date_temp ON summary_transaction_month_view_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_fy_temp ON summary_transaction_month_view_temp USING BTREE("fiscal_year" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_fy_type_temp ON summary_transaction_month_view_temp USING BTREE("fiscal_year" DESC NULLS LAST, "type") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_type_temp ON summary_transaction_month_view_temp USING BTREE("type") WITH (fillfactor = 97) WHERE "type" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_pulled_from_temp ON summary_transaction_month_view_temp USING BTREE("pulled_from" DESC NULLS LAST) WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_recipient_country_code_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code") WITH (fillfactor = 97) WHERE "recipient_location_country_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_recipient_state_code_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_state_code") WITH (fillfactor = 97) WHERE "recipient_location_state_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_recipient_county_code_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_county_code") WITH (fillfactor = 97) WHERE "recipient_location_county_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_recipient_zip_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_zip5") WITH (fillfactor = 97) WHERE "recipient_location_zip5" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_pop_country_code_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code") WITH (fillfactor = 97) WHERE "pop_country_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_pop_state_code_temp ON summary_transaction_month_view_temp USING BTREE("pop_state_code") WITH (fillfactor = 97) WHERE "pop_state_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_pop_county_code_temp ON summary_transaction_month_view_temp USING BTREE("pop_county_code") WITH (fillfactor = 97) WHERE "pop_county_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_pop_zip_temp ON summary_transaction_month_view_temp USING BTREE("pop_zip5") WITH (fillfactor = 97) WHERE "pop_zip5" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_awarding_agency_id_temp ON summary_transaction_month_view_temp USING BTREE("awarding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "awarding_agency_id" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_funding_agency_id_temp ON summary_transaction_month_view_temp USING BTREE("funding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "funding_agency_id" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_awarding_toptier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("awarding_toptier_agency_name") WITH (fillfactor = 97) WHERE "awarding_toptier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_awarding_subtier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("awarding_subtier_agency_name") WITH (fillfactor = 97) WHERE "awarding_subtier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_funding_toptier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("funding_toptier_agency_name") WITH (fillfactor = 97) WHERE "funding_toptier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_funding_subtier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("funding_subtier_agency_name") WITH (fillfactor = 97) WHERE "funding_subtier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_cfda_number_temp ON summary_transaction_month_view_temp USING BTREE("cfda_number") WITH (fillfactor = 97) WHERE "cfda_number" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_cfda_title_temp ON summary_transaction_month_view_temp USING BTREE("cfda_title") WITH (fillfactor = 97) WHERE "cfda_title" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_psc_temp ON summary_transaction_month_view_temp USING BTREE("product_or_service_code") WITH (fillfactor = 97) WHERE "product_or_service_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_naics_temp ON summary_transaction_month_view_temp USING BTREE("naics_code") WITH (fillfactor = 97) WHERE "naics_code" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_total_obl_bin_temp ON summary_transaction_month_view_temp USING BTREE("total_obl_bin") WITH (fillfactor = 97) WHERE "total_obl_bin" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_type_of_contract_temp ON summary_transaction_month_view_temp USING BTREE("type_of_contract_pricing") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_fy_set_aside_temp ON summary_transaction_month_view_temp USING BTREE("fiscal_year" DESC NULLS LAST, "type_set_aside") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_extent_competed_temp ON summary_transaction_month_view_temp USING BTREE("extent_competed") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$ad6_type_set_aside_temp ON summary_transaction_month_view_temp USING BTREE("type_set_aside") WITH (fillfactor = 97) WHERE "type_set_aside" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$ad6_business_categories_temp ON summary_transaction_month_view_temp USING GIN("business_categories");
-CREATE INDEX idx_c2817a5a$ad6_compound_geo_pop_1_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code", "pop_state_code", "pop_county_code", "fiscal_year") WITH (fillfactor = 97) WHERE "pop_country_code" = 'USA';
-CREATE INDEX idx_c2817a5a$ad6_compound_geo_pop_2_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code", "pop_state_code", "pop_congressional_code", "fiscal_year") WITH (fillfactor = 97) WHERE "pop_country_code" = 'USA';
-CREATE INDEX idx_c2817a5a$ad6_compound_geo_pop_3_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code", "pop_zip5", "fiscal_year") WITH (fillfactor = 97) WHERE "pop_country_code" = 'USA';
-CREATE INDEX idx_c2817a5a$ad6_compound_geo_rl_1_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code", "recipient_location_state_code", "recipient_location_county_code", "fiscal_year") WITH (fillfactor = 97) WHERE "recipient_location_country_code" = 'USA';
-CREATE INDEX idx_c2817a5a$ad6_compound_geo_rl_2_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code", "recipient_location_state_code", "recipient_location_congressional_code", "fiscal_year") WITH (fillfactor = 97) WHERE "recipient_location_country_code" = 'USA';
-CREATE INDEX idx_c2817a5a$ad6_compound_geo_rl_3_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code", "recipient_location_zip5", "fiscal_year") WITH (fillfactor = 97) WHERE "recipient_location_country_code" = 'USA';
+CREATE UNIQUE INDEX idx_32f80c23$c43_unique_pk_temp ON summary_transaction_month_view_temp USING BTREE("pk") WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_date_temp ON summary_transaction_month_view_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_fy_temp ON summary_transaction_month_view_temp USING BTREE("fiscal_year" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_fy_type_temp ON summary_transaction_month_view_temp USING BTREE("fiscal_year" DESC NULLS LAST, "type") WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_type_temp ON summary_transaction_month_view_temp USING BTREE("type") WITH (fillfactor = 97) WHERE "type" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_pulled_from_temp ON summary_transaction_month_view_temp USING BTREE("pulled_from" DESC NULLS LAST) WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_recipient_country_code_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code") WITH (fillfactor = 97) WHERE "recipient_location_country_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_recipient_state_code_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_state_code") WITH (fillfactor = 97) WHERE "recipient_location_state_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_recipient_county_code_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_county_code") WITH (fillfactor = 97) WHERE "recipient_location_county_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_recipient_zip_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_zip5") WITH (fillfactor = 97) WHERE "recipient_location_zip5" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_pop_country_code_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code") WITH (fillfactor = 97) WHERE "pop_country_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_pop_state_code_temp ON summary_transaction_month_view_temp USING BTREE("pop_state_code") WITH (fillfactor = 97) WHERE "pop_state_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_pop_county_code_temp ON summary_transaction_month_view_temp USING BTREE("pop_county_code") WITH (fillfactor = 97) WHERE "pop_county_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_pop_zip_temp ON summary_transaction_month_view_temp USING BTREE("pop_zip5") WITH (fillfactor = 97) WHERE "pop_zip5" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_awarding_agency_id_temp ON summary_transaction_month_view_temp USING BTREE("awarding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "awarding_agency_id" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_funding_agency_id_temp ON summary_transaction_month_view_temp USING BTREE("funding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "funding_agency_id" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_awarding_toptier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("awarding_toptier_agency_name") WITH (fillfactor = 97) WHERE "awarding_toptier_agency_name" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_awarding_subtier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("awarding_subtier_agency_name") WITH (fillfactor = 97) WHERE "awarding_subtier_agency_name" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_funding_toptier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("funding_toptier_agency_name") WITH (fillfactor = 97) WHERE "funding_toptier_agency_name" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_funding_subtier_agency_name_temp ON summary_transaction_month_view_temp USING BTREE("funding_subtier_agency_name") WITH (fillfactor = 97) WHERE "funding_subtier_agency_name" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_cfda_number_temp ON summary_transaction_month_view_temp USING BTREE("cfda_number") WITH (fillfactor = 97) WHERE "cfda_number" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_cfda_title_temp ON summary_transaction_month_view_temp USING BTREE("cfda_title") WITH (fillfactor = 97) WHERE "cfda_title" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_psc_temp ON summary_transaction_month_view_temp USING BTREE("product_or_service_code") WITH (fillfactor = 97) WHERE "product_or_service_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_naics_temp ON summary_transaction_month_view_temp USING BTREE("naics_code") WITH (fillfactor = 97) WHERE "naics_code" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_total_obl_bin_temp ON summary_transaction_month_view_temp USING BTREE("total_obl_bin") WITH (fillfactor = 97) WHERE "total_obl_bin" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_type_of_contract_temp ON summary_transaction_month_view_temp USING BTREE("type_of_contract_pricing") WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_fy_set_aside_temp ON summary_transaction_month_view_temp USING BTREE("fiscal_year" DESC NULLS LAST, "type_set_aside") WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_extent_competed_temp ON summary_transaction_month_view_temp USING BTREE("extent_competed") WITH (fillfactor = 97);
+CREATE INDEX idx_32f80c23$c43_type_set_aside_temp ON summary_transaction_month_view_temp USING BTREE("type_set_aside") WITH (fillfactor = 97) WHERE "type_set_aside" IS NOT NULL;
+CREATE INDEX idx_32f80c23$c43_business_categories_temp ON summary_transaction_month_view_temp USING GIN("business_categories");
+CREATE INDEX idx_32f80c23$c43_compound_geo_pop_1_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code", "pop_state_code", "pop_county_code", "fiscal_year") WITH (fillfactor = 97) WHERE "pop_country_code" = 'USA';
+CREATE INDEX idx_32f80c23$c43_compound_geo_pop_2_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code", "pop_state_code", "pop_congressional_code", "fiscal_year") WITH (fillfactor = 97) WHERE "pop_country_code" = 'USA';
+CREATE INDEX idx_32f80c23$c43_compound_geo_pop_3_temp ON summary_transaction_month_view_temp USING BTREE("pop_country_code", "pop_zip5", "fiscal_year") WITH (fillfactor = 97) WHERE "pop_country_code" = 'USA';
+CREATE INDEX idx_32f80c23$c43_compound_geo_rl_1_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code", "recipient_location_state_code", "recipient_location_county_code", "fiscal_year") WITH (fillfactor = 97) WHERE "recipient_location_country_code" = 'USA';
+CREATE INDEX idx_32f80c23$c43_compound_geo_rl_2_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code", "recipient_location_state_code", "recipient_location_congressional_code", "fiscal_year") WITH (fillfactor = 97) WHERE "recipient_location_country_code" = 'USA';
+CREATE INDEX idx_32f80c23$c43_compound_geo_rl_3_temp ON summary_transaction_month_view_temp USING BTREE("recipient_location_country_code", "recipient_location_zip5", "fiscal_year") WITH (fillfactor = 97) WHERE "recipient_location_country_code" = 'USA';
 
-ALTER MATERIALIZED VIEW IF EXISTS summary_transaction_month_view RENAME TO summary_transaction_month_view_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_unique_pk RENAME TO idx_c2817a5a$ad6_unique_pk_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_date RENAME TO idx_c2817a5a$ad6_date_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_fy RENAME TO idx_c2817a5a$ad6_fy_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_fy_type RENAME TO idx_c2817a5a$ad6_fy_type_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_type RENAME TO idx_c2817a5a$ad6_type_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_pulled_from RENAME TO idx_c2817a5a$ad6_pulled_from_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_recipient_country_code RENAME TO idx_c2817a5a$ad6_recipient_country_code_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_recipient_state_code RENAME TO idx_c2817a5a$ad6_recipient_state_code_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_recipient_county_code RENAME TO idx_c2817a5a$ad6_recipient_county_code_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_recipient_zip RENAME TO idx_c2817a5a$ad6_recipient_zip_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_pop_country_code RENAME TO idx_c2817a5a$ad6_pop_country_code_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_pop_state_code RENAME TO idx_c2817a5a$ad6_pop_state_code_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_pop_county_code RENAME TO idx_c2817a5a$ad6_pop_county_code_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_pop_zip RENAME TO idx_c2817a5a$ad6_pop_zip_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_awarding_agency_id RENAME TO idx_c2817a5a$ad6_awarding_agency_id_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_funding_agency_id RENAME TO idx_c2817a5a$ad6_funding_agency_id_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_awarding_toptier_agency_name RENAME TO idx_c2817a5a$ad6_awarding_toptier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_awarding_subtier_agency_name RENAME TO idx_c2817a5a$ad6_awarding_subtier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_funding_toptier_agency_name RENAME TO idx_c2817a5a$ad6_funding_toptier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_funding_subtier_agency_name RENAME TO idx_c2817a5a$ad6_funding_subtier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_cfda_number RENAME TO idx_c2817a5a$ad6_cfda_number_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_cfda_title RENAME TO idx_c2817a5a$ad6_cfda_title_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_psc RENAME TO idx_c2817a5a$ad6_psc_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_naics RENAME TO idx_c2817a5a$ad6_naics_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_total_obl_bin RENAME TO idx_c2817a5a$ad6_total_obl_bin_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_type_of_contract RENAME TO idx_c2817a5a$ad6_type_of_contract_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_fy_set_aside RENAME TO idx_c2817a5a$ad6_fy_set_aside_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_extent_competed RENAME TO idx_c2817a5a$ad6_extent_competed_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_type_set_aside RENAME TO idx_c2817a5a$ad6_type_set_aside_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_business_categories RENAME TO idx_c2817a5a$ad6_business_categories_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_compound_geo_pop_1 RENAME TO idx_c2817a5a$ad6_compound_geo_pop_1_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_compound_geo_pop_2 RENAME TO idx_c2817a5a$ad6_compound_geo_pop_2_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_compound_geo_pop_3 RENAME TO idx_c2817a5a$ad6_compound_geo_pop_3_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_compound_geo_rl_1 RENAME TO idx_c2817a5a$ad6_compound_geo_rl_1_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_compound_geo_rl_2 RENAME TO idx_c2817a5a$ad6_compound_geo_rl_2_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$ad6_compound_geo_rl_3 RENAME TO idx_c2817a5a$ad6_compound_geo_rl_3_old;
+ALTER TABLE IF EXISTS summary_transaction_month_view RENAME TO summary_transaction_month_view_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_unique_pk RENAME TO idx_32f80c23$c43_unique_pk_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_date RENAME TO idx_32f80c23$c43_date_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_fy RENAME TO idx_32f80c23$c43_fy_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_fy_type RENAME TO idx_32f80c23$c43_fy_type_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_type RENAME TO idx_32f80c23$c43_type_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_pulled_from RENAME TO idx_32f80c23$c43_pulled_from_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_recipient_country_code RENAME TO idx_32f80c23$c43_recipient_country_code_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_recipient_state_code RENAME TO idx_32f80c23$c43_recipient_state_code_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_recipient_county_code RENAME TO idx_32f80c23$c43_recipient_county_code_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_recipient_zip RENAME TO idx_32f80c23$c43_recipient_zip_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_pop_country_code RENAME TO idx_32f80c23$c43_pop_country_code_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_pop_state_code RENAME TO idx_32f80c23$c43_pop_state_code_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_pop_county_code RENAME TO idx_32f80c23$c43_pop_county_code_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_pop_zip RENAME TO idx_32f80c23$c43_pop_zip_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_awarding_agency_id RENAME TO idx_32f80c23$c43_awarding_agency_id_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_funding_agency_id RENAME TO idx_32f80c23$c43_funding_agency_id_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_awarding_toptier_agency_name RENAME TO idx_32f80c23$c43_awarding_toptier_agency_name_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_awarding_subtier_agency_name RENAME TO idx_32f80c23$c43_awarding_subtier_agency_name_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_funding_toptier_agency_name RENAME TO idx_32f80c23$c43_funding_toptier_agency_name_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_funding_subtier_agency_name RENAME TO idx_32f80c23$c43_funding_subtier_agency_name_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_cfda_number RENAME TO idx_32f80c23$c43_cfda_number_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_cfda_title RENAME TO idx_32f80c23$c43_cfda_title_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_psc RENAME TO idx_32f80c23$c43_psc_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_naics RENAME TO idx_32f80c23$c43_naics_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_total_obl_bin RENAME TO idx_32f80c23$c43_total_obl_bin_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_type_of_contract RENAME TO idx_32f80c23$c43_type_of_contract_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_fy_set_aside RENAME TO idx_32f80c23$c43_fy_set_aside_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_extent_competed RENAME TO idx_32f80c23$c43_extent_competed_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_type_set_aside RENAME TO idx_32f80c23$c43_type_set_aside_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_business_categories RENAME TO idx_32f80c23$c43_business_categories_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_compound_geo_pop_1 RENAME TO idx_32f80c23$c43_compound_geo_pop_1_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_compound_geo_pop_2 RENAME TO idx_32f80c23$c43_compound_geo_pop_2_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_compound_geo_pop_3 RENAME TO idx_32f80c23$c43_compound_geo_pop_3_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_compound_geo_rl_1 RENAME TO idx_32f80c23$c43_compound_geo_rl_1_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_compound_geo_rl_2 RENAME TO idx_32f80c23$c43_compound_geo_rl_2_old;
+ALTER INDEX IF EXISTS idx_32f80c23$c43_compound_geo_rl_3 RENAME TO idx_32f80c23$c43_compound_geo_rl_3_old;
 
-ALTER MATERIALIZED VIEW summary_transaction_month_view_temp RENAME TO summary_transaction_month_view;
-ALTER INDEX idx_c2817a5a$ad6_unique_pk_temp RENAME TO idx_c2817a5a$ad6_unique_pk;
-ALTER INDEX idx_c2817a5a$ad6_date_temp RENAME TO idx_c2817a5a$ad6_date;
-ALTER INDEX idx_c2817a5a$ad6_fy_temp RENAME TO idx_c2817a5a$ad6_fy;
-ALTER INDEX idx_c2817a5a$ad6_fy_type_temp RENAME TO idx_c2817a5a$ad6_fy_type;
-ALTER INDEX idx_c2817a5a$ad6_type_temp RENAME TO idx_c2817a5a$ad6_type;
-ALTER INDEX idx_c2817a5a$ad6_pulled_from_temp RENAME TO idx_c2817a5a$ad6_pulled_from;
-ALTER INDEX idx_c2817a5a$ad6_recipient_country_code_temp RENAME TO idx_c2817a5a$ad6_recipient_country_code;
-ALTER INDEX idx_c2817a5a$ad6_recipient_state_code_temp RENAME TO idx_c2817a5a$ad6_recipient_state_code;
-ALTER INDEX idx_c2817a5a$ad6_recipient_county_code_temp RENAME TO idx_c2817a5a$ad6_recipient_county_code;
-ALTER INDEX idx_c2817a5a$ad6_recipient_zip_temp RENAME TO idx_c2817a5a$ad6_recipient_zip;
-ALTER INDEX idx_c2817a5a$ad6_pop_country_code_temp RENAME TO idx_c2817a5a$ad6_pop_country_code;
-ALTER INDEX idx_c2817a5a$ad6_pop_state_code_temp RENAME TO idx_c2817a5a$ad6_pop_state_code;
-ALTER INDEX idx_c2817a5a$ad6_pop_county_code_temp RENAME TO idx_c2817a5a$ad6_pop_county_code;
-ALTER INDEX idx_c2817a5a$ad6_pop_zip_temp RENAME TO idx_c2817a5a$ad6_pop_zip;
-ALTER INDEX idx_c2817a5a$ad6_awarding_agency_id_temp RENAME TO idx_c2817a5a$ad6_awarding_agency_id;
-ALTER INDEX idx_c2817a5a$ad6_funding_agency_id_temp RENAME TO idx_c2817a5a$ad6_funding_agency_id;
-ALTER INDEX idx_c2817a5a$ad6_awarding_toptier_agency_name_temp RENAME TO idx_c2817a5a$ad6_awarding_toptier_agency_name;
-ALTER INDEX idx_c2817a5a$ad6_awarding_subtier_agency_name_temp RENAME TO idx_c2817a5a$ad6_awarding_subtier_agency_name;
-ALTER INDEX idx_c2817a5a$ad6_funding_toptier_agency_name_temp RENAME TO idx_c2817a5a$ad6_funding_toptier_agency_name;
-ALTER INDEX idx_c2817a5a$ad6_funding_subtier_agency_name_temp RENAME TO idx_c2817a5a$ad6_funding_subtier_agency_name;
-ALTER INDEX idx_c2817a5a$ad6_cfda_number_temp RENAME TO idx_c2817a5a$ad6_cfda_number;
-ALTER INDEX idx_c2817a5a$ad6_cfda_title_temp RENAME TO idx_c2817a5a$ad6_cfda_title;
-ALTER INDEX idx_c2817a5a$ad6_psc_temp RENAME TO idx_c2817a5a$ad6_psc;
-ALTER INDEX idx_c2817a5a$ad6_naics_temp RENAME TO idx_c2817a5a$ad6_naics;
-ALTER INDEX idx_c2817a5a$ad6_total_obl_bin_temp RENAME TO idx_c2817a5a$ad6_total_obl_bin;
-ALTER INDEX idx_c2817a5a$ad6_type_of_contract_temp RENAME TO idx_c2817a5a$ad6_type_of_contract;
-ALTER INDEX idx_c2817a5a$ad6_fy_set_aside_temp RENAME TO idx_c2817a5a$ad6_fy_set_aside;
-ALTER INDEX idx_c2817a5a$ad6_extent_competed_temp RENAME TO idx_c2817a5a$ad6_extent_competed;
-ALTER INDEX idx_c2817a5a$ad6_type_set_aside_temp RENAME TO idx_c2817a5a$ad6_type_set_aside;
-ALTER INDEX idx_c2817a5a$ad6_business_categories_temp RENAME TO idx_c2817a5a$ad6_business_categories;
-ALTER INDEX idx_c2817a5a$ad6_compound_geo_pop_1_temp RENAME TO idx_c2817a5a$ad6_compound_geo_pop_1;
-ALTER INDEX idx_c2817a5a$ad6_compound_geo_pop_2_temp RENAME TO idx_c2817a5a$ad6_compound_geo_pop_2;
-ALTER INDEX idx_c2817a5a$ad6_compound_geo_pop_3_temp RENAME TO idx_c2817a5a$ad6_compound_geo_pop_3;
-ALTER INDEX idx_c2817a5a$ad6_compound_geo_rl_1_temp RENAME TO idx_c2817a5a$ad6_compound_geo_rl_1;
-ALTER INDEX idx_c2817a5a$ad6_compound_geo_rl_2_temp RENAME TO idx_c2817a5a$ad6_compound_geo_rl_2;
-ALTER INDEX idx_c2817a5a$ad6_compound_geo_rl_3_temp RENAME TO idx_c2817a5a$ad6_compound_geo_rl_3;
+ALTER TABLE summary_transaction_month_view_temp RENAME TO summary_transaction_month_view;
+ALTER INDEX idx_32f80c23$c43_unique_pk_temp RENAME TO idx_32f80c23$c43_unique_pk;
+ALTER INDEX idx_32f80c23$c43_date_temp RENAME TO idx_32f80c23$c43_date;
+ALTER INDEX idx_32f80c23$c43_fy_temp RENAME TO idx_32f80c23$c43_fy;
+ALTER INDEX idx_32f80c23$c43_fy_type_temp RENAME TO idx_32f80c23$c43_fy_type;
+ALTER INDEX idx_32f80c23$c43_type_temp RENAME TO idx_32f80c23$c43_type;
+ALTER INDEX idx_32f80c23$c43_pulled_from_temp RENAME TO idx_32f80c23$c43_pulled_from;
+ALTER INDEX idx_32f80c23$c43_recipient_country_code_temp RENAME TO idx_32f80c23$c43_recipient_country_code;
+ALTER INDEX idx_32f80c23$c43_recipient_state_code_temp RENAME TO idx_32f80c23$c43_recipient_state_code;
+ALTER INDEX idx_32f80c23$c43_recipient_county_code_temp RENAME TO idx_32f80c23$c43_recipient_county_code;
+ALTER INDEX idx_32f80c23$c43_recipient_zip_temp RENAME TO idx_32f80c23$c43_recipient_zip;
+ALTER INDEX idx_32f80c23$c43_pop_country_code_temp RENAME TO idx_32f80c23$c43_pop_country_code;
+ALTER INDEX idx_32f80c23$c43_pop_state_code_temp RENAME TO idx_32f80c23$c43_pop_state_code;
+ALTER INDEX idx_32f80c23$c43_pop_county_code_temp RENAME TO idx_32f80c23$c43_pop_county_code;
+ALTER INDEX idx_32f80c23$c43_pop_zip_temp RENAME TO idx_32f80c23$c43_pop_zip;
+ALTER INDEX idx_32f80c23$c43_awarding_agency_id_temp RENAME TO idx_32f80c23$c43_awarding_agency_id;
+ALTER INDEX idx_32f80c23$c43_funding_agency_id_temp RENAME TO idx_32f80c23$c43_funding_agency_id;
+ALTER INDEX idx_32f80c23$c43_awarding_toptier_agency_name_temp RENAME TO idx_32f80c23$c43_awarding_toptier_agency_name;
+ALTER INDEX idx_32f80c23$c43_awarding_subtier_agency_name_temp RENAME TO idx_32f80c23$c43_awarding_subtier_agency_name;
+ALTER INDEX idx_32f80c23$c43_funding_toptier_agency_name_temp RENAME TO idx_32f80c23$c43_funding_toptier_agency_name;
+ALTER INDEX idx_32f80c23$c43_funding_subtier_agency_name_temp RENAME TO idx_32f80c23$c43_funding_subtier_agency_name;
+ALTER INDEX idx_32f80c23$c43_cfda_number_temp RENAME TO idx_32f80c23$c43_cfda_number;
+ALTER INDEX idx_32f80c23$c43_cfda_title_temp RENAME TO idx_32f80c23$c43_cfda_title;
+ALTER INDEX idx_32f80c23$c43_psc_temp RENAME TO idx_32f80c23$c43_psc;
+ALTER INDEX idx_32f80c23$c43_naics_temp RENAME TO idx_32f80c23$c43_naics;
+ALTER INDEX idx_32f80c23$c43_total_obl_bin_temp RENAME TO idx_32f80c23$c43_total_obl_bin;
+ALTER INDEX idx_32f80c23$c43_type_of_contract_temp RENAME TO idx_32f80c23$c43_type_of_contract;
+ALTER INDEX idx_32f80c23$c43_fy_set_aside_temp RENAME TO idx_32f80c23$c43_fy_set_aside;
+ALTER INDEX idx_32f80c23$c43_extent_competed_temp RENAME TO idx_32f80c23$c43_extent_competed;
+ALTER INDEX idx_32f80c23$c43_type_set_aside_temp RENAME TO idx_32f80c23$c43_type_set_aside;
+ALTER INDEX idx_32f80c23$c43_business_categories_temp RENAME TO idx_32f80c23$c43_business_categories;
+ALTER INDEX idx_32f80c23$c43_compound_geo_pop_1_temp RENAME TO idx_32f80c23$c43_compound_geo_pop_1;
+ALTER INDEX idx_32f80c23$c43_compound_geo_pop_2_temp RENAME TO idx_32f80c23$c43_compound_geo_pop_2;
+ALTER INDEX idx_32f80c23$c43_compound_geo_pop_3_temp RENAME TO idx_32f80c23$c43_compound_geo_pop_3;
+ALTER INDEX idx_32f80c23$c43_compound_geo_rl_1_temp RENAME TO idx_32f80c23$c43_compound_geo_rl_1;
+ALTER INDEX idx_32f80c23$c43_compound_geo_rl_2_temp RENAME TO idx_32f80c23$c43_compound_geo_rl_2;
+ALTER INDEX idx_32f80c23$c43_compound_geo_rl_3_temp RENAME TO idx_32f80c23$c43_compound_geo_rl_3;
 
 ANALYZE VERBOSE summary_transaction_month_view;
 GRANT SELECT ON summary_transaction_month_view TO readonly;
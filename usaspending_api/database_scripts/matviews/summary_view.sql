@@ -5,10 +5,20 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS summary_view_temp CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS summary_view_old CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_temp') THEN
+    DROP MATERIALIZED VIEW summary_view_temp CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_temp CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_old') THEN
+    DROP MATERIALIZED VIEW summary_view_old CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_old CASCADE;
 
-CREATE MATERIALIZED VIEW summary_view_temp AS
+CREATE TABLE summary_view_temp AS
 SELECT
   MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
   "transaction_normalized"."action_date",
@@ -67,43 +77,43 @@ GROUP BY
   SAA."abbreviation",
   SFA."abbreviation";
 
-CREATE UNIQUE INDEX idx_c2817a5a$5fd_unique_pk_temp ON summary_view_temp USING BTREE("pk") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$5fd_action_date_temp ON summary_view_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$5fd_type_temp ON summary_view_temp USING BTREE("type") WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$5fd_fy_temp ON summary_view_temp USING BTREE("fiscal_year" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_c2817a5a$5fd_pulled_from_temp ON summary_view_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$5fd_awarding_agency_id_temp ON summary_view_temp USING BTREE("awarding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "awarding_agency_id" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$5fd_funding_agency_id_temp ON summary_view_temp USING BTREE("funding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "funding_agency_id" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$5fd_awarding_toptier_agency_name_temp ON summary_view_temp USING BTREE("awarding_toptier_agency_name") WITH (fillfactor = 97) WHERE "awarding_toptier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$5fd_awarding_subtier_agency_name_temp ON summary_view_temp USING BTREE("awarding_subtier_agency_name") WITH (fillfactor = 97) WHERE "awarding_subtier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$5fd_funding_toptier_agency_name_temp ON summary_view_temp USING BTREE("funding_toptier_agency_name") WITH (fillfactor = 97) WHERE "funding_toptier_agency_name" IS NOT NULL;
-CREATE INDEX idx_c2817a5a$5fd_funding_subtier_agency_name_temp ON summary_view_temp USING BTREE("funding_subtier_agency_name") WITH (fillfactor = 97) WHERE "funding_subtier_agency_name" IS NOT NULL;
+CREATE UNIQUE INDEX idx_e831a0f8$371_unique_pk_temp ON summary_view_temp USING BTREE("pk") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$371_action_date_temp ON summary_view_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$371_type_temp ON summary_view_temp USING BTREE("type") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$371_fy_temp ON summary_view_temp USING BTREE("fiscal_year" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$371_pulled_from_temp ON summary_view_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$371_awarding_agency_id_temp ON summary_view_temp USING BTREE("awarding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "awarding_agency_id" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$371_funding_agency_id_temp ON summary_view_temp USING BTREE("funding_agency_id" ASC NULLS LAST) WITH (fillfactor = 97) WHERE "funding_agency_id" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$371_awarding_toptier_agency_name_temp ON summary_view_temp USING BTREE("awarding_toptier_agency_name") WITH (fillfactor = 97) WHERE "awarding_toptier_agency_name" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$371_awarding_subtier_agency_name_temp ON summary_view_temp USING BTREE("awarding_subtier_agency_name") WITH (fillfactor = 97) WHERE "awarding_subtier_agency_name" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$371_funding_toptier_agency_name_temp ON summary_view_temp USING BTREE("funding_toptier_agency_name") WITH (fillfactor = 97) WHERE "funding_toptier_agency_name" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$371_funding_subtier_agency_name_temp ON summary_view_temp USING BTREE("funding_subtier_agency_name") WITH (fillfactor = 97) WHERE "funding_subtier_agency_name" IS NOT NULL;
 
-ALTER MATERIALIZED VIEW IF EXISTS summary_view RENAME TO summary_view_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_unique_pk RENAME TO idx_c2817a5a$5fd_unique_pk_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_action_date RENAME TO idx_c2817a5a$5fd_action_date_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_type RENAME TO idx_c2817a5a$5fd_type_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_fy RENAME TO idx_c2817a5a$5fd_fy_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_pulled_from RENAME TO idx_c2817a5a$5fd_pulled_from_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_awarding_agency_id RENAME TO idx_c2817a5a$5fd_awarding_agency_id_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_funding_agency_id RENAME TO idx_c2817a5a$5fd_funding_agency_id_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_awarding_toptier_agency_name RENAME TO idx_c2817a5a$5fd_awarding_toptier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_awarding_subtier_agency_name RENAME TO idx_c2817a5a$5fd_awarding_subtier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_funding_toptier_agency_name RENAME TO idx_c2817a5a$5fd_funding_toptier_agency_name_old;
-ALTER INDEX IF EXISTS idx_c2817a5a$5fd_funding_subtier_agency_name RENAME TO idx_c2817a5a$5fd_funding_subtier_agency_name_old;
+ALTER TABLE IF EXISTS summary_view RENAME TO summary_view_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_unique_pk RENAME TO idx_e831a0f8$371_unique_pk_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_action_date RENAME TO idx_e831a0f8$371_action_date_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_type RENAME TO idx_e831a0f8$371_type_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_fy RENAME TO idx_e831a0f8$371_fy_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_pulled_from RENAME TO idx_e831a0f8$371_pulled_from_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_awarding_agency_id RENAME TO idx_e831a0f8$371_awarding_agency_id_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_funding_agency_id RENAME TO idx_e831a0f8$371_funding_agency_id_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_awarding_toptier_agency_name RENAME TO idx_e831a0f8$371_awarding_toptier_agency_name_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_awarding_subtier_agency_name RENAME TO idx_e831a0f8$371_awarding_subtier_agency_name_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_funding_toptier_agency_name RENAME TO idx_e831a0f8$371_funding_toptier_agency_name_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$371_funding_subtier_agency_name RENAME TO idx_e831a0f8$371_funding_subtier_agency_name_old;
 
-ALTER MATERIALIZED VIEW summary_view_temp RENAME TO summary_view;
-ALTER INDEX idx_c2817a5a$5fd_unique_pk_temp RENAME TO idx_c2817a5a$5fd_unique_pk;
-ALTER INDEX idx_c2817a5a$5fd_action_date_temp RENAME TO idx_c2817a5a$5fd_action_date;
-ALTER INDEX idx_c2817a5a$5fd_type_temp RENAME TO idx_c2817a5a$5fd_type;
-ALTER INDEX idx_c2817a5a$5fd_fy_temp RENAME TO idx_c2817a5a$5fd_fy;
-ALTER INDEX idx_c2817a5a$5fd_pulled_from_temp RENAME TO idx_c2817a5a$5fd_pulled_from;
-ALTER INDEX idx_c2817a5a$5fd_awarding_agency_id_temp RENAME TO idx_c2817a5a$5fd_awarding_agency_id;
-ALTER INDEX idx_c2817a5a$5fd_funding_agency_id_temp RENAME TO idx_c2817a5a$5fd_funding_agency_id;
-ALTER INDEX idx_c2817a5a$5fd_awarding_toptier_agency_name_temp RENAME TO idx_c2817a5a$5fd_awarding_toptier_agency_name;
-ALTER INDEX idx_c2817a5a$5fd_awarding_subtier_agency_name_temp RENAME TO idx_c2817a5a$5fd_awarding_subtier_agency_name;
-ALTER INDEX idx_c2817a5a$5fd_funding_toptier_agency_name_temp RENAME TO idx_c2817a5a$5fd_funding_toptier_agency_name;
-ALTER INDEX idx_c2817a5a$5fd_funding_subtier_agency_name_temp RENAME TO idx_c2817a5a$5fd_funding_subtier_agency_name;
+ALTER TABLE summary_view_temp RENAME TO summary_view;
+ALTER INDEX idx_e831a0f8$371_unique_pk_temp RENAME TO idx_e831a0f8$371_unique_pk;
+ALTER INDEX idx_e831a0f8$371_action_date_temp RENAME TO idx_e831a0f8$371_action_date;
+ALTER INDEX idx_e831a0f8$371_type_temp RENAME TO idx_e831a0f8$371_type;
+ALTER INDEX idx_e831a0f8$371_fy_temp RENAME TO idx_e831a0f8$371_fy;
+ALTER INDEX idx_e831a0f8$371_pulled_from_temp RENAME TO idx_e831a0f8$371_pulled_from;
+ALTER INDEX idx_e831a0f8$371_awarding_agency_id_temp RENAME TO idx_e831a0f8$371_awarding_agency_id;
+ALTER INDEX idx_e831a0f8$371_funding_agency_id_temp RENAME TO idx_e831a0f8$371_funding_agency_id;
+ALTER INDEX idx_e831a0f8$371_awarding_toptier_agency_name_temp RENAME TO idx_e831a0f8$371_awarding_toptier_agency_name;
+ALTER INDEX idx_e831a0f8$371_awarding_subtier_agency_name_temp RENAME TO idx_e831a0f8$371_awarding_subtier_agency_name;
+ALTER INDEX idx_e831a0f8$371_funding_toptier_agency_name_temp RENAME TO idx_e831a0f8$371_funding_toptier_agency_name;
+ALTER INDEX idx_e831a0f8$371_funding_subtier_agency_name_temp RENAME TO idx_e831a0f8$371_funding_subtier_agency_name;
 
 ANALYZE VERBOSE summary_view;
 GRANT SELECT ON summary_view TO readonly;
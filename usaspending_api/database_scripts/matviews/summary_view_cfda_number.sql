@@ -5,10 +5,20 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS summary_view_cfda_number_temp CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS summary_view_cfda_number_old CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_cfda_number_temp') THEN
+    DROP MATERIALIZED VIEW summary_view_cfda_number_temp CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_cfda_number_temp CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_cfda_number_old') THEN
+    DROP MATERIALIZED VIEW summary_view_cfda_number_old CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_cfda_number_old CASCADE;
 
-CREATE MATERIALIZED VIEW summary_view_cfda_number_temp AS
+CREATE TABLE summary_view_cfda_number_temp AS
 SELECT
   MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
   "transaction_normalized"."action_date",
@@ -36,22 +46,22 @@ GROUP BY
   "transaction_fabs"."cfda_number",
   "transaction_fabs"."cfda_title";
 
-CREATE UNIQUE INDEX idx_1b698194$f60_unique_pk_temp ON summary_view_cfda_number_temp USING BTREE("pk") WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$f60_action_date_temp ON summary_view_cfda_number_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$f60_type_temp ON summary_view_cfda_number_temp USING BTREE("type") WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$f60_pulled_from_temp ON summary_view_cfda_number_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
+CREATE UNIQUE INDEX idx_e831a0f8$9b7_unique_pk_temp ON summary_view_cfda_number_temp USING BTREE("pk") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$9b7_action_date_temp ON summary_view_cfda_number_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$9b7_type_temp ON summary_view_cfda_number_temp USING BTREE("type") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$9b7_pulled_from_temp ON summary_view_cfda_number_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
 
-ALTER MATERIALIZED VIEW IF EXISTS summary_view_cfda_number RENAME TO summary_view_cfda_number_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_unique_pk RENAME TO idx_1b698194$f60_unique_pk_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_action_date RENAME TO idx_1b698194$f60_action_date_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_type RENAME TO idx_1b698194$f60_type_old;
-ALTER INDEX IF EXISTS idx_1b698194$f60_pulled_from RENAME TO idx_1b698194$f60_pulled_from_old;
+ALTER TABLE IF EXISTS summary_view_cfda_number RENAME TO summary_view_cfda_number_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_unique_pk RENAME TO idx_e831a0f8$9b7_unique_pk_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_action_date RENAME TO idx_e831a0f8$9b7_action_date_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_type RENAME TO idx_e831a0f8$9b7_type_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$9b7_pulled_from RENAME TO idx_e831a0f8$9b7_pulled_from_old;
 
-ALTER MATERIALIZED VIEW summary_view_cfda_number_temp RENAME TO summary_view_cfda_number;
-ALTER INDEX idx_1b698194$f60_unique_pk_temp RENAME TO idx_1b698194$f60_unique_pk;
-ALTER INDEX idx_1b698194$f60_action_date_temp RENAME TO idx_1b698194$f60_action_date;
-ALTER INDEX idx_1b698194$f60_type_temp RENAME TO idx_1b698194$f60_type;
-ALTER INDEX idx_1b698194$f60_pulled_from_temp RENAME TO idx_1b698194$f60_pulled_from;
+ALTER TABLE summary_view_cfda_number_temp RENAME TO summary_view_cfda_number;
+ALTER INDEX idx_e831a0f8$9b7_unique_pk_temp RENAME TO idx_e831a0f8$9b7_unique_pk;
+ALTER INDEX idx_e831a0f8$9b7_action_date_temp RENAME TO idx_e831a0f8$9b7_action_date;
+ALTER INDEX idx_e831a0f8$9b7_type_temp RENAME TO idx_e831a0f8$9b7_type;
+ALTER INDEX idx_e831a0f8$9b7_pulled_from_temp RENAME TO idx_e831a0f8$9b7_pulled_from;
 
 ANALYZE VERBOSE summary_view_cfda_number;
 GRANT SELECT ON summary_view_cfda_number TO readonly;
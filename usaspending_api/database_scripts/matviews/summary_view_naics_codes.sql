@@ -5,10 +5,20 @@
 --                                                    --
 --         !!DO NOT DIRECTLY EDIT THIS FILE!!         --
 --------------------------------------------------------
-DROP MATERIALIZED VIEW IF EXISTS summary_view_naics_codes_temp CASCADE;
-DROP MATERIALIZED VIEW IF EXISTS summary_view_naics_codes_old CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_naics_codes_temp') THEN
+    DROP MATERIALIZED VIEW summary_view_naics_codes_temp CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_naics_codes_temp CASCADE;
+DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'summary_view_naics_codes_old') THEN
+    DROP MATERIALIZED VIEW summary_view_naics_codes_old CASCADE;
+  END IF;
+END $$;
+DROP TABLE IF EXISTS summary_view_naics_codes_old CASCADE;
 
-CREATE MATERIALIZED VIEW summary_view_naics_codes_temp AS
+CREATE TABLE summary_view_naics_codes_temp AS
 SELECT
   MD5(array_to_string(sort(array_agg("transaction_normalized"."id"::int)), ' ')) AS pk,
   "transaction_normalized"."action_date",
@@ -34,25 +44,25 @@ GROUP BY
   "transaction_fpds"."naics",
   "transaction_fpds"."naics_description";
 
-CREATE UNIQUE INDEX idx_1b698194$ca7_unique_pk_temp ON summary_view_naics_codes_temp USING BTREE("pk") WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$ca7_action_date_temp ON summary_view_naics_codes_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$ca7_type_temp ON summary_view_naics_codes_temp USING BTREE("type") WITH (fillfactor = 97);
-CREATE INDEX idx_1b698194$ca7_naics_temp ON summary_view_naics_codes_temp USING BTREE("naics_code") WITH (fillfactor = 97) WHERE "naics_code" IS NOT NULL;
-CREATE INDEX idx_1b698194$ca7_pulled_from_temp ON summary_view_naics_codes_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
+CREATE UNIQUE INDEX idx_e831a0f8$bf7_unique_pk_temp ON summary_view_naics_codes_temp USING BTREE("pk") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$bf7_action_date_temp ON summary_view_naics_codes_temp USING BTREE("action_date" DESC NULLS LAST) WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$bf7_type_temp ON summary_view_naics_codes_temp USING BTREE("type") WITH (fillfactor = 97);
+CREATE INDEX idx_e831a0f8$bf7_naics_temp ON summary_view_naics_codes_temp USING BTREE("naics_code") WITH (fillfactor = 97) WHERE "naics_code" IS NOT NULL;
+CREATE INDEX idx_e831a0f8$bf7_pulled_from_temp ON summary_view_naics_codes_temp USING BTREE("pulled_from") WITH (fillfactor = 97) WHERE "pulled_from" IS NOT NULL;
 
-ALTER MATERIALIZED VIEW IF EXISTS summary_view_naics_codes RENAME TO summary_view_naics_codes_old;
-ALTER INDEX IF EXISTS idx_1b698194$ca7_unique_pk RENAME TO idx_1b698194$ca7_unique_pk_old;
-ALTER INDEX IF EXISTS idx_1b698194$ca7_action_date RENAME TO idx_1b698194$ca7_action_date_old;
-ALTER INDEX IF EXISTS idx_1b698194$ca7_type RENAME TO idx_1b698194$ca7_type_old;
-ALTER INDEX IF EXISTS idx_1b698194$ca7_naics RENAME TO idx_1b698194$ca7_naics_old;
-ALTER INDEX IF EXISTS idx_1b698194$ca7_pulled_from RENAME TO idx_1b698194$ca7_pulled_from_old;
+ALTER TABLE IF EXISTS summary_view_naics_codes RENAME TO summary_view_naics_codes_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$bf7_unique_pk RENAME TO idx_e831a0f8$bf7_unique_pk_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$bf7_action_date RENAME TO idx_e831a0f8$bf7_action_date_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$bf7_type RENAME TO idx_e831a0f8$bf7_type_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$bf7_naics RENAME TO idx_e831a0f8$bf7_naics_old;
+ALTER INDEX IF EXISTS idx_e831a0f8$bf7_pulled_from RENAME TO idx_e831a0f8$bf7_pulled_from_old;
 
-ALTER MATERIALIZED VIEW summary_view_naics_codes_temp RENAME TO summary_view_naics_codes;
-ALTER INDEX idx_1b698194$ca7_unique_pk_temp RENAME TO idx_1b698194$ca7_unique_pk;
-ALTER INDEX idx_1b698194$ca7_action_date_temp RENAME TO idx_1b698194$ca7_action_date;
-ALTER INDEX idx_1b698194$ca7_type_temp RENAME TO idx_1b698194$ca7_type;
-ALTER INDEX idx_1b698194$ca7_naics_temp RENAME TO idx_1b698194$ca7_naics;
-ALTER INDEX idx_1b698194$ca7_pulled_from_temp RENAME TO idx_1b698194$ca7_pulled_from;
+ALTER TABLE summary_view_naics_codes_temp RENAME TO summary_view_naics_codes;
+ALTER INDEX idx_e831a0f8$bf7_unique_pk_temp RENAME TO idx_e831a0f8$bf7_unique_pk;
+ALTER INDEX idx_e831a0f8$bf7_action_date_temp RENAME TO idx_e831a0f8$bf7_action_date;
+ALTER INDEX idx_e831a0f8$bf7_type_temp RENAME TO idx_e831a0f8$bf7_type;
+ALTER INDEX idx_e831a0f8$bf7_naics_temp RENAME TO idx_e831a0f8$bf7_naics;
+ALTER INDEX idx_e831a0f8$bf7_pulled_from_temp RENAME TO idx_e831a0f8$bf7_pulled_from;
 
 ANALYZE VERBOSE summary_view_naics_codes;
 GRANT SELECT ON summary_view_naics_codes TO readonly;
@@ -0,0 +1,105 @@
+import boto
+import datetime
+import hashlib
+import logging
+import os
+
+from django.conf import settings
+from django.utils import timezone
+
+from usaspending_api.broker import lookups
+from usaspending_api.broker.models import ExternalDataLoadDate
+from usaspending_api.download.lookups import JOB_STATUS_DICT
+from usaspending_api.download.models import DownloadJob
+
+logger = logging.getLogger('console')
+
+# Loads which change the contents of a download
+FRESHNESS_DATA_TYPES = ['fpds', 'fabs']
+
+
+def get_data_freshness_token():
+    """Returns the times the transaction data was last loaded, so cached downloads are only reused until the next load.
+    last_load_date is only a date, so it doesn't change between loads run on the same day"""
+    load_times = ExternalDataLoadDate.objects \
+        .filter(external_data_type_id__in=[lookups.EXTERNAL_DATA_TYPE_DICT[name] for name in FRESHNESS_DATA_TYPES]) \
+        .order_by('external_data_type_id') \
+        .values_list('external_data_type_id', 'update_date')
+    return ','.join('{}:{}'.format(data_type_id, update_date.isoformat() if update_date else None)
+                    for data_type_id, update_date in load_times)
+
+
+def get_request_cache_key(ordered_json_request, freshness_token=None):
+    """Hashes the validated request, as dumped after order_nested_object(), along with the data freshness token"""
+    if freshness_token is None:
+        freshness_token = get_data_freshness_token()
+    return hashlib.sha256('{}|{}'.format(ordered_json_request, freshness_token).encode('utf-8')).hexdigest()
+
+
+def get_cached_download(request_cache_key):
+    """Returns the file name of the newest live DownloadJob generated for the same request and data, if any, marking it
+    as accessed"""
+    cache_ttl = datetime.timedelta(hours=settings.BULK_DOWNLOAD_CACHE_TTL_HOURS)
+    cached_download = DownloadJob.objects \
+        .filter(request_cache_key=request_cache_key, monthly_download=False,
+                create_date__gte=timezone.now() - cache_ttl) \
+        .exclude(job_status_id=JOB_STATUS_DICT['failed']) \
+        .order_by('-create_date') \
+        .values('download_job_id', 'file_name') \
+        .first()
+    if not cached_download:
+        return None
+
+    # update() doesn't touch update_date, which is used to report how long the job took
+    DownloadJob.objects.filter(download_job_id=cached_download['download_job_id']) \
+        .update(last_accessed_date=timezone.now())
+    return cached_download['file_name']
+
+
+def get_evictable_downloads(cache_ttl, max_bytes):
+    """Returns the cached DownloadJobs that are either older than the TTL or, least recently used first, exceed the
+    total size allowed for cached files"""
+    cached_downloads = DownloadJob.objects \
+        .filter(request_cache_key__isnull=False, monthly_download=False,
+                job_status_id__in=[JOB_STATUS_DICT['finished'], JOB_STATUS_DICT['failed']]) \
+        .order_by('-last_accessed_date', '-create_date')
+
+    expired_date = timezone.now() - cache_ttl
+    evictable = []
+    total_bytes = 0
+    for download_job in cached_downloads:
+        if download_job.create_date < expired_date or download_job.job_status_id == JOB_STATUS_DICT['failed']:
+            evictable.append(download_job)
+            continue
+        total_bytes += download_job.file_size or 0
+        if total_bytes > max_bytes:
+            evictable.append(download_job)
+    return evictable
+
+
+def evict_cached_downloads(cache_ttl=None, max_bytes=None):
+    """Deletes the files of the evictable cached downloads and removes them from the cache.
+    Returns the number of downloads evicted"""
+    if cache_ttl is None:
+        cache_ttl = datetime.timedelta(hours=settings.BULK_DOWNLOAD_CACHE_TTL_HOURS)
+    if max_bytes is None:
+        max_bytes = settings.BULK_DOWNLOAD_CACHE_MAX_BYTES
+
+    evictable = get_evictable_downloads(cache_ttl, max_bytes)
+    bucket = None
+    if not settings.IS_LOCAL and evictable:
+        bucket = boto.s3.connect_to_region(settings.BULK_DOWNLOAD_AWS_REGION) \
+            .get_bucket(settings.BULK_DOWNLOAD_S3_BUCKET_NAME)
+
+    for download_job in evictable:
+        if download_job.job_status_id == JOB_STATUS_DICT['finished']:
+            if bucket:
+                bucket.delete_key(download_job.file_name)
+            else:
+                file_path = settings.BULK_DOWNLOAD_LOCAL_PATH + download_job.file_name
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+            logger.info('Evicted {} from the download cache'.format(download_job.file_name))
+        DownloadJob.objects.filter(download_job_id=download_job.download_job_id).update(request_cache_key=None)
+
+    return len(evictable)
@@ -14,10 +14,12 @@ from django.conf import settings
 
 from usaspending_api.awards.v2.lookups.lookups import contract_type_mapping, assistance_type_mapping
 from usaspending_api.common.helpers import generate_raw_quoted_query
+from usaspending_api.download.filestreaming.zip_file import ZipEntryWriter, copy_zip_members
 from usaspending_api.download.helpers import (verify_requested_columns_available, multipart_upload, split_csv,
-                                              write_to_download_log as write_to_log)
+                                              split_csv_stream, write_to_download_log as write_to_log)
 from usaspending_api.download.lookups import JOB_STATUS_DICT, VALUE_MAPPINGS
 from usaspending_api.download.v2 import download_column_historical_lookups
+from usaspending_api.search.v2 import elasticsearch_helper
 
 DOWNLOAD_VISIBILITY_TIMEOUT = 60*10
 MAX_VISIBILITY_TIMEOUT = 60*60*4
@@ -81,10 +83,21 @@ def generate_csvs(download_job, sqs_message=None):
 
         # Generate sources from the JSON request object
         sources = get_csv_sources(json_request)
+        # Shared with the processes writing each source's csvs, which add the number of rows they've written
+        row_count = multiprocessing.Value('q', 0)
         for source in sources:
-            # Parse and write data to the file
             download_job.number_of_columns = max(download_job.number_of_columns, len(source.columns(columns)))
-            parse_source(source, columns, download_job, working_dir, start_time, sqs_message, file_path, limit)
+
+        if settings.BULK_DOWNLOAD_WORKERS > 1 and len(sources) > 1:
+            # Export all sources at once, only taking turns when writing to the zip
+            parse_sources_concurrently(sources, columns, download_job, working_dir, sqs_message, file_path, limit,
+                                       settings.BULK_DOWNLOAD_WORKERS, row_count)
+        else:
+            for source in sources:
+                # Parse and write data to the file
+                parse_source(source, columns, download_job, working_dir, start_time, sqs_message, file_path, limit,
+                             row_count)
+        download_job.number_of_rows = row_count.value
         download_job.file_size = os.stat(file_path).st_size
     except Exception as e:
         # Set error message; job_status_id will be set in generate_zip.handle()
@@ -95,6 +108,8 @@ def generate_csvs(download_job, sqs_message=None):
         # Remove working directory
         if os.path.exists(working_dir):
             shutil.rmtree(working_dir)
+        # Drop the ids of any keyword search
+        elasticsearch_helper.drop_download_id_tables()
 
     try:
         # push file to S3 bucket, if not local
@@ -148,10 +163,14 @@ def get_csv_sources(json_request):
     return csv_sources
 
 
-def parse_source(source, columns, download_job, working_dir, start_time, message, zipfile_path, limit):
-    """Write to csv and zip files using the source data"""
+def get_source_name(source):
     d_map = {'d1': 'contracts', 'd2': 'assistance'}
-    source_name = '{}_{}'.format(d_map[source.file_type], VALUE_MAPPINGS[source.source_type]['download_name'])
+    return '{}_{}'.format(d_map[source.file_type], VALUE_MAPPINGS[source.source_type]['download_name'])
+
+
+def parse_source(source, columns, download_job, working_dir, start_time, message, zipfile_path, limit, row_count):
+    """Write to csv and zip files using the source data"""
+    source_name = get_source_name(source)
     source_query = source.row_emitter(columns)
     source_path = os.path.join(working_dir, '{}.csv'.format(source_name))
 
@@ -160,6 +179,15 @@ def parse_source(source, columns, download_job, working_dir, start_time, message
 
     start_time = time.time()
     try:
+        if settings.BULK_DOWNLOAD_STREAM_TO_ZIP:
+            # Create a single process to pipe the PSQL output straight into split CSVs within the zip; wait
+            stream_process = multiprocessing.Process(target=stream_psql_to_zip, args=(temp_file_path, zipfile_path,
+                                                                                      source_name, download_job,
+                                                                                      row_count,))
+            stream_process.start()
+            wait_for_process(stream_process, start_time, download_job, message)
+            return
+
         # Create a separate process to run the PSQL command; wait
         psql_process = multiprocessing.Process(target=execute_psql, args=(temp_file_path, source_path, download_job,))
         psql_process.start()
@@ -167,7 +195,7 @@ def parse_source(source, columns, download_job, working_dir, start_time, message
 
         # Create a separate process to split the large csv into smaller csvs and write to zip; wait
         zip_process = multiprocessing.Process(target=split_and_zip_csvs, args=(zipfile_path, source_path, source_name,
-                                                                               download_job,))
+                                                                               download_job, row_count,))
         zip_process.start()
         wait_for_process(zip_process, start_time, download_job, message)
     except Exception as e:
@@ -178,13 +206,79 @@ def parse_source(source, columns, download_job, working_dir, start_time, message
         os.remove(temp_file_path)
 
 
-def split_and_zip_csvs(zipfile_path, source_path, source_name, download_job):
+def parse_sources_concurrently(sources, columns, download_job, working_dir, message, zipfile_path, limit, workers,
+                               row_count):
+    """Write to csv files from up to `workers` sources at a time, zipping each one as soon as its csv is complete.
+    Only the zip step is serialized, as every source is appended to the same zipfile. When streaming, each source is
+    streamed into a zip of its own, whose compressed csvs are then copied into the zipfile"""
+    temp_files = []
+    running = {}
+    try:
+        # Generate the query files; values, limits, dates fixed
+        for source in sources:
+            source_name = get_source_name(source)
+            source_path = os.path.join(working_dir, '{}.csv'.format(source_name))
+            temp_file, temp_file_path = generate_temp_query_file(source.row_emitter(columns), limit, source,
+                                                                 download_job)
+            temp_files.append((source_name, source_path, temp_file, temp_file_path))
+        pending = list(temp_files)
+
+        start_time = time.time()
+        while pending or running:
+            # Keep the pool of PSQL processes full
+            while pending and len(running) < workers:
+                source_name, source_path, _, temp_file_path = pending.pop(0)
+                if settings.BULK_DOWNLOAD_STREAM_TO_ZIP:
+                    source_path = os.path.join(working_dir, '{}.zip'.format(source_name))
+                    psql_process = multiprocessing.Process(target=stream_psql_to_zip, args=(
+                        temp_file_path, source_path, source_name, download_job, row_count,))
+                else:
+                    psql_process = multiprocessing.Process(target=execute_psql, args=(temp_file_path, source_path,
+                                                                                      download_job,))
+                psql_process.start()
+                running[psql_process] = (source_name, source_path)
+
+            for psql_process in wait_for_any_process(list(running), start_time, download_job, message):
+                source_name, source_path = running.pop(psql_process)
+
+                # The remaining PSQL processes keep running while this source is zipped
+                if settings.BULK_DOWNLOAD_STREAM_TO_ZIP:
+                    log_time = time.time()
+                    with zipfile.ZipFile(zipfile_path, 'a', allowZip64=True) as zipped_csvs:
+                        copy_zip_members(source_path, zipped_csvs)
+                    os.remove(source_path)
+                    write_to_log(message='Copying {} to zipfile took {} seconds'.format(
+                        source_name, time.time() - log_time), download_job=download_job)
+                    continue
+
+                zip_process = multiprocessing.Process(target=split_and_zip_csvs, args=(zipfile_path, source_path,
+                                                                                       source_name, download_job,
+                                                                                       row_count,))
+                zip_process.start()
+                wait_for_process(zip_process, start_time, download_job, message)
+    finally:
+        for psql_process in running:
+            if psql_process.is_alive():
+                write_to_log(message='Attempting to terminate process (pid {})'.format(psql_process.pid),
+                             download_job=download_job, is_error=True)
+                psql_process.terminate()
+
+        # Remove temporary files
+        for _, _, temp_file, temp_file_path in temp_files:
+            os.close(temp_file)
+            os.remove(temp_file_path)
+
+
+def split_and_zip_csvs(zipfile_path, source_path, source_name, download_job, row_count):
     try:
         # Split CSV into separate files
         log_time = time.time()
-        split_csvs = split_csv(source_path, row_limit=EXCEL_ROW_LIMIT, output_path=os.path.dirname(source_path),
-                               output_name_template='{}_%s.csv'.format(source_name))
+        split_csvs, rows = split_csv(source_path, row_limit=EXCEL_ROW_LIMIT,
+                                     output_path=os.path.dirname(source_path),
+                                     output_name_template='{}_%s.csv'.format(source_name))
         write_to_log(message='Splitting csvs took {} seconds'.format(time.time() - log_time), download_job=download_job)
+        with row_count.get_lock():
+            row_count.value += rows
 
         # Zip the split CSVs into one zipfile
         log_time = time.time()
@@ -202,6 +296,40 @@ def split_and_zip_csvs(zipfile_path, source_path, source_name, download_job):
             zipped_csvs.close()
 
 
+def stream_psql_to_zip(temp_sql_file_path, zipfile_path, source_name, download_job, row_count):
+    """Reads the PSQL copy output once, splitting it into CSVs that are compressed into the zip as they're produced"""
+    try:
+        log_time = time.time()
+
+        # stderr goes to a file so that a chatty psql can never block on a full pipe while we read stdout
+        with open(temp_sql_file_path, 'r') as sql_file, tempfile.TemporaryFile() as error_file:
+            psql_process = subprocess.Popen(['psql', os.environ['DOWNLOAD_DATABASE_URL'], '-v', 'ON_ERROR_STOP=1'],
+                                            stdin=sql_file, stdout=subprocess.PIPE, stderr=error_file)
+            try:
+                with zipfile.ZipFile(zipfile_path, 'a', compression=zipfile.ZIP_DEFLATED,
+                                     allowZip64=True) as zipped_csvs:
+                    output_name_template = '{}_%s.csv'.format(source_name)
+                    parts, rows = split_csv_stream(
+                        psql_process.stdout, row_limit=EXCEL_ROW_LIMIT, buffer_size=BUFFER_SIZE,
+                        open_part=lambda part: ZipEntryWriter(zipped_csvs, output_name_template % part))
+            finally:
+                psql_process.stdout.close()
+                return_code = psql_process.wait()
+
+            if return_code != 0:
+                error_file.seek(0)
+                # Not logging the command as it can contain the database connection string
+                raise subprocess.CalledProcessError(return_code, '[redacted]', output=error_file.read())
+        with row_count.get_lock():
+            row_count.value += rows
+
+        write_to_log(message='Streamed {} rows into {} zipped csvs for {}, took {} seconds'.format(
+            rows, parts, source_name, time.time() - log_time), download_job=download_job)
+    except Exception as e:
+        logger.error(e)
+        raise e
+
+
 def start_download(download_job):
     # Update job attributes
     download_job.job_status_id = JOB_STATUS_DICT['running']
@@ -229,28 +357,35 @@ def finish_download(download_job):
 def wait_for_process(process, start_time, download_job, message):
     """Wait for the process to complete, throw errors for timeouts or Process exceptions"""
     log_time = time.time()
+    wait_for_any_process([process], start_time, download_job, message)
+    return time.time() - log_time
 
-    # Let the thread run until it finishes (max MAX_VISIBILITY_TIMEOUT), with a buffer of DOWNLOAD_VISIBILITY_TIMEOUT
-    while process.is_alive() and (time.time() - start_time) < MAX_VISIBILITY_TIMEOUT:
+
+def wait_for_any_process(processes, start_time, download_job, message):
+    """Wait for at least one of the processes to complete, throw errors for timeouts or Process exceptions.
+    Returns the processes which have completed"""
+    # Let the threads run until one finishes (max MAX_VISIBILITY_TIMEOUT), with a buffer of DOWNLOAD_VISIBILITY_TIMEOUT
+    while all(process.is_alive() for process in processes) and (time.time() - start_time) < MAX_VISIBILITY_TIMEOUT:
         if message:
             message.change_visibility(VisibilityTimeout=DOWNLOAD_VISIBILITY_TIMEOUT)
         time.sleep(WAIT_FOR_PROCESS_SLEEP)
 
-    if (time.time() - start_time) >= MAX_VISIBILITY_TIMEOUT or process.exitcode != 0:
-        if process.is_alive():
-            # Process is running for longer than MAX_VISIBILITY_TIMEOUT, kill it
+    finished = [process for process in processes if not process.is_alive()]
+    if not finished:
+        # Processes are running for longer than MAX_VISIBILITY_TIMEOUT, kill them
+        for process in processes:
             write_to_log(message='Attempting to terminate process (pid {})'.format(process.pid),
                          download_job=download_job, is_error=True)
             process.terminate()
-            e = TimeoutError('DownloadJob {} lasted longer than {} hours'.format(download_job.download_job_id,
-                                                                                 str(MAX_VISIBILITY_TIMEOUT / 3600)))
-        else:
-            # An error occurred in the process
-            e = Exception('Command failed. Please see the logs for details.')
-
+        e = TimeoutError('DownloadJob {} lasted longer than {} hours'.format(download_job.download_job_id,
+                                                                             str(MAX_VISIBILITY_TIMEOUT / 3600)))
         raise e
 
-    return time.time() - log_time
+    if any(process.exitcode != 0 for process in finished):
+        # An error occurred in a process
+        raise Exception('Command failed. Please see the logs for details.')
+
+    return finished
 
 
 def generate_temp_query_file(source_query, limit, source, download_job):
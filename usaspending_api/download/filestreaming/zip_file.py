@@ -0,0 +1,113 @@
+import struct
+import time
+import zipfile
+import zlib
+
+# Data descriptor with 8-byte sizes, used because every streamed entry is written with a ZIP64 local header
+DATA_DESCRIPTOR_SIGNATURE = b'PK\x07\x08'
+ZIP64_DATA_DESCRIPTOR_FORMAT = '<4sLQQ'
+
+
+class ZipEntryWriter:
+    """
+    Writes a single member into an open zipfile.ZipFile from a stream of bytes, compressing as it goes.
+
+    Python 3.5's zipfile can only add members from a file path or from a string held entirely in memory, so this
+    writes the local header (with a data descriptor, as the sizes aren't known up front), the compressed data and the
+    data descriptor itself, then registers the member so that ZipFile.close() adds it to the central directory.
+    """
+
+    def __init__(self, zip_file, arcname, compress_type=zipfile.ZIP_DEFLATED):
+        if compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise ValueError('Only ZIP_STORED and ZIP_DEFLATED are supported when streaming')
+
+        self.zip_file = zip_file
+        self.zinfo = zipfile.ZipInfo(arcname, time.localtime(time.time())[:6])
+        self.zinfo.compress_type = compress_type
+        self.zinfo.external_attr = 0o644 << 16
+        # Bit 3 indicates the CRC and sizes are written in a data descriptor after the compressed data
+        self.zinfo.flag_bits = 0x08
+        self.compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15) \
+            if compress_type == zipfile.ZIP_DEFLATED else None
+        self.crc = 0
+        self.file_size = 0
+        self.compress_size = 0
+
+        # Members are always appended where the central directory would otherwise start
+        self.zip_file.fp.seek(self.zip_file.start_dir)
+        self.zinfo.header_offset = self.zip_file.fp.tell()
+        self.zip_file.fp.write(self.zinfo.FileHeader(zip64=True))
+        self.closed = False
+
+    def write(self, data):
+        self.file_size += len(data)
+        self.crc = zlib.crc32(data, self.crc)
+        if self.compressor:
+            data = self.compressor.compress(data)
+        self.compress_size += len(data)
+        self.zip_file.fp.write(data)
+
+    def close(self):
+        if self.closed:
+            return
+        if self.compressor:
+            data = self.compressor.flush()
+            self.compress_size += len(data)
+            self.zip_file.fp.write(data)
+
+        self.zinfo.CRC = self.crc & 0xffffffff
+        self.zinfo.file_size = self.file_size
+        self.zinfo.compress_size = self.compress_size
+        self.zip_file.fp.write(struct.pack(ZIP64_DATA_DESCRIPTOR_FORMAT, DATA_DESCRIPTOR_SIGNATURE, self.zinfo.CRC,
+                                           self.zinfo.compress_size, self.zinfo.file_size))
+
+        add_member(self.zip_file, self.zinfo)
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def add_member(zip_file, zinfo):
+    """Registers a member written at the end of the zipfile.ZipFile, so that close() adds it to the central directory"""
+    zip_file.start_dir = zip_file.fp.tell()
+    zip_file.filelist.append(zinfo)
+    zip_file.NameToInfo[zinfo.filename] = zinfo
+    zip_file._didModify = True
+
+
+def copy_zip_members(source_path, zip_file, buffer_size=1024 ** 2):
+    """
+    Appends every member of the zip at source_path to the open zipfile.ZipFile, copying the compressed data as is
+    rather than decompressing and compressing it again
+    """
+    with zipfile.ZipFile(source_path) as source:
+        for source_info in source.infolist():
+            # The data follows the member's local header, whose name and extra field lengths can differ from the
+            # central directory's
+            source.fp.seek(source_info.header_offset)
+            header = source.fp.read(zipfile.sizeFileHeader)
+            name_length, extra_length = struct.unpack('<HH', header[26:30])
+            source.fp.seek(name_length + extra_length, 1)
+
+            zinfo = zipfile.ZipInfo(source_info.filename, source_info.date_time)
+            zinfo.compress_type = source_info.compress_type
+            zinfo.external_attr = source_info.external_attr
+            zinfo.CRC = source_info.CRC
+            zinfo.file_size = source_info.file_size
+            zinfo.compress_size = source_info.compress_size
+
+            zip_file.fp.seek(zip_file.start_dir)
+            zinfo.header_offset = zip_file.fp.tell()
+            zip_file.fp.write(zinfo.FileHeader(zip64=True))
+            remaining = zinfo.compress_size
+            while remaining:
+                data = source.fp.read(min(buffer_size, remaining))
+                if not data:
+                    raise zipfile.BadZipFile('{} is truncated in {}'.format(zinfo.filename, source_path))
+                zip_file.fp.write(data)
+                remaining -= len(data)
+            add_member(zip_file, zinfo)
@@ -199,11 +199,13 @@ def split_csv(file_path, delimiter=',', row_limit=10000, output_name_template='o
         `output_name_template`: A %s-style template for the numbered output files.
         `output_path`: Where to stick the output files.
         `keep_headers`: Whether or not to print the headers in each output file.
+    Returns the paths of the output files and the number of rows split between them.
     Example usage:
         >> from toolbox import csv_splitter;
         >> csv_splitter.split('/home/ben/input.csv');
     """
     split_csvs = []
+    row_count = 0
     reader = csv.reader(open(file_path, 'r'), delimiter=delimiter)
     current_piece = 1
     current_out_path = os.path.join(
@@ -229,4 +231,79 @@ def split_csv(file_path, delimiter=',', row_limit=10000, output_name_template='o
             if keep_headers:
                 current_out_writer.writerow(headers)
         current_out_writer.writerow(row)
-    return split_csvs
+        row_count += 1
+    return split_csvs, row_count
+
+
+def split_csv_stream(stream, open_part, row_limit=10000, buffer_size=(5 * 1024 ** 2), keep_headers=True):
+    """Splits a stream of CSV bytes into multiple pieces without parsing the CSV.
+
+    Rows are counted by the newlines in each raw buffer, so a quoted value spanning several lines counts more than once
+    and may end a piece early, but never late. A piece is only ever ended on a newline that falls outside of a quoted
+    value, which is tracked by the parity of the quote characters seen so far (escaped quotes come in pairs).
+    Arguments:
+        `stream`: A binary file-like object to read the CSV from, such as a subprocess' stdout.
+        `open_part`: A callable taking the piece number (starting at 1) and returning a writable, closable object.
+        `row_limit`: The number of rows you want in each output piece. 10,000 by default.
+        `buffer_size`: The number of bytes read from the stream at a time.
+        `keep_headers`: Whether or not to write the headers at the top of each output piece.
+    Returns the number of pieces written and the number of rows (newlines) read after the header.
+    """
+    headers = stream.readline() if keep_headers else b''
+    current_piece = 1
+    current_out = open_part(current_piece)
+    current_out.write(headers)
+    rows_in_piece = 0
+    total_rows = 0
+    in_quotes = False
+
+    try:
+        while True:
+            buffer = stream.read(buffer_size)
+            if not buffer:
+                break
+            position = 0
+            while position < len(buffer):
+                if current_out is None:
+                    # Only start the next piece once there is data to put in it
+                    current_piece += 1
+                    current_out = open_part(current_piece)
+                    current_out.write(headers)
+
+                if rows_in_piece < row_limit:
+                    remaining = row_limit - rows_in_piece
+                    newlines = buffer.count(b'\n', position)
+                    if newlines < remaining:
+                        # The whole buffer fits in the current piece
+                        in_quotes ^= bool(buffer.count(b'"', position) % 2)
+                        current_out.write(buffer[position:])
+                        rows_in_piece += newlines
+                        total_rows += newlines
+                        break
+                    end = position - 1
+                    for _ in range(remaining):
+                        end = buffer.find(b'\n', end + 1)
+                    rows_in_piece += remaining
+                    total_rows += remaining
+                else:
+                    # The row limit was reached inside a quoted value; end the piece on the next newline
+                    end = buffer.find(b'\n', position)
+                    if end == -1:
+                        in_quotes ^= bool(buffer.count(b'"', position) % 2)
+                        current_out.write(buffer[position:])
+                        break
+                    rows_in_piece += 1
+                    total_rows += 1
+
+                in_quotes ^= bool(buffer.count(b'"', position, end) % 2)
+                current_out.write(buffer[position:end + 1])
+                position = end + 1
+                if not in_quotes:
+                    current_out.close()
+                    current_out = None
+                    rows_in_piece = 0
+    finally:
+        if current_out is not None:
+            current_out.close()
+
+    return current_piece, total_rows
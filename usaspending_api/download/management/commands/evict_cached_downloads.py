@@ -0,0 +1,38 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from usaspending_api.download.download_cache import evict_cached_downloads
+
+
+class Command(BaseCommand):
+    """
+    This command deletes the files of cached bulk downloads which are past the cache TTL or, least recently used first,
+    past the total size allowed for cached files; meant to be run periodically
+    """
+    help = "Evicts old and least recently used bulk downloads from the download cache"
+    logger = logging.getLogger('console')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ttl-hours',
+            dest='ttl_hours',
+            type=int,
+            default=settings.BULK_DOWNLOAD_CACHE_TTL_HOURS,
+            help='Evict downloads generated more than this many hours ago'
+        )
+        parser.add_argument(
+            '--max-bytes',
+            dest='max_bytes',
+            type=int,
+            default=settings.BULK_DOWNLOAD_CACHE_MAX_BYTES,
+            help='Evict the least recently used downloads beyond this total file size'
+        )
+
+    def handle(self, *args, **options):
+        self.logger.info("Evicting cached downloads...")
+        evicted = evict_cached_downloads(cache_ttl=datetime.timedelta(hours=options['ttl_hours']),
+                                         max_bytes=options['max_bytes'])
+        self.logger.info("Done, evicted {} downloads.".format(evicted))
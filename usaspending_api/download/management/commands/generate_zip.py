@@ -9,6 +9,7 @@ from usaspending_api.download.helpers import write_to_download_log as write_to_l
 from usaspending_api.download.lookups import JOB_STATUS_DICT
 from usaspending_api.download.models import DownloadJob
 from usaspending_api.download.filestreaming import csv_generation
+from usaspending_api.download.supervisor import DownloadSupervisor
 
 DEFAULT_VISIBILITY_TIMEOUT = 60*30
 
@@ -17,11 +18,25 @@ logger = logging.getLogger('console')
 
 class Command(BaseCommand):
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            dest='workers',
+            type=int,
+            default=1,
+            help='Number of DownloadJobs generated at once. Above 1, each job is handed to its own worker process and'
+                 ' a single heartbeat renews the SQS visibility of all of them.'
+        )
+
     def handle(self, *args, **options):
         """Run the application."""
         queue = sqs_queue(region_name=settings.BULK_DOWNLOAD_AWS_REGION,
                           QueueName=settings.BULK_DOWNLOAD_SQS_QUEUE_NAME)
 
+        if options['workers'] > 1:
+            DownloadSupervisor(queue, options['workers'], DEFAULT_VISIBILITY_TIMEOUT).run()
+            return
+
         write_to_log(message='Starting SQS polling')
         while True:
             second_attempt = True
@@ -11,6 +11,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from usaspending_api.common.helpers import generate_fiscal_year, order_nested_object
 from usaspending_api.common.csv_helpers import sqs_queue
+from usaspending_api.download.download_cache import get_request_cache_key
 from usaspending_api.download.filestreaming import csv_generation
 from usaspending_api.download.helpers import multipart_upload
 from usaspending_api.download.lookups import JOB_STATUS_DICT
@@ -54,15 +55,18 @@ class Command(BaseCommand):
         download_viewset = YearLimitedDownloadViewSet()
         download_viewset.process_filters(json_request)
         validated_request = download_viewset.validate_request(json_request)
+        ordered_json_request = json.dumps(order_nested_object(validated_request))
+        request_cache_key = get_request_cache_key(ordered_json_request)
         download_job = DownloadJob.objects.create(job_status_id=JOB_STATUS_DICT['ready'], file_name=file_name,
-                                                  json_request=json.dumps(order_nested_object(validated_request)),
-                                                  monthly_download=True)
+                                                  json_request=ordered_json_request, monthly_download=True,
+                                                  request_cache_key=request_cache_key)
 
         if not use_sqs:
             # Note: Because of the line below, it's advised to only run this script on a separate instance as this will
             #       modify your bulk download settings.
             settings.BULK_DOWNLOAD_S3_BUCKET_NAME = settings.MONTHLY_DOWNLOAD_S3_BUCKET_NAME
-            csv_generation.generate_csvs(download_job=download_job)
+            if not self.copy_unchanged_download(download_job):
+                csv_generation.generate_csvs(download_job=download_job)
             if cleanup:
                 # Get all the files that have the same prefix except for the update date
                 file_name_prefix = file_name[:-12]  # subtracting the 'YYYYMMDD.zip'
@@ -79,6 +83,24 @@ class Command(BaseCommand):
                               QueueName=settings.BULK_DOWNLOAD_SQS_QUEUE_NAME)
             queue.send_message(MessageBody=str(download_job.download_job_id))
 
+    def copy_unchanged_download(self, download_job):
+        """If the same file was generated from the same data before, copy it within the bucket instead of regenerating
+        it. Returns whether the file was copied"""
+        previous_job = DownloadJob.objects.filter(request_cache_key=download_job.request_cache_key,
+                                                  monthly_download=True, job_status_id=JOB_STATUS_DICT['finished'])\
+            .exclude(download_job_id=download_job.download_job_id).order_by('-create_date').first()
+        if not previous_job or not self.bucket.get_key(previous_job.file_name):
+            return False
+
+        logger.info('Data unchanged since {}, copying it to {}'.format(previous_job.file_name, download_job.file_name))
+        self.bucket.copy_key(download_job.file_name, self.bucket.name, previous_job.file_name, preserve_acl=True)
+        download_job.job_status_id = JOB_STATUS_DICT['finished']
+        download_job.file_size = previous_job.file_size
+        download_job.number_of_rows = previous_job.number_of_rows
+        download_job.number_of_columns = previous_job.number_of_columns
+        download_job.save()
+        return True
+
     def upload_placeholder(self, file_name, empty_file):
         bucket = settings.BULK_DOWNLOAD_S3_BUCKET_NAME
         region = settings.BULK_DOWNLOAD_AWS_REGION
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.4 on 2018-03-20 15:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('download', '0003_auto_20180306_1726'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='downloadjob',
+            name='last_accessed_date',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='downloadjob',
+            name='request_cache_key',
+            field=models.TextField(blank=True, db_index=True, null=True),
+        ),
+    ]
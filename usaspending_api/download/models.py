@@ -26,6 +26,9 @@ class DownloadJob(models.Model):
     update_date = models.DateTimeField(auto_now=True, null=True)
     monthly_download = models.BooleanField(default=False)
     json_request = models.TextField(blank=True, null=True)
+    # Hash of the ordered json_request and the data load dates, used to reuse the file of an identical earlier request
+    request_cache_key = models.TextField(blank=True, null=True, db_index=True)
+    last_accessed_date = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         managed = True
@@ -0,0 +1,194 @@
+import botocore
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+
+from django import db
+
+from usaspending_api.download.filestreaming import csv_generation
+from usaspending_api.download.helpers import write_to_download_log as write_to_log
+from usaspending_api.download.lookups import JOB_STATUS_DICT
+from usaspending_api.download.models import DownloadJob
+
+# SQS allows at most 10 messages per receive
+MAX_MESSAGES_PER_RECEIVE = 10
+HEARTBEAT_INTERVAL = 60
+
+logger = logging.getLogger('console')
+
+
+def generate_download(download_job_id):
+    """Generates the files of a single DownloadJob inside a worker process. The SQS message is left to the supervisor's
+    heartbeat, so no message is passed along to renew visibility from the worker"""
+    # Lead a process group of its own, so the psql and zip processes it starts are terminated along with it
+    os.setpgrp()
+    download_job = DownloadJob.objects.get(download_job_id=download_job_id)
+    write_to_log(message='Starting to work on DownloadJob {}'.format(download_job.download_job_id),
+                 download_job=download_job)
+    csv_generation.generate_csvs(download_job=download_job)
+
+
+class InFlightJob:
+    def __init__(self, message, download_job, process):
+        self.message = message
+        self.download_job_id = download_job.download_job_id
+        self.second_attempt = download_job.error_message is not None
+        self.process = process
+        self.start_time = time.time()
+
+
+class DownloadSupervisor:
+    """
+    Keeps a pool of worker processes busy generating DownloadJobs from the SQS queue, one job per worker.
+
+    A single heartbeat thread renews the visibility of every in-flight message, terminates workers which have run for
+    longer than MAX_VISIBILITY_TIMEOUT, and logs the queue depth and number of jobs in flight. Each job's throughput
+    is logged when it completes.
+    """
+
+    def __init__(self, queue, workers, visibility_timeout, heartbeat_interval=HEARTBEAT_INTERVAL):
+        self.queue = queue
+        self.workers = workers
+        self.visibility_timeout = visibility_timeout
+        self.heartbeat_interval = heartbeat_interval
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def run(self):
+        write_to_log(message='Starting SQS polling with {} workers'.format(self.workers))
+        heartbeat = threading.Thread(target=self.heartbeat, daemon=True)
+        heartbeat.start()
+
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                # Keep supervising the running workers; a message which failed to start becomes visible again once
+                # its visibility timeout expires
+                logger.error(e)
+                write_to_log(message=str(e), is_error=True)
+                time.sleep(csv_generation.WAIT_FOR_PROCESS_SLEEP)
+
+    def poll(self):
+        """Reaps finished workers, then starts a job for each message received while there are free workers"""
+        self.reap_workers()
+
+        free_workers = self.workers - len(self.in_flight)
+        if free_workers == 0:
+            time.sleep(csv_generation.WAIT_FOR_PROCESS_SLEEP)
+            return
+
+        messages = self.queue.receive_messages(WaitTimeSeconds=10, MessageAttributeNames=['All'],
+                                               MaxNumberOfMessages=min(free_workers, MAX_MESSAGES_PER_RECEIVE),
+                                               VisibilityTimeout=self.visibility_timeout)
+        for message in messages:
+            write_to_log(message='Message Received: {}'.format(message))
+            if message.body is not None:
+                self.start_job(message)
+
+    def start_job(self, message):
+        download_job = DownloadJob.objects.filter(download_job_id=int(message.body)).first()
+        if not download_job:
+            write_to_log(message='DownloadJob {} does not exist'.format(message.body), is_error=True)
+            message.delete()
+            return
+
+        # Forked workers must not share the supervisor's database connections
+        db.connections.close_all()
+        process = multiprocessing.Process(target=generate_download, args=(download_job.download_job_id,))
+        process.start()
+        with self.lock:
+            self.in_flight[download_job.download_job_id] = InFlightJob(message, download_job, process)
+
+    def reap_workers(self):
+        with self.lock:
+            finished = [job for job in self.in_flight.values() if not job.process.is_alive()]
+            for job in finished:
+                del self.in_flight[job.download_job_id]
+
+        for job in finished:
+            download_job = DownloadJob.objects.filter(download_job_id=job.download_job_id).first()
+            if download_job is None:
+                # Deleted while it was generated, so there's nothing left to retry
+                write_to_log(message='DownloadJob {} no longer exists'.format(job.download_job_id), is_error=True)
+                job.message.delete()
+                continue
+
+            if job.process.exitcode == 0:
+                # If successful, we do not want to run again; delete
+                job.message.delete()
+                self.log_throughput(job, download_job)
+                continue
+
+            error_message = download_job.error_message or 'Worker exited with code {}'.format(job.process.exitcode)
+            write_to_log(message=error_message, download_job=download_job, is_error=True)
+            download_job.error_message = error_message
+            download_job.job_status_id = JOB_STATUS_DICT['failed' if job.second_attempt else 'ready']
+            download_job.save()
+
+            # Set visibility to 0 so that another attempt can be made to process in SQS immediately, instead of
+            # waiting for the timeout window to expire
+            try:
+                job.message.change_visibility(VisibilityTimeout=0)
+            except botocore.exceptions.ClientError as e:
+                # The receipt handle has expired, so the message is already visible again
+                logger.error(e)
+
+    def heartbeat(self):
+        while True:
+            time.sleep(self.heartbeat_interval)
+            try:
+                self.beat()
+            except Exception as e:
+                logger.error(e)
+
+    def beat(self):
+        with self.lock:
+            jobs = list(self.in_flight.values())
+
+        for job in jobs:
+            if (time.time() - job.start_time) >= csv_generation.MAX_VISIBILITY_TIMEOUT:
+                # Running for longer than MAX_VISIBILITY_TIMEOUT; the failure is recorded when it's reaped
+                write_to_log(message='Attempting to terminate DownloadJob {} (pid {})'.format(
+                    job.download_job_id, job.process.pid), is_error=True)
+                self.terminate(job)
+                continue
+            try:
+                job.message.change_visibility(VisibilityTimeout=csv_generation.DOWNLOAD_VISIBILITY_TIMEOUT)
+            except botocore.exceptions.ClientError as e:
+                logger.error(e)
+
+        self.log_status(jobs)
+
+    @staticmethod
+    def terminate(job):
+        """Terminates the worker's whole process group, including the psql and zip processes it started"""
+        try:
+            os.killpg(job.process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            # Exited before its process group was signaled
+            pass
+
+    def log_status(self, jobs):
+        try:
+            self.queue.reload()
+            queue_depth = int(self.queue.attributes.get('ApproximateNumberOfMessages', 0))
+        except botocore.exceptions.ClientError as e:
+            logger.error(e)
+            queue_depth = None
+
+        write_to_log(message='{} DownloadJobs in flight, {} messages queued'.format(len(jobs), queue_depth),
+                     other_params={'queue_depth': queue_depth, 'in_flight': len(jobs),
+                                   'in_flight_download_job_ids': [job.download_job_id for job in jobs]})
+
+    def log_throughput(self, job, download_job):
+        seconds = time.time() - job.start_time
+        rows_per_second = (download_job.number_of_rows or 0) / seconds
+        bytes_per_second = (download_job.file_size or 0) / seconds
+        write_to_log(message='DownloadJob {} took {:.1f} seconds ({:.1f} rows/s, {:.1f} bytes/s)'.format(
+            job.download_job_id, seconds, rows_per_second, bytes_per_second), download_job=download_job,
+            other_params={'seconds': seconds, 'rows_per_second': rows_per_second,
+                          'bytes_per_second': bytes_per_second})
@@ -0,0 +1,85 @@
+import datetime
+import pytest
+
+from django.utils import timezone
+from model_mommy import mommy
+
+from usaspending_api.broker import lookups
+from usaspending_api.broker.models import ExternalDataLoadDate
+from usaspending_api.download.download_cache import (get_cached_download, get_data_freshness_token,
+                                                     get_evictable_downloads, get_request_cache_key)
+from usaspending_api.download.lookups import JOB_STATUS, JOB_STATUS_DICT
+from usaspending_api.download.models import DownloadJob
+
+
+@pytest.fixture
+def job_statuses(db):
+    for js in JOB_STATUS:
+        mommy.make('download.JobStatus', job_status_id=js.id, name=js.name, description=js.desc)
+
+
+def make_download_job(file_name, status, request_cache_key='key', hours_old=0, hours_since_access=0, file_size=10):
+    download_job = mommy.make('download.DownloadJob', file_name=file_name, job_status_id=JOB_STATUS_DICT[status],
+                              request_cache_key=request_cache_key, file_size=file_size)
+    # create_date is set on creation, so it's backdated afterwards
+    DownloadJob.objects.filter(download_job_id=download_job.download_job_id).update(
+        create_date=timezone.now() - datetime.timedelta(hours=hours_old),
+        last_accessed_date=timezone.now() - datetime.timedelta(hours=hours_since_access))
+    return download_job
+
+
+def test_request_cache_key_depends_on_data_freshness():
+    key = get_request_cache_key('{"award_levels": ["awards"]}', freshness_token='1:2018-03-01,2:2018-03-01')
+
+    assert key == get_request_cache_key('{"award_levels": ["awards"]}', freshness_token='1:2018-03-01,2:2018-03-01')
+    assert key != get_request_cache_key('{"award_levels": ["awards"]}', freshness_token='1:2018-03-02,2:2018-03-01')
+    assert key != get_request_cache_key('{"award_levels": ["transactions"]}',
+                                        freshness_token='1:2018-03-01,2:2018-03-01')
+
+
+@pytest.mark.django_db
+def test_data_freshness_token_changes_on_every_load():
+    for data_type in lookups.EXTERNAL_DATA_TYPE:
+        mommy.make('broker.ExternalDataType', external_data_type_id=data_type.id, name=data_type.name)
+
+    def load(name):
+        # As the nightly loaders record a load
+        data_type_id = lookups.EXTERNAL_DATA_TYPE_DICT[name]
+        ExternalDataLoadDate.objects.filter(external_data_type_id=data_type_id).delete()
+        ExternalDataLoadDate(last_load_date='2018-03-01', external_data_type_id=data_type_id).save()
+
+    load('fpds')
+    load('fabs')
+    token = get_data_freshness_token()
+    load('exec_comp')
+    assert get_data_freshness_token() == token
+
+    # A second load on the same day
+    load('fabs')
+    assert get_data_freshness_token() != token
+
+
+@pytest.mark.django_db
+def test_get_cached_download(job_statuses):
+    make_download_job('expired.zip', 'finished', hours_old=48)
+    make_download_job('failed.zip', 'failed')
+    make_download_job('other_request.zip', 'finished', request_cache_key='other_key')
+    make_download_job('cached.zip', 'finished', hours_old=1)
+
+    assert get_cached_download('key') == 'cached.zip'
+    assert get_cached_download('missing_key') is None
+    assert DownloadJob.objects.get(file_name='cached.zip').last_accessed_date > \
+        timezone.now() - datetime.timedelta(minutes=1)
+
+
+@pytest.mark.django_db
+def test_get_evictable_downloads(job_statuses):
+    make_download_job('recently_used.zip', 'finished', request_cache_key='a', hours_since_access=1)
+    make_download_job('least_recently_used.zip', 'finished', request_cache_key='b', hours_since_access=3)
+    make_download_job('used.zip', 'finished', request_cache_key='c', hours_since_access=2)
+    make_download_job('expired.zip', 'finished', request_cache_key='d', hours_old=48)
+    make_download_job('running.zip', 'running', request_cache_key='e', hours_old=48)
+
+    evictable = get_evictable_downloads(datetime.timedelta(hours=24), max_bytes=25)
+
+    assert sorted(download_job.file_name for download_job in evictable) == ['expired.zip', 'least_recently_used.zip']
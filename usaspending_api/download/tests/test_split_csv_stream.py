@@ -0,0 +1,89 @@
+import io
+import zipfile
+
+from usaspending_api.download.filestreaming.zip_file import ZipEntryWriter, copy_zip_members
+from usaspending_api.download.helpers import split_csv_stream
+
+
+class BytesPart(io.BytesIO):
+    """Keeps its contents around after being closed"""
+    def close(self):
+        self.contents = self.getvalue()
+
+
+def split(csv_bytes, row_limit, buffer_size):
+    parts = []
+
+    def open_part(part_number):
+        assert part_number == len(parts) + 1
+        parts.append(BytesPart())
+        return parts[-1]
+
+    part_count, row_count = split_csv_stream(io.BytesIO(csv_bytes), open_part, row_limit=row_limit,
+                                             buffer_size=buffer_size)
+    assert part_count == len(parts)
+    return [part.contents for part in parts], row_count
+
+
+def test_split_csv_stream_repeats_headers():
+    csv_bytes = b'a,b\n' + b''.join('{},{}\n'.format(i, i).encode() for i in range(5))
+
+    for buffer_size in (1, 3, 7, 1024):
+        parts, row_count = split(csv_bytes, row_limit=2, buffer_size=buffer_size)
+        assert parts == [b'a,b\n0,0\n1,1\n', b'a,b\n2,2\n3,3\n', b'a,b\n4,4\n']
+        assert row_count == 5
+
+
+def test_split_csv_stream_no_empty_trailing_part():
+    parts, row_count = split(b'a,b\n0,0\n1,1\n', row_limit=2, buffer_size=1024)
+    assert parts == [b'a,b\n0,0\n1,1\n']
+    assert row_count == 2
+
+
+def test_split_csv_stream_headers_only():
+    parts, row_count = split(b'a,b\n', row_limit=2, buffer_size=1024)
+    assert parts == [b'a,b\n']
+    assert row_count == 0
+
+
+def test_split_csv_stream_never_splits_quoted_values():
+    csv_bytes = b'a,b\n0,"multi\nline"\n1,"say ""hi""\n"\n2,2\n'
+
+    for buffer_size in (1, 5, 1024):
+        parts, row_count = split(csv_bytes, row_limit=1, buffer_size=buffer_size)
+        assert parts == [b'a,b\n0,"multi\nline"\n', b'a,b\n1,"say ""hi""\n"\n', b'a,b\n2,2\n']
+
+
+def test_zip_entry_writer_round_trip(tmpdir):
+    zip_path = str(tmpdir.join('test.zip'))
+    with zipfile.ZipFile(zip_path, 'a', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+        zip_file.writestr('existing.csv', b'x\n')
+    with zipfile.ZipFile(zip_path, 'a', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+        for name, chunks in (('first.csv', [b'a,b\n', b'1,2\n']), ('second.csv', [b'a,b\n' * 1000])):
+            with ZipEntryWriter(zip_file, name) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+
+    with zipfile.ZipFile(zip_path, 'r') as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == ['existing.csv', 'first.csv', 'second.csv']
+        assert zip_file.read('first.csv') == b'a,b\n1,2\n'
+        assert zip_file.read('second.csv') == b'a,b\n' * 1000
+
+
+def test_copy_zip_members(tmpdir):
+    source_path, zip_path = str(tmpdir.join('source.zip')), str(tmpdir.join('test.zip'))
+    with zipfile.ZipFile(source_path, 'a', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as source:
+        for name, contents in (('contracts_1.csv', b'a,b\n' * 1000), ('contracts_2.csv', b'a,b\n1,2\n')):
+            with ZipEntryWriter(source, name) as entry:
+                entry.write(contents)
+    with zipfile.ZipFile(zip_path, 'a', allowZip64=True) as zip_file:
+        zip_file.writestr('existing.csv', b'x\n')
+        copy_zip_members(source_path, zip_file)
+
+    with zipfile.ZipFile(zip_path, 'r') as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == ['existing.csv', 'contracts_1.csv', 'contracts_2.csv']
+        assert zip_file.getinfo('contracts_1.csv').compress_type == zipfile.ZIP_DEFLATED
+        assert zip_file.read('contracts_1.csv') == b'a,b\n' * 1000
+        assert zip_file.read('contracts_2.csv') == b'a,b\n1,2\n'
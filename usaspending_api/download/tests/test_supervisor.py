@@ -0,0 +1,158 @@
+import signal
+import time
+from unittest.mock import Mock, patch
+
+import botocore
+import pytest
+from model_mommy import mommy
+
+from usaspending_api.download import supervisor
+from usaspending_api.download.filestreaming import csv_generation
+from usaspending_api.download.lookups import JOB_STATUS, JOB_STATUS_DICT
+from usaspending_api.download.models import DownloadJob
+
+
+@pytest.fixture
+def job_statuses(db):
+    for js in JOB_STATUS:
+        mommy.make('download.JobStatus', job_status_id=js.id, name=js.name, description=js.desc)
+
+
+@pytest.fixture(autouse=True)
+def no_download_log():
+    with patch.object(supervisor, 'write_to_log'):
+        yield
+
+
+def expired_receipt():
+    return botocore.exceptions.ClientError({'Error': {'Code': 'InvalidParameterValue'}}, 'ChangeMessageVisibility')
+
+
+def in_flight_job(download_job, alive=False, exitcode=0, pid=1234, seconds_old=0):
+    process = Mock(pid=pid, exitcode=exitcode)
+    process.is_alive.return_value = alive
+    job = supervisor.InFlightJob(Mock(), download_job, process)
+    job.start_time = time.time() - seconds_old
+    return job
+
+
+def make_supervisor(*jobs, workers=2):
+    download_supervisor = supervisor.DownloadSupervisor(Mock(), workers, visibility_timeout=1800)
+    for job in jobs:
+        download_supervisor.in_flight[job.download_job_id] = job
+    return download_supervisor
+
+
+@pytest.mark.django_db
+def test_poll_starts_a_worker_per_message_while_workers_are_free(job_statuses):
+    running = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']), alive=True)
+    download_job = mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['ready'])
+    download_supervisor = make_supervisor(running, workers=3)
+    missing = Mock(body='-1')
+    download_supervisor.queue.receive_messages.return_value = [Mock(body=str(download_job.download_job_id)), missing]
+
+    with patch.object(supervisor.multiprocessing, 'Process') as process, \
+            patch.object(supervisor.db.connections, 'close_all'):
+        download_supervisor.poll()
+
+    assert download_supervisor.queue.receive_messages.call_args[1]['MaxNumberOfMessages'] == 2
+    process.assert_called_once_with(target=supervisor.generate_download, args=(download_job.download_job_id,))
+    process.return_value.start.assert_called_once_with()
+    assert set(download_supervisor.in_flight) == {running.download_job_id, download_job.download_job_id}
+    # A message for a DownloadJob which doesn't exist is dropped
+    missing.delete.assert_called_once_with()
+
+
+def test_poll_waits_while_every_worker_is_busy():
+    download_supervisor = make_supervisor(workers=0)
+
+    with patch.object(supervisor.time, 'sleep') as sleep:
+        download_supervisor.poll()
+
+    sleep.assert_called_once_with(csv_generation.WAIT_FOR_PROCESS_SLEEP)
+    assert not download_supervisor.queue.receive_messages.called
+
+
+@pytest.mark.django_db
+def test_reap_workers(job_statuses):
+    succeeded = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['finished']))
+    first_attempt = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']),
+                                  exitcode=1)
+    second_attempt = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running'],
+                                              error_message='Failed the first time'), exitcode=-15)
+    still_running = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']),
+                                  alive=True)
+    second_attempt.message.change_visibility.side_effect = expired_receipt()
+    download_supervisor = make_supervisor(succeeded, first_attempt, second_attempt, still_running, workers=4)
+
+    download_supervisor.reap_workers()
+
+    assert list(download_supervisor.in_flight) == [still_running.download_job_id]
+    succeeded.message.delete.assert_called_once_with()
+
+    # A first failure is made visible again right away to be retried, and a second one fails the DownloadJob
+    retried = DownloadJob.objects.get(download_job_id=first_attempt.download_job_id)
+    assert (retried.job_status_id, retried.error_message) == (JOB_STATUS_DICT['ready'], 'Worker exited with code 1')
+    first_attempt.message.change_visibility.assert_called_once_with(VisibilityTimeout=0)
+    assert not first_attempt.message.delete.called
+    failed = DownloadJob.objects.get(download_job_id=second_attempt.download_job_id)
+    assert (failed.job_status_id, failed.error_message) == (JOB_STATUS_DICT['failed'], 'Failed the first time')
+
+
+@pytest.mark.django_db
+def test_reap_workers_drops_deleted_download_jobs(job_statuses):
+    download_job = mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running'])
+    job = in_flight_job(download_job, exitcode=1)
+    download_job.delete()
+    download_supervisor = make_supervisor(job)
+
+    download_supervisor.reap_workers()
+
+    assert download_supervisor.in_flight == {}
+    job.message.delete.assert_called_once_with()
+
+
+@pytest.mark.django_db
+def test_beat_renews_visibility_and_kills_hung_worker_groups(job_statuses):
+    healthy = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']), alive=True)
+    expired = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']), alive=True)
+    expired.message.change_visibility.side_effect = expired_receipt()
+    hung = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']), alive=True,
+                         pid=4321, seconds_old=csv_generation.MAX_VISIBILITY_TIMEOUT)
+    gone = in_flight_job(mommy.make('download.DownloadJob', job_status_id=JOB_STATUS_DICT['running']), alive=True,
+                         pid=5678, seconds_old=csv_generation.MAX_VISIBILITY_TIMEOUT)
+    download_supervisor = make_supervisor(healthy, expired, hung, gone, workers=4)
+    download_supervisor.queue.attributes = {'ApproximateNumberOfMessages': '3'}
+
+    with patch.object(supervisor.os, 'killpg', side_effect=[None, ProcessLookupError]) as killpg:
+        download_supervisor.beat()
+
+    assert sorted(call[0] for call in killpg.call_args_list) == [(4321, signal.SIGTERM), (5678, signal.SIGTERM)]
+    healthy.message.change_visibility.assert_called_once_with(
+        VisibilityTimeout=csv_generation.DOWNLOAD_VISIBILITY_TIMEOUT)
+    assert not hung.message.change_visibility.called
+    # Killed workers stay in flight until they're reaped, which records their failure
+    assert len(download_supervisor.in_flight) == 4
+    download_supervisor.queue.reload.assert_called_once_with()
+
+
+def test_run_keeps_polling_after_errors():
+    download_supervisor = make_supervisor()
+
+    with patch.object(supervisor.threading, 'Thread'), patch.object(supervisor.time, 'sleep'), \
+            patch.object(download_supervisor, 'poll', side_effect=[Exception('boom'), None, KeyboardInterrupt]) as poll:
+        with pytest.raises(KeyboardInterrupt):
+            download_supervisor.run()
+
+    assert poll.call_count == 3
+
+
+def test_heartbeat_keeps_beating_after_errors():
+    download_supervisor = make_supervisor()
+
+    with patch.object(supervisor.time, 'sleep', side_effect=[None, None, KeyboardInterrupt]), \
+            patch.object(download_supervisor, 'beat', side_effect=Exception('boom')) as beat:
+        with pytest.raises(KeyboardInterrupt):
+            download_supervisor.heartbeat()
+
+    assert beat.call_count == 2
@@ -1,5 +1,4 @@
 import boto
-import datetime
 import json
 import os
 import re
@@ -8,6 +7,7 @@ import pandas as pd
 
 from django.conf import settings
 from django.db.models import Sum, F
+from django.utils import timezone
 
 from rest_framework.response import Response
 from usaspending_api.common.views import APIDocumentationView
@@ -22,6 +22,7 @@ from usaspending_api.common.csv_helpers import sqs_queue
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers import order_nested_object
 from usaspending_api.common.logging import get_remote_addr
+from usaspending_api.download.download_cache import get_cached_download, get_request_cache_key
 from usaspending_api.download.filestreaming import csv_generation
 from usaspending_api.download.filestreaming.s3_handler import S3Handler
 from usaspending_api.download.helpers import (check_types_and_assign_defaults, parse_limit, validate_time_periods,
@@ -40,14 +41,11 @@ class BaseDownloadViewSet(APIDocumentationView):
         json_request = self.validate_request(request.data)
         ordered_json_request = json.dumps(order_nested_object(json_request))
 
-        # Check if the same request has been called today
-        updated_date_timestamp = datetime.datetime.strftime(datetime.datetime.utcnow(), '%Y-%m-%d')
-        cached_download = DownloadJob.objects.filter(
-            json_request=ordered_json_request,
-            update_date__gte=updated_date_timestamp).exclude(job_status_id=4).values('file_name')
-        if cached_download and not settings.IS_LOCAL:
-            # By returning the cached files, there should be no duplicates on a daily basis
-            cached_filename = cached_download[0]['file_name']
+        # Check if the same request has already been generated from the same data
+        request_cache_key = get_request_cache_key(ordered_json_request)
+        cached_filename = get_cached_download(request_cache_key) if not settings.IS_LOCAL else None
+        if cached_filename:
+            # By returning the cached files, there should be no duplicates until the data is next loaded
             return self.get_download_response(file_name=cached_filename)
 
         # Create download name and timestamped name for uniqueness
@@ -56,7 +54,9 @@ class BaseDownloadViewSet(APIDocumentationView):
         timestamped_file_name = self.s3_handler.get_timestamped_filename(download_name + '.zip')
         download_job = DownloadJob.objects.create(job_status_id=JOB_STATUS_DICT['ready'],
                                                   file_name=timestamped_file_name,
-                                                  json_request=ordered_json_request)
+                                                  json_request=ordered_json_request,
+                                                  request_cache_key=request_cache_key,
+                                                  last_accessed_date=timezone.now())
 
         write_to_log(message='Starting new download job'.format(download_job.download_job_id),
                      download_job=download_job, other_params={'request_addr': get_remote_addr(request)})
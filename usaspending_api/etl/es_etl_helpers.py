@@ -1,16 +1,17 @@
 import boto3
 import csv
+import multiprocessing
 import os
 import json
 import pandas as pd
 import subprocess
 import tempfile
 
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from django.db import connection
-from elasticsearch import helpers
-from time import perf_counter, sleep
+from queue import Empty
+from time import perf_counter
 
 # ==============================================================================
 # SQL Template Strings for Postgres Statements
@@ -38,6 +39,12 @@ VIEW_COLUMNS = [
     'recipient_location_zip5', 'recipient_location_congressional_code',
 ]
 
+# Columns Elasticsearch maps as numbers or dates, cast from the CSV text before indexing
+AMOUNT_COLUMNS = ['award_amount', 'transaction_amount', 'face_value_loan_guarantee', 'original_loan_subsidy_cost']
+FISCAL_YEAR_COLUMNS = ['transaction_fiscal_year', 'award_fiscal_year']
+DATE_COLUMNS = ['action_date', 'period_of_performance_start_date', 'period_of_performance_current_end_date']
+TIMESTAMP_COLUMNS = ['update_date']
+
 UPDATE_DATE_SQL = ' AND update_date >= \'{}\''
 
 CATEGORY_SQL = ' AND award_category = \'{}\''
@@ -84,6 +91,13 @@ AWARD_DESC_CATEGORIES = {
 
 UNIVERSAL_TRANSACTION_ID_NAME = 'generated_unique_transaction_id'
 
+# Documents per _bulk request when indexing CSV chunks
+BULK_ROWS = 5000
+
+# Seconds to block on a job queue before giving up (fetch) or logging that the process is still waiting (ingest)
+FETCH_JOB_TIMEOUT = 5
+DONE_JOB_TIMEOUT = 60
+
 
 class DataJob:
     def __init__(self, *args):
@@ -94,6 +108,36 @@ class DataJob:
         self.csv = args[4]
         self.count = None
 
+
+class DiskBudget:
+    '''
+    Bytes of downloaded CSVs waiting to be ingested, shared between the download and ingest processes. Downloads
+    only start while the total is under budget and are woken as soon as an ingested CSV releases its bytes
+    '''
+    def __init__(self, budget):
+        self.budget = budget
+        self.used = multiprocessing.RawValue('q', 0)
+        self.condition = multiprocessing.Condition()
+
+    def wait_for_room(self, job_id=None):
+        with self.condition:
+            while self.used.value >= self.budget:
+                printf({
+                    'msg': 'Waiting for ES ingest to free disk space ({} of {} bytes used)'.format(
+                        self.used.value, self.budget),
+                    'job': job_id,
+                    'f': 'Download'})
+                self.condition.wait(timeout=DONE_JOB_TIMEOUT)
+
+    def add(self, size):
+        with self.condition:
+            self.used.value += size
+
+    def release(self, size):
+        with self.condition:
+            self.used.value -= size
+            self.condition.notify_all()
+
 # ==============================================================================
 # Helper functions for several Django management commands focused on ETL into a Elasticsearch cluster
 # ==============================================================================
@@ -153,39 +197,44 @@ def db_rows_to_dict(cursor):
     ]
 
 
-def download_db_records(fetch_jobs, done_jobs, config):
-    while not fetch_jobs.empty():
-        if done_jobs.full():
-            printf({'msg': 'Waiting 60s reduce temporary disk space used', 'f': 'Download'})
-            sleep(60)
-        else:
-            start = perf_counter()
-            job = fetch_jobs.get_nowait()
-            printf({'msg': 'Preparing to download "{}"'.format(job.csv), 'job': job.name, 'f': 'Download'})
-
-            sql_config = {
-                'starting_date': config['starting_date'],
-                'fiscal_year': job.fy,
-                'award_category': job.category,
-                'provide_deleted': config['provide_deleted']
-            }
-            copy_sql, _, count_sql = configure_sql_strings(sql_config, job.csv, [])
-
-            if os.path.isfile(job.csv):
-                os.remove(job.csv)
-
-            job.count = download_csv(count_sql, copy_sql, job.csv, job.name, config['verbose'])
-            done_jobs.put(job)
-            printf({
-                'msg': 'CSV "{}" copy took {} seconds'.format(job.csv, perf_counter() - start),
-                'job': job.name,
-                'f': 'Download'
-            })
-            sleep(1)
-
-    # This "Null Job" is used to notify the other (ES data load) process this is the final job
-    done_jobs.put(DataJob(None, None, None, None, None))
-    printf({'msg': 'All downloads from Postgres completed', 'f': 'Download'})
+def download_db_records(fetch_jobs, done_jobs, config, disk_budget=None):
+    '''
+    Downloads CSVs until no jobs are left to fetch. Several of these may run at once; once they've all returned, the
+    caller puts the "Null Job" telling the ES ingest that it has every job
+    '''
+    while True:
+        try:
+            job = fetch_jobs.get(timeout=FETCH_JOB_TIMEOUT)
+        except Empty:
+            break
+
+        if disk_budget:
+            disk_budget.wait_for_room(job.name)
+        start = perf_counter()
+        printf({'msg': 'Preparing to download "{}"'.format(job.csv), 'job': job.name, 'f': 'Download'})
+
+        sql_config = {
+            'starting_date': config['starting_date'],
+            'fiscal_year': job.fy,
+            'award_category': job.category,
+            'provide_deleted': config['provide_deleted']
+        }
+        copy_sql, _, count_sql = configure_sql_strings(sql_config, job.csv, [])
+
+        if os.path.isfile(job.csv):
+            os.remove(job.csv)
+
+        job.count = download_csv(count_sql, copy_sql, job.csv, job.name, config['verbose'])
+        if disk_budget:
+            disk_budget.add(os.path.getsize(job.csv))
+        done_jobs.put(job)
+        printf({
+            'msg': 'CSV "{}" copy took {} seconds'.format(job.csv, perf_counter() - start),
+            'job': job.name,
+            'f': 'Download'
+        })
+
+    printf({'msg': 'No more CSVs to download from Postgres', 'f': 'Download'})
     return
 
 
@@ -210,36 +259,127 @@ def csv_chunk_gen(filename, chunksize, job_id):
     printf({'msg': 'Opening {} (batch size = {})'.format(filename, chunksize), 'job': job_id, 'f': 'ES Ingest'})
     # Panda's data type guessing causes issues for Elasticsearch. Explicitly cast using dictionary
     dtype = {k: str for k in VIEW_COLUMNS}
+    dtype.update({k: float for k in AMOUNT_COLUMNS + FISCAL_YEAR_COLUMNS})
     for file_df in pd.read_csv(filename, dtype=dtype, header=0, chunksize=chunksize):
-        file_df = file_df.where(cond=(pd.notnull(file_df)), other=None)
-        yield file_df.to_dict(orient='records')
+        yield transform_chunk(file_df)
 
 
-def es_data_loader(client, fetch_jobs, done_jobs, config):
+def transform_chunk(file_df):
+    '''
+    Casts the columns Elasticsearch maps as numbers and dates, a whole column at a time. Values that aren't valid
+    become nulls, which Elasticsearch treats as missing, as it does every empty CSV field
+    '''
+    for column in FISCAL_YEAR_COLUMNS:
+        if column in file_df and not file_df[column].isnull().any():
+            file_df[column] = file_df[column].astype('int64')
+    for column in DATE_COLUMNS:
+        if column in file_df:
+            # Already yyyy-MM-dd, as they're mapped, so only the values that aren't dates are dropped
+            dates = pd.to_datetime(file_df[column], format='%Y-%m-%d', errors='coerce')
+            file_df[column] = file_df[column].where(dates.notnull())
+    for column in TIMESTAMP_COLUMNS:
+        if column in file_df:
+            # Serialized as epoch_millis, one of their mapped formats
+            file_df[column] = pd.to_datetime(file_df[column], errors='coerce', utc=True)
+    return file_df
+
+
+def bulk_ndjson(file_df, rows=BULK_ROWS):
+    '''
+    Yields _bulk request bodies of up to rows documents each, an index action line before every document. Documents
+    are keyed on generated_unique_transaction_id so that a changed transaction overwrites its previous version in
+    place, and are written by pandas' JSON encoder a slice of the frame at a time, without building a dict per row
+    '''
+    for start in range(0, len(file_df), rows):
+        rows_df = file_df.iloc[start:start + rows]
+        ids = list(rows_df[UNIVERSAL_TRANSACTION_ID_NAME].map(json.dumps))
+        docs = split_records(records_json(rows_df))
+        if len(docs) != len(ids):
+            # A value such as 'x},{' also encodes to '},{"', so the slice is encoded again a record at a time
+            docs = [record_body(records_json(rows_df.iloc[row:row + 1])) for row in range(len(rows_df))]
+        yield ''.join('{{"index":{{"_id":{}}}}}\n{{"{}}}\n'.format(doc_id, doc) for doc_id, doc in zip(ids, docs))
+
+
+def records_json(file_df):
+    return file_df.to_json(orient='records', double_precision=2, date_unit='ms')
+
+
+def record_body(records):
+    '''The body of the one record of to_json(orient='records') output, between its braces, without splitting it'''
+    return records[len('[{"'):-len('}]')]
+
+
+def split_records(records):
+    '''
+    Splits to_json(orient='records') output into the bodies of its records, between their braces. Every pair of records
+    is separated by '},{"', so getting more bodies than records means a value contained it too (pandas 0.18 has no
+    lines=True to write a record per line)
+    '''
+    return records[len('[{"'):-len('}]')].split('},{"')
+
+
+def delete_transactions_from_es(client, deleted_ids, config, rows=BULK_ROWS):
+    '''
+    Deletes the transactions removed from the broker from every transaction index, as they may be in fiscal years or
+    categories this run doesn't load. Done once before any job indexes, so that transactions added back since are kept
+    '''
+    deleted_ids = sorted(deleted_ids)
+    index = '{}-*'.format(config['root_index'])
+    printf({'msg': 'Deleting up to {} document(s) from "{}"'.format(len(deleted_ids), index), 'f': 'ES Delete'})
+    start = perf_counter()
+    deleted = 0
+    for start_row in range(0, len(deleted_ids), rows):
+        body = {'query': {'ids': {'values': deleted_ids[start_row:start_row + rows]}}}
+        try:
+            response = client.delete_by_query(index=index, doc_type='transaction_mapping', body=body,
+                                              conflicts='proceed')
+        except Exception as e:
+            print('MASSIVE FAIL!!!\n\n{}\n\n{}'.format(str(e)[:5000], '*' * 80))
+            raise SystemExit
+        deleted += response['deleted']
+    printf({'msg': 'Deleted {} document(s) in {}s'.format(deleted, perf_counter() - start), 'f': 'ES Delete'})
+    return deleted
+
+
+def csv_doc_gen(filename, job_id, rows=BULK_ROWS):
+    '''
+    Lazily yields one _bulk request body per rows CSV rows, read, cast and encoded as the streaming path does, so
+    only the chunks of the bodies in flight are held in memory
+    '''
+    for chunk in csv_chunk_gen(filename, rows, job_id):
+        yield from bulk_ndjson(chunk, rows)
+
+
+def es_data_loader(client, fetch_jobs, done_jobs, config, disk_budget=None):
     while True:
-        if not done_jobs.empty():
-            job = done_jobs.get_nowait()
-            if job.name is None:
-                break
-
-            printf({'msg': 'Starting new job', 'job': job.name, 'f': 'ES Ingest'})
-            post_to_elasticsearch(client, job, config)
-            if os.path.exists(job.csv) and not config['keep']:
-                os.remove(job.csv)
-        else:
-            printf({'msg': 'No Job. Sleeping 45s', 'f': 'ES Ingest'})
-            sleep(45)
+        try:
+            job = done_jobs.get(timeout=DONE_JOB_TIMEOUT)
+        except Empty:
+            printf({'msg': 'No Job after {}s. Still waiting'.format(DONE_JOB_TIMEOUT), 'f': 'ES Ingest'})
+            continue
+        if job.name is None:
+            break
+
+        printf({'msg': 'Starting new job', 'job': job.name, 'f': 'ES Ingest'})
+        post_to_elasticsearch(client, job, config)
+        csv_size = os.path.getsize(job.csv) if os.path.exists(job.csv) else 0
+        if os.path.exists(job.csv) and not config['keep']:
+            os.remove(job.csv)
+        if disk_budget:
+            # Kept CSVs no longer count against the budget either, as they're done with
+            disk_budget.release(csv_size)
 
     printf({'msg': 'Completed Elasticsearch data load', 'f': 'ES Ingest'})
     return
 
 
-def streaming_post_to_es(client, chunk, index_name, job_id=None):
+def streaming_post_to_es(client, bodies, index_name, job_id=None):
+    '''Sends each NDJSON body from bulk_ndjson() as a _bulk request'''
     success, failed = 0, 0
     try:
-        for ok, item in helpers.streaming_bulk(client, chunk, index=index_name, doc_type='transaction_mapping'):
-            success = [success, success + 1][ok]
-            failed = [failed + 1, failed][ok]
+        for body in bodies:
+            ok_count, error_count = post_bulk_body(client, body, index_name)
+            success, failed = success + ok_count, failed + error_count
 
     except Exception as e:
         print('MASSIVE FAIL!!!\n\n{}\n\n{}'.format(str(e)[:5000], '*' * 80))
@@ -249,6 +389,48 @@ def streaming_post_to_es(client, chunk, index_name, job_id=None):
     return success, failed
 
 
+def post_bulk_body(client, body, index_name):
+    response = client.bulk(body=body, index=index_name, doc_type='transaction_mapping')
+    # Each item is keyed on its action; deleting a missing document is a "not_found" result, not an error
+    errors = sum(1 for item in response['items'] for result in item.values() if 'error' in result)
+    return len(response['items']) - errors, errors
+
+
+def parallel_post_to_es(client, bodies, index_name, thread_count, job_id=None):
+    '''
+    parallel_bulk-style indexing: the NDJSON bodies from csv_doc_gen() are sent by a pool of threads, but at most two
+    bodies per thread are read ahead of the cluster so the CSV is never all held in memory
+    '''
+    success, failed = 0, 0
+    start = perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=thread_count) as executor:
+            in_flight = set()
+            for body in bodies:
+                if len(in_flight) >= thread_count * 2:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        ok_count, error_count = future.result()
+                        success, failed = success + ok_count, failed + error_count
+                in_flight.add(executor.submit(post_bulk_body, client, body, index_name))
+
+            for future in in_flight:
+                ok_count, error_count = future.result()
+                success, failed = success + ok_count, failed + error_count
+
+    except Exception as e:
+        print('MASSIVE FAIL!!!\n\n{}\n\n{}'.format(str(e)[:5000], '*' * 80))
+        raise SystemExit
+
+    elapsed = perf_counter() - start
+    printf({
+        'msg': 'Success: {}, Fails: {} ({:.0f} docs/s)'.format(success, failed, (success + failed) / elapsed),
+        'job': job_id,
+        'f': 'ES Ingest'
+    })
+    return success, failed
+
+
 def post_to_elasticsearch(client, job, config, chunksize=250000):
     printf({'msg': 'Populating ES Index "{}"'.format(job.index), 'job': job.name, 'f': 'ES Ingest'})
     start = perf_counter()
@@ -264,23 +446,33 @@ def post_to_elasticsearch(client, job, config, chunksize=250000):
         printf({'msg': 'Deleting existing index "{}"'.format(job.index), 'job': job.name, 'f': 'ES Ingest'})
         client.indices.delete(job.index)
 
+    if config.get('index_threads'):
+        printf({
+            'msg': 'Indexing with {} threads [{} rows]'.format(config['index_threads'], job.count),
+            'job': job.name,
+            'f': 'ES Ingest'
+        })
+        parallel_post_to_es(client, csv_doc_gen(job.csv, job.name), job.index, config['index_threads'], job.name)
+        printf({
+            'msg': 'Elasticsearch Index loading took {}s'.format(perf_counter() - start),
+            'job': job.name,
+            'f': 'ES Ingest'
+        })
+        return
+
     csv_generator = csv_chunk_gen(job.csv, chunksize, job.name)
     for count, chunk in enumerate(csv_generator):
         if len(chunk) == 0:
             printf({'msg': 'No documents to add/delete for chunk #{}'.format(count), 'f': 'ES Ingest', 'job': job.name})
             continue
         iteration = perf_counter()
-        if config['recreate'] is False:
-            id_list = [{'key': c[UNIVERSAL_TRANSACTION_ID_NAME], 'col': UNIVERSAL_TRANSACTION_ID_NAME} for c in chunk]
-            delete_transactions_from_es(client, id_list, job.name, config, job.index)
-
         current_rows = '({}-{})'.format(count * chunksize + 1, count * chunksize + len(chunk))
         printf({
             'msg': 'Streaming to ES #{} rows [{}/{}]'.format(count, current_rows, job.count),
             'job': job.name,
             'f': 'ES Ingest'
         })
-        streaming_post_to_es(client, chunk, job.index, job.name)
+        streaming_post_to_es(client, bulk_ndjson(chunk), job.index, job.name)
         printf({
             'msg': 'Iteration group #{} took {}s'.format(count, perf_counter() - iteration),
             'job': job.name,
@@ -293,12 +485,6 @@ def post_to_elasticsearch(client, job, config, chunksize=250000):
     })
 
 
-def deleted_transactions(client, config):
-    deleted_ids = gather_deleted_ids(config)
-    id_list = [{'key': deleted_id, 'col': UNIVERSAL_TRANSACTION_ID_NAME} for deleted_id in deleted_ids]
-    delete_transactions_from_es(client, id_list, None, config, None)
-
-
 def gather_deleted_ids(config):
     '''
     Connect to S3 and gather all of the transaction ids stored in CSV files
@@ -372,79 +558,6 @@ def gather_deleted_ids(config):
     return deleted_ids
 
 
-def filter_query(column, values, query_type="match_phrase"):
-    queries = [{query_type: {column: str(i)}} for i in values]
-    return {
-        "query": {
-            "bool": {
-                "should": [
-                    queries
-                ]
-            }
-        }
-    }
-
-
-def delete_query(response):
-    return {
-        "query": {
-            "ids": {
-                "type": "transaction_mapping",
-                "values": [i['_id'] for i in response['hits']['hits']]
-            }
-        }
-    }
-
-
-def chunks(l, n):
-    """Yield successive n-sized chunks from l."""
-    for i in range(0, len(l), n):
-        yield l[i:i + n]
-
-
-def delete_transactions_from_es(client, id_list, job_id, config, index=None, size=50000):
-    '''
-    id_list = [{key:'key1',col:'tranaction_id'},
-               {key:'key2',col:'generated_unique_transaction_id'}],
-               ...]
-    '''
-    start = perf_counter()
-
-    printf({
-        'msg': 'Deleting up to {} document(s)'.format(len(id_list)),
-        'f': 'ES Delete',
-        'job': job_id})
-
-    if index is None:
-        index = '{}-*'.format(config['root_index'])
-    start_ = client.search(index=index)['hits']['total']
-    printf({
-        'msg': 'Starting amount of indices ----- {}'.format(start_),
-        'f': 'ES Delete',
-        'job': job_id})
-    col_to_items_dict = defaultdict(list)
-    for l in id_list:
-        col_to_items_dict[l['col']].append(l['key'])
-
-    for column, values in col_to_items_dict.items():
-        printf({'msg': 'Deleting {} of "{}"'.format(len(values), column), 'f': 'ES Delete', 'job': job_id})
-        values_generator = chunks(values, 1000)
-        for v in values_generator:
-            body = filter_query(column, v)
-            response = client.search(index=index, body=json.dumps(body), size=size)
-            delete_body = delete_query(response)
-            try:
-                client.delete_by_query(index=index, body=json.dumps(delete_body), size=size)
-            except Exception as e:
-                printf({'msg': '[ERROR][ERROR][ERROR]\n{}'.format(str(e)), 'f': 'ES Delete', 'job': job_id})
-    end_ = client.search(index=index)['hits']['total']
-
-    t = perf_counter() - start
-    total = str(start_ - end_)
-    printf({'msg': 'ES Deletes took {}s. Deleted {} records'.format(t, total), 'f': 'ES Delete', 'job': job_id})
-    return
-
-
 def printf(items):
     t = datetime.utcnow().strftime('%H:%M:%S.%f')
     msg = items['msg']
@@ -0,0 +1,99 @@
+import logging
+import os
+from time import perf_counter
+
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from django.core.management.base import BaseCommand
+
+from usaspending_api.etl.matview_build_helpers import load_specs, plan_matview_build, run_steps, write_timings
+
+logger = logging.getLogger('console')
+
+
+class Command(BaseCommand):
+    help = "Build the matviews from their matview_generator JSON specs, running independent views and index builds " \
+           "in parallel, then swap all of the new matviews in at once"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--matviews',
+            dest='matviews',
+            nargs='+',
+            default=None,
+            help='Build only these matviews (default: every matview with a JSON spec)'
+        )
+        parser.add_argument(
+            '--max-parallel',
+            dest='max_parallel',
+            type=int,
+            default=4,
+            help='Most statements (and database connections) running at once'
+        )
+        parser.add_argument(
+            '--timings-file',
+            dest='timings_file',
+            default=None,
+            help='Write the seconds taken by each step to this JSON file'
+        )
+        parser.add_argument(
+            '--no-swap',
+            dest='swap',
+            action='store_false',
+            default=True,
+            help='Leave the new matviews as <name>_temp instead of swapping them in'
+        )
+
+    def handle(self, *args, **options):
+        if not os.environ.get('DATABASE_URL'):
+            raise SystemExit('DATABASE_URL environment variable must be set')
+
+        specs = load_specs(options['matviews'])
+        if not specs:
+            logger.info('No matview specs to build')
+            return
+        steps, swap_sql = plan_matview_build(specs)
+        logger.info('Building {} with {} steps, at most {} at a time'.format(
+            ', '.join(specs), len(steps), options['max_parallel']))
+
+        pool = ThreadedConnectionPool(1, options['max_parallel'], dsn=os.environ['DATABASE_URL'])
+
+        def execute(step):
+            connection = pool.getconn()
+            try:
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    for statement in step.sql:
+                        cursor.execute(statement)
+            finally:
+                pool.putconn(connection)
+
+        try:
+            start = perf_counter()
+            timings = run_steps(steps, execute, options['max_parallel'])
+
+            if options['swap']:
+                swap_start = perf_counter()
+                connection = pool.getconn()
+                try:
+                    connection.autocommit = False
+                    # Every matview is renamed in the same transaction, so readers see all old or all new matviews
+                    with connection:
+                        with connection.cursor() as cursor:
+                            for statement in swap_sql:
+                                cursor.execute(statement)
+                except psycopg2.Error:
+                    logger.exception('Unable to swap the new matviews in, leaving them as <name>_temp')
+                    raise
+                finally:
+                    pool.putconn(connection)
+                timings['swap'] = perf_counter() - swap_start
+            timings['total'] = perf_counter() - start
+        finally:
+            pool.closeall()
+
+        for name, elapsed in sorted(timings.items(), key=lambda timing: timing[1], reverse=True):
+            logger.info('{:>10.2f}s  {}'.format(elapsed, name))
+        if options['timings_file']:
+            write_timings(timings, options['timings_file'])
+        logger.info('MATVIEW BUILD FINISHED!')
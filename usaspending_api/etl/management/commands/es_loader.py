@@ -116,6 +116,8 @@ class Command(BaseCommand):
             # job.count = download_db_records(awd_cat_idx, self.config['fiscal_year'], filename)
 
         download_db_records(fetch_jobs, done_jobs, self.config)
+        # This "Null Job" is used to notify the ES data load this is the final job
+        done_jobs.put(DataJob(None, None, None, None, None))
         es_data_loader(ES_CLIENT, fetch_jobs, done_jobs, self.config)
 
         print('Completed all categories for FY{}'.format(self.config['fiscal_year']))
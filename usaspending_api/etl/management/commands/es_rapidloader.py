@@ -5,30 +5,34 @@ from django.core.management.base import BaseCommand
 from elasticsearch import Elasticsearch
 from multiprocessing import Process, Queue
 from time import perf_counter
-from time import sleep
 
 from usaspending_api import settings
 from usaspending_api.etl.es_etl_helpers import AWARD_DESC_CATEGORIES
 from usaspending_api.etl.es_etl_helpers import csv_row_count
+from usaspending_api.etl.es_etl_helpers import delete_transactions_from_es
 from usaspending_api.etl.es_etl_helpers import DataJob
-from usaspending_api.etl.es_etl_helpers import deleted_transactions
+from usaspending_api.etl.es_etl_helpers import DiskBudget
 from usaspending_api.etl.es_etl_helpers import download_db_records
 from usaspending_api.etl.es_etl_helpers import es_data_loader
+from usaspending_api.etl.es_etl_helpers import gather_deleted_ids
 from usaspending_api.etl.es_etl_helpers import printf
 
 
 # SCRIPT OBJECTIVES and ORDER OF EXECUTION STEPS
 # 1. Generate the full list of fiscal years and award descriptions to process as jobs
 # 2. Iterate by job
-#   a. Download 1 CSV file
-#       i. Download the next CSV file until no more jobs need CSVs
-#   b. Upload CSV to Elasticsearch
+#   a. Download CSV files with several processes at once
+#       i. Download the next CSV file until no more jobs need CSVs, pausing while the CSVs on disk exceed the budget
+#   b. Delete the transactions removed from the broker from every transaction index
+#   c. Upload CSV to Elasticsearch
 #       1. As a new CSV is ready, upload to ES
-#       2. Either recreate index or remove existing docs with matching ids
-#       3. [default] delete CSV file
+#       2. Optionally recreate index
+#       3. Index docs keyed on generated_unique_transaction_id, overwriting the existing versions
+#       4. [default] delete CSV file
 #   d. Lather. Rinse. Repeat.
 
 ES = Elasticsearch(settings.ES_HOSTNAME, timeout=300)
+DEFAULT_DISK_BUDGET = 50 * 1024 ** 3
 
 
 class Command(BaseCommand):
@@ -70,6 +74,23 @@ class Command(BaseCommand):
             '--keep',
             action='store_true',
             help='CSV files are not deleted after they are uploaded')
+        parser.add_argument(
+            '-p',
+            '--download-processes',
+            default=1,
+            type=int,
+            help='Number of CSVs downloaded from Postgres at once')
+        parser.add_argument(
+            '--disk-budget',
+            default=DEFAULT_DISK_BUDGET,
+            type=int,
+            help='Bytes of downloaded CSVs allowed on disk before downloads wait for the ES ingest to catch up')
+        parser.add_argument(
+            '-t',
+            '--index-threads',
+            default=None,
+            type=int,
+            help='Send each CSV\'s _bulk requests from this many threads instead of one at a time')
 
     # used by parent class
     def handle(self, *args, **options):
@@ -85,6 +106,9 @@ class Command(BaseCommand):
         self.config['recreate'] = options['recreate']
         self.config['stale'] = options['stale']
         self.config['keep'] = options['keep']
+        self.config['index_threads'] = options['index_threads']
+        self.config['download_processes'] = options['download_processes']
+        self.config['disk_budget'] = options['disk_budget']
 
         if not options['since']:
             # Due to the queries used for fetching postgres data, `starting_date` needs to be present and a date
@@ -109,7 +133,8 @@ class Command(BaseCommand):
     def controller(self):
 
         download_queue = Queue()  # Queue for jobs whch need a csv downloaded
-        es_ingest_queue = Queue(10)  # Queue for jobs which have a csv and are ready for ES ingest
+        es_ingest_queue = Queue()  # Queue for jobs which have a csv and are ready for ES ingest
+        disk_budget = DiskBudget(self.config['disk_budget'])  # Bytes of CSVs which are waiting for ES ingest
 
         job_id = 0
         for fy in self.config['fiscal_years']:
@@ -133,6 +158,7 @@ class Command(BaseCommand):
                             'job': new_job.name,
                             'f': 'Download'})
                         # Add job directly to the Elasticsearch ingest queue since the CSV exists
+                        disk_budget.add(os.path.getsize(filename))
                         es_ingest_queue.put(new_job)
                         continue
                     else:
@@ -141,24 +167,30 @@ class Command(BaseCommand):
 
         printf({'msg': 'There are {} jobs to process'.format(job_id)})
 
-        if self.config['provide_deleted']:
-            s3_delete_process = Process(target=deleted_transactions, args=(ES, self.config))
-        download_proccess = Process(target=download_db_records, args=(download_queue, es_ingest_queue, self.config))
-        es_index_process = Process(target=es_data_loader, args=(ES, download_queue, es_ingest_queue, self.config))
+        download_processes = [
+            Process(target=download_db_records, args=(download_queue, es_ingest_queue, self.config, disk_budget))
+            for _ in range(self.config['download_processes'])
+        ]
+        es_index_process = Process(target=es_data_loader, args=(ES, download_queue, es_ingest_queue, self.config,
+                                                                disk_budget))
 
-        download_proccess.start()
+        for download_process in download_processes:
+            download_process.start()
 
         if self.config['provide_deleted']:
-            s3_delete_process.start()
-            while s3_delete_process.is_alive():
-                printf({'msg': 'Waiting to start ES ingest until S3 deletes are complete'})
-                sleep(7)
+            # Deleted from every transaction index once, before any job indexes, so none of them re-deletes documents
+            # a job has just indexed
+            printf({'msg': 'Waiting to start ES ingest until the deleted transactions are removed'})
+            delete_transactions_from_es(ES, gather_deleted_ids(self.config), self.config)
 
         es_index_process.start()
 
-        if self.config['provide_deleted']:
-            s3_delete_process.join()
-        download_proccess.join()
+        for download_process in download_processes:
+            download_process.join()
+
+        # This "Null Job" is used to notify the other (ES data load) process this is the final job
+        es_ingest_queue.put(DataJob(None, None, None, None, None))
+        printf({'msg': 'All downloads from Postgres completed', 'f': 'Download'})
         es_index_process.join()
 
 
@@ -4,8 +4,9 @@ Code for loaders in management/commands to inherit from or share.
 
 import logging
 import time
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
+from functools import lru_cache
 
 import dateutil
 from copy import copy
@@ -20,7 +21,7 @@ from usaspending_api.awards.models import TransactionNormalized, TransactionFABS
 from usaspending_api.etl.broker_etl_helpers import PhonyCursor, setup_broker_fdw
 from usaspending_api.etl.helpers import update_model_description_fields
 from usaspending_api.references.helpers import canonicalize_location_dict
-from usaspending_api.references.models import (Agency, LegalEntity, Cfda, Location, )
+from usaspending_api.references.models import (Agency, LegalEntity, Cfda, Location, RefCityCountyCode)
 from usaspending_api.references.abbreviations import territory_country_codes
 
 # Lists to store for update_awards and update_contract_awards
@@ -57,6 +58,7 @@ class Command(BaseCommand):
             help='Skips the cleanup step to update model description fields'
         )
 
+    @RefCityCountyCode.indexed()
     def handle(self, *args, **options):
         awards_cache.clear()
 
@@ -436,13 +438,92 @@ def load_file_d2(
     logger.info('\n\n\n\nFile D2 time elapsed: {}'.format(time.time() - d_start_time))
 
 
+def parse_date_string(date_string):
+    """
+    Date of a date or datetime string, as dateutil.parser.parse(date_string).date() reads it. The YYYY-MM-DD and
+    MM/DD/YYYY forms loaders see are read by position, and anything else is left to dateutil
+    """
+    if len(date_string) >= 10 and date_string[10:11] in ('', ' ', 'T'):
+        if date_string[4] == '-' and date_string[7] == '-':
+            year, month, day = date_string[0:4], date_string[5:7], date_string[8:10]
+        elif date_string[2] == '/' and date_string[5] == '/':
+            month, day, year = date_string[0:2], date_string[3:5], date_string[6:10]
+        else:
+            year = month = day = ''
+        if (year + month + day).isdigit():
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                pass
+    return dateutil.parser.parse(date_string).date()
+
+
 def format_date(date_string):
     try:
-        return dateutil.parser.parse(date_string).date()
+        return parse_date_string(date_string)
     except (TypeError, ValueError):
         return None
 
 
+# Where a step of a mapping plan takes its value from
+FROM_CONSTANT, FROM_VALUE_MAP, FROM_FIELD_MAP, FROM_FIELD_MAP_OR_DATA, FROM_DATA = range(5)
+
+MAPPING_PLAN_CACHE_SIZE = 256
+
+
+def convert_date(value):
+    """Turns datetime strings into dates, leaving strings which aren't dates as they are"""
+    if isinstance(value, str):
+        try:
+            return parse_date_string(value)
+        except (TypeError, ValueError):
+            pass
+    return value
+
+
+def negate(value):
+    return -1 * Decimal(value)
+
+
+def negate_date(value):
+    return negate(convert_date(value))
+
+
+@lru_cache(maxsize=MAPPING_PLAN_CACHE_SIZE)
+def mapping_plan(model, field_map_items, value_map_keys, reverse):
+    """
+    The steps load_data_into_model() takes for each field of the model, worked out once for the field_map and the keys
+    of the value_map: a (field, source, key, data_keys, convert) tuple per field, in the order of get_fields()
+    """
+    field_map = dict(field_map_items)
+    plan = []
+    for field in [field.name for field in model._meta.get_fields()]:
+        # Let's handle the data source field here for all objects
+        if field == 'data_source':
+            plan.append((field, FROM_CONSTANT, 'DBR', (), None))
+        # If our field is the 'long form' field, we need to get what it maps to in the broker
+        broker_field = settings.LONG_TO_TERSE_LABELS.get(field, field)
+
+        if field.endswith('date'):  # turn datetimes into dates
+            convert = negate_date if reverse and reverse.search(field) else convert_date
+        else:
+            convert = negate if reverse and reverse.search(field) else None
+
+        # The value map takes precedence over the field map, which takes precedence over the data's own columns
+        data_keys = (broker_field,) if broker_field == field else (broker_field, field)
+        if broker_field in value_map_keys:
+            plan.append((field, FROM_VALUE_MAP, broker_field, (), convert))
+        elif field in value_map_keys:
+            plan.append((field, FROM_VALUE_MAP, field, (), convert))
+        elif broker_field in field_map:
+            plan.append((field, FROM_FIELD_MAP_OR_DATA, field_map[broker_field], data_keys, convert))
+        elif field in field_map:
+            plan.append((field, FROM_FIELD_MAP, field_map[field], (), convert))
+        else:
+            plan.append((field, FROM_DATA, None, data_keys, convert))
+    return tuple(plan)
+
+
 def load_data_into_model(model_instance, data, **kwargs):
     """
     Loads data into a model instance
@@ -472,51 +553,43 @@ def load_data_into_model(model_instance, data, **kwargs):
     as_dict = kwargs.get('as_dict', False)
     reverse = kwargs.get('reverse')
 
-    # Grab all the field names from the meta class of the model instance
-    fields = [field.name for field in model_instance._meta.get_fields()]
-    mod = model_instance
-
-    if as_dict:
-        mod = {}
-
-    for field in fields:
-        # Let's handle the data source field here for all objects
-        if field is 'data_source':
-            store_value(mod, field, 'DBR', reverse)
-        broker_field = field
-        # If our field is the 'long form' field, we need to get what it maps to
-        # in the broker so we can map the data properly
-        if broker_field in settings.LONG_TO_TERSE_LABELS:
-            broker_field = settings.LONG_TO_TERSE_LABELS[broker_field]
-        sts = False
-        if value_map:
-            if broker_field in value_map:
-                store_value(mod, field, value_map[broker_field], reverse)
-                sts = True
-            elif field in value_map:
-                store_value(mod, field, value_map[field], reverse)
-                sts = True
-        if field_map and not sts:
-            if broker_field in field_map:
+    plan = mapping_plan(type(model_instance), frozenset(field_map.items()) if field_map else frozenset(),
+                        frozenset(value_map) if value_map else frozenset(), reverse)
+
+    values = {}
+    for field, source, key, data_keys, convert in plan:
+        if source == FROM_VALUE_MAP:
+            value = value_map[key]
+        elif source == FROM_FIELD_MAP:
+            value = data[key]
+        elif source == FROM_CONSTANT:
+            value = key
+        else:
+            found = False
+            if source == FROM_FIELD_MAP_OR_DATA:
                 try:
-                    store_value(mod, field, data[field_map[broker_field]], reverse)
-                    sts = True
+                    value = data[key]
+                    found = True
                 except KeyError:
-                    print('column {} missing from data'.format(field_map[broker_field]))
-            elif field in field_map:
-                store_value(mod, field, data[field_map[field]], reverse)
-                sts = True
-        if broker_field in data and not sts:
-            store_value(mod, field, data[broker_field], reverse)
-        elif field in data and not sts:
-            store_value(mod, field, data[field], reverse)
+                    print('column {} missing from data'.format(key))
+            if not found:
+                for data_key in data_keys:
+                    if data_key in data:
+                        value = data[data_key]
+                        break
+                else:
+                    continue
+        if value is not None:
+            values[field] = convert(value) if convert else value
 
+    if as_dict:
+        return values
+
+    for field, value in values.items():
+        setattr(model_instance, field, value)
     if save:
         model_instance.save()
-    if as_dict:
-        return mod
-    else:
-        return model_instance
+    return model_instance
 
 
 def create_location(location_map, row, location_value_map=None):
@@ -609,20 +682,3 @@ def get_or_create_location(location_map, row, location_value_map=None, empty_loc
     else:
         # record had no location information at all
         return None, None
-
-
-def store_value(model_instance_or_dict, field, value, reverse=None):
-    if value is None:
-        return
-    if field.endswith('date'):  # turn datetimes into dates
-        if isinstance(value, str):
-            try:
-                value = dateutil.parser.parse(value).date()
-            except (TypeError, ValueError):
-                pass
-    if reverse and reverse.search(field):
-        value = -1 * Decimal(value)
-    if isinstance(model_instance_or_dict, dict):
-        model_instance_or_dict[field] = value
-    else:
-        setattr(model_instance_or_dict, field, value)
@@ -0,0 +1,156 @@
+"""
+Builds the matviews described by the matview_generator JSON specs as a graph of steps (drop, create, one step per
+index, then cluster/analyze/grant) run concurrently, and swaps every new matview in at once when they're all ready
+"""
+import glob
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from time import perf_counter
+from uuid import uuid4
+
+from usaspending_api.database_scripts.matview_generator import matview_sql_generator as generator
+
+logger = logging.getLogger('console')
+
+SPEC_PATH = os.path.join(os.path.dirname(generator.__file__), '*.json')
+
+
+class BuildStep(object):
+    def __init__(self, name, sql, depends_on=()):
+        self.name = name
+        self.sql = [statement for statement in sql if statement]
+        self.depends_on = list(depends_on)
+
+    def __repr__(self):
+        return 'BuildStep({})'.format(self.name)
+
+
+def load_specs(matviews=None, path=SPEC_PATH):
+    """Returns the JSON specs by final_name, optionally only the named matviews"""
+    specs = OrderedDict()
+    for file_path in sorted(glob.glob(path)):
+        sql_json = generator.ingest_json(file_path)
+        if not matviews or sql_json['final_name'] in matviews:
+            specs[sql_json['final_name']] = sql_json
+    return specs
+
+
+def get_referenced_matviews(sql_json, matview_names):
+    """Returns the other matviews being built that this matview is selected from"""
+    sql = '\n'.join(sql_json['matview_sql'])
+    return [name for name in matview_names
+            if name != sql_json['final_name'] and re.search(r'\b{}\b'.format(re.escape(name)), sql)]
+
+
+def plan_matview_build(specs):
+    """
+    Returns the build steps of every spec, in the order they'd be run one at a time, and the statements swapping the
+    new matviews in. A matview selected from another one being built is created from the new one, once it's indexed
+    """
+    steps = OrderedDict()
+    swap_sql = []
+    for matview_name, sql_json in specs.items():
+        matview_temp_name = matview_name + '_temp'
+        incremental = 'incremental' in sql_json
+        referenced = get_referenced_matviews(sql_json, specs)
+
+        # Index names must not collide with the indexes of the matviews being replaced
+        generator.COMMIT_HASH = uuid4().hex[:8]
+        generator.RANDOM_CHARS = ''
+        generator.CLUSTERING_INDEX = None
+        create_indexes, rename_old_indexes, rename_new_indexes = generator.make_indexes_sql(sql_json,
+                                                                                            matview_temp_name)
+
+        matview_sql = []
+        for line in sql_json['matview_sql']:
+            for name in referenced:
+                line = re.sub(r'\b{}\b'.format(re.escape(name)), name + '_temp', line)
+            matview_sql.append(line)
+
+        drop_step = BuildStep(matview_name + ':drops', generator.make_matview_drops(matview_name, incremental))
+        create_step = BuildStep(matview_name + ':create',
+                                generator.make_matview_create(matview_name, matview_sql, incremental),
+                                [drop_step.name] + [name + ':ready' for name in referenced])
+        index_steps = [BuildStep('{}:index:{}'.format(matview_name, idx['name']), [index_sql], [create_step.name])
+                       for idx, index_sql in zip(sql_json['indexes'], create_indexes)]
+
+        ready_sql = []
+        if generator.CLUSTERING_INDEX:
+            ready_sql.append(generator.TEMPLATE['cluster_matview'].format(matview_temp_name,
+                                                                          generator.CLUSTERING_INDEX))
+        ready_sql.append(generator.TEMPLATE['analyze'].format(matview_temp_name))
+        ready_sql.append(generator.TEMPLATE['grant_select'].format(matview_temp_name, 'readonly'))
+        ready_step = BuildStep(matview_name + ':ready', ready_sql,
+                               [step.name for step in index_steps] or [create_step.name])
+
+        for step in [drop_step, create_step] + index_steps + [ready_step]:
+            steps[step.name] = step
+        swap_sql += [statement for statement in generator.make_rename_sql(
+            matview_name, rename_old_indexes, rename_new_indexes, incremental) if statement]
+
+    for step in steps.values():
+        missing = [name for name in step.depends_on if name not in steps]
+        if missing:
+            raise ValueError('{} depends on steps that are not being built: {}'.format(step.name, missing))
+    return steps, swap_sql
+
+
+def run_steps(steps, execute, max_parallel):
+    """
+    Runs each step once all the steps it depends on finished, at most max_parallel at a time, and returns how long
+    each step took. After a failed step no more steps are started, and its exception is raised once the running
+    steps finish
+    """
+    timings = OrderedDict()
+    pending = OrderedDict(steps)
+    finished = set()
+    error = None
+
+    def timed(step):
+        start = perf_counter()
+        try:
+            execute(step)
+        except Exception:
+            logger.exception('Failed {}'.format(step.name))
+            raise
+        return step, perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        running = set()
+        while pending or running:
+            if error is None:
+                for name, step in list(pending.items()):
+                    if len(running) >= max_parallel:
+                        break
+                    if all(dependency in finished for dependency in step.depends_on):
+                        logger.info('Starting {}'.format(name))
+                        running.add(executor.submit(timed, pending.pop(name)))
+            elif not running:
+                break
+
+            if not running:
+                raise ValueError('Steps with circular dependencies: {}'.format(', '.join(pending)))
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    step, elapsed = future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                finished.add(step.name)
+                timings[step.name] = elapsed
+                logger.info('Finished {} in {:.2f} seconds'.format(step.name, elapsed))
+
+    if error is not None:
+        raise error
+    return timings
+
+
+def write_timings(timings, file_path):
+    with open(file_path, 'w') as f:
+        json.dump(timings, f, indent=2)
@@ -0,0 +1,79 @@
+"""
+Compares the rows/s of copy_rows against bulk_create, as the broker bulk loaders used it, inserting the Locations and
+Legal Entities of a load. Every insert is rolled back, so it can be run against a database with data.
+
+    python -m usaspending_api.etl.tests.benchmark_copy_rows [--rows 100000]
+
+Needs DATABASE_URL. Rows are built before each insert is timed, so only the writes themselves are compared.
+"""
+import argparse
+import django
+import os
+import random
+from time import perf_counter
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+from django.db import transaction  # noqa: E402
+
+from usaspending_api.etl.copy_helpers import copy_rows  # noqa: E402
+from usaspending_api.references.models import LegalEntity, Location  # noqa: E402
+
+BATCH_SIZE = 100000
+
+
+class Rollback(Exception):
+    pass
+
+
+def build_locations(rows):
+    return [Location(location_country_code='USA', country_name='UNITED STATES', state_code='VA',
+                     city_name='CITY {}'.format(random.randint(0, 5000)), county_code='{:03d}'.format(row % 1000),
+                     zip5='{:05d}'.format(random.randint(0, 99999)), address_line1='{} MAIN ST'.format(row),
+                     recipient_flag=True)
+            for row in range(rows)]
+
+
+def build_legal_entities(locations):
+    return [LegalEntity(recipient_unique_id='{:09d}'.format(index), recipient_name='RECIPIENT {}'.format(index),
+                        location=location, business_categories=['small_business', 'category_business'])
+            for index, location in enumerate(locations)]
+
+
+def bulk_create(model, instances):
+    model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+
+
+def time_load(write, rows):
+    """Seconds to write the Locations and Legal Entities of a load, which is then rolled back"""
+    locations = build_locations(rows)
+    elapsed = 0
+    try:
+        with transaction.atomic():
+            start = perf_counter()
+            write(Location, locations)
+            elapsed += perf_counter() - start
+
+            legal_entities = build_legal_entities(locations)
+            start = perf_counter()
+            write(LegalEntity, legal_entities)
+            elapsed += perf_counter() - start
+            raise Rollback
+    except Rollback:
+        pass
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='Locations and Legal Entities inserted')
+    args = parser.parse_args()
+
+    for name, write in (('bulk_create', bulk_create), ('copy_rows', copy_rows)):
+        seconds = time_load(write, args.rows)
+        print('{:<12} {:.1f} s, {:.0f} rows/s'.format(name, seconds, args.rows * 2 / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compares turning a transaction_delta_view CSV into _bulk request bodies with the typed csv_chunk_gen/bulk_ndjson
+stage against the previous all-text frames, converted to a dict per row and serialized by the Elasticsearch client.
+
+    python -m usaspending_api.etl.tests.benchmark_csv_chunk_gen [--rows 1000000] [--chunksize 250000]
+
+A sample CSV of --rows rows is written to a temporary directory first. Only reading and serializing is timed.
+"""
+import argparse
+import csv
+import django
+import os
+import random
+import tempfile
+import timeit
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+import pandas as pd  # noqa: E402
+from elasticsearch.serializer import JSONSerializer  # noqa: E402
+
+from usaspending_api.etl.es_etl_helpers import AMOUNT_COLUMNS, DATE_COLUMNS, FISCAL_YEAR_COLUMNS  # noqa: E402
+from usaspending_api.etl.es_etl_helpers import TIMESTAMP_COLUMNS, VIEW_COLUMNS  # noqa: E402
+from usaspending_api.etl.es_etl_helpers import BULK_ROWS, bulk_ndjson, csv_chunk_gen  # noqa: E402
+
+
+def sample_value(column, row):
+    if column in AMOUNT_COLUMNS:
+        return '' if random.random() < 0.3 else '{:.2f}'.format(random.uniform(-1e6, 1e8))
+    if column in FISCAL_YEAR_COLUMNS:
+        return str(random.randint(2008, 2018))
+    if column in DATE_COLUMNS:
+        return '' if random.random() < 0.1 else '20{:02d}-{:02d}-{:02d}'.format(
+            random.randint(8, 18), random.randint(1, 12), random.randint(1, 28))
+    if column in TIMESTAMP_COLUMNS:
+        return '2018-03-{:02d} 12:34:56.123456+00'.format(random.randint(1, 28))
+    if column == 'generated_unique_transaction_id':
+        return 'CONT_TX_{}'.format(row)
+    return '' if random.random() < 0.2 else 'VALUE "{}" {}'.format(column, random.randint(0, 10 ** 6))
+
+
+def write_sample_csv(filename, rows):
+    with open(filename, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(VIEW_COLUMNS)
+        for row in range(rows):
+            writer.writerow([sample_value(column, row) for column in VIEW_COLUMNS])
+
+
+def previous_bodies(filename, chunksize):
+    """The previous stage: text frames with None for nulls, dicts per row and streaming_bulk's serialization"""
+    serializer = JSONSerializer()
+    dtype = {k: str for k in VIEW_COLUMNS}
+    for file_df in pd.read_csv(filename, dtype=dtype, header=0, chunksize=chunksize):
+        file_df = file_df.where(cond=(pd.notnull(file_df)), other=None)
+        docs = file_df.to_dict(orient='records')
+        for start in range(0, len(docs), BULK_ROWS):
+            lines = []
+            for doc in docs[start:start + BULK_ROWS]:
+                lines.append(serializer.dumps({'index': {}}))
+                lines.append(serializer.dumps(doc))
+            yield '\n'.join(lines) + '\n'
+
+
+def typed_bodies(filename, chunksize):
+    for chunk in csv_chunk_gen(filename, chunksize, None):
+        for body in bulk_ndjson(chunk):
+            yield body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the sample CSV')
+    parser.add_argument('--chunksize', type=int, default=250000, help='Rows read from the CSV at a time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'transactions.csv')
+        write_sample_csv(filename, args.rows)
+        print('{} rows, {:.0f} MB CSV'.format(args.rows, os.path.getsize(filename) / 2 ** 20))
+        for name, bodies in (('dict per row', previous_bodies), ('typed ndjson', typed_bodies)):
+            size = [0]
+
+            def consume():
+                size[0] = sum(len(body) for body in bodies(filename, args.chunksize))
+
+            seconds = timeit.timeit(consume, number=1)
+            print('{:<14} {:.1f} s, {:.0f} rows/s, {:.0f} MB of bodies'.format(
+                name, seconds, args.rows / seconds, size[0] / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""
+Times load_data_into_model's mapping plans against the previous per-row walk of the model's fields, over synthetic
+broker rows loaded the way bulk_load_fpds loads them: a TransactionFPDS from every column of the row, and a place of
+performance Location through a field map and value map.
+
+    python -m usaspending_api.etl.tests.benchmark_load_data_into_model [--rows 100000]
+
+No database is needed; nothing is saved.
+"""
+import argparse
+import django
+import os
+import random
+import timeit
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+import dateutil.parser  # noqa: E402
+from decimal import Decimal  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+from usaspending_api.awards.models import TransactionFPDS  # noqa: E402
+from usaspending_api.broker.management.commands.bulk_load_fpds import pop_field_map  # noqa: E402
+from usaspending_api.etl.management.load_base import load_data_into_model  # noqa: E402
+from usaspending_api.references.models import Location  # noqa: E402
+
+
+def previous_store_value(model_instance_or_dict, field, value, reverse=None):
+    if value is None:
+        return
+    if field.endswith('date'):
+        if isinstance(value, str):
+            try:
+                value = dateutil.parser.parse(value).date()
+            except (TypeError, ValueError):
+                pass
+    if reverse and reverse.search(field):
+        value = -1 * Decimal(value)
+    if isinstance(model_instance_or_dict, dict):
+        model_instance_or_dict[field] = value
+    else:
+        setattr(model_instance_or_dict, field, value)
+
+
+def previous_load_data_into_model(model_instance, data, field_map=None, value_map=None, as_dict=False, reverse=None):
+    """load_data_into_model before mapping plans, which looked up every field's mapping for every row"""
+    fields = [field.name for field in model_instance._meta.get_fields()]
+    mod = {} if as_dict else model_instance
+    for field in fields:
+        if field == 'data_source':
+            previous_store_value(mod, field, 'DBR', reverse)
+        broker_field = settings.LONG_TO_TERSE_LABELS.get(field, field)
+        sts = False
+        if value_map:
+            if broker_field in value_map:
+                previous_store_value(mod, field, value_map[broker_field], reverse)
+                sts = True
+            elif field in value_map:
+                previous_store_value(mod, field, value_map[field], reverse)
+                sts = True
+        if field_map and not sts:
+            if broker_field in field_map:
+                try:
+                    previous_store_value(mod, field, data[field_map[broker_field]], reverse)
+                    sts = True
+                except KeyError:
+                    pass
+            elif field in field_map:
+                previous_store_value(mod, field, data[field_map[field]], reverse)
+                sts = True
+        if broker_field in data and not sts:
+            previous_store_value(mod, field, data[broker_field], reverse)
+        elif field in data and not sts:
+            previous_store_value(mod, field, data[field], reverse)
+    return mod if as_dict else model_instance
+
+
+def sample_rows(count):
+    """Broker FPDS rows: a column per TransactionFPDS field and place of performance column, some of them empty"""
+    columns = [field.name for field in TransactionFPDS._meta.concrete_fields] + list(pop_field_map.values())
+    rows = []
+    for _ in range(count):
+        row = {}
+        for column in columns:
+            if random.random() < 0.3:
+                row[column] = None
+            elif column.endswith('date'):
+                row[column] = '20{:02d}-{:02d}-{:02d} 00:00:00'.format(
+                    random.randint(8, 18), random.randint(1, 12), random.randint(1, 28))
+            else:
+                row[column] = 'VALUE {}'.format(random.randint(0, 10 ** 6))
+        rows.append(row)
+    return rows
+
+
+def load_rows(load, rows):
+    for row in rows:
+        load(TransactionFPDS(), row, as_dict=True)
+        load(Location(), row, field_map=pop_field_map, value_map={'place_of_performance_flag': True}, as_dict=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='Broker rows loaded')
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    for name, load in (('per row', previous_load_data_into_model), ('plan', load_data_into_model)):
+        seconds = timeit.timeit(lambda: load_rows(load, rows), number=1)
+        print('{:<8} {:.1f} s, {:.0f} rows/s ({:.1f} us each)'.format(
+            name, seconds, args.rows / seconds, seconds / args.rows * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from psycopg2.extras import Json
+
+from usaspending_api.etl.copy_helpers import LineReader, copy_rows, format_copy_value
+from usaspending_api.references.models import LegalEntity, Location
+
+
+def test_format_copy_value():
+    assert format_copy_value(None) == '\\N'
+    assert format_copy_value('') == ''
+    assert format_copy_value(True) == 't'
+    assert format_copy_value(Decimal('1.50')) == '1.50'
+    assert format_copy_value(date(2018, 1, 2)) == '2018-01-02'
+    assert format_copy_value('a\tb\nc\\d') == 'a\\tb\\nc\\\\d'
+    assert format_copy_value(['a', 'b "c"', None]) == '{"a","b \\\\"c\\\\"",NULL}'
+    assert format_copy_value(Json({'a': 1})) == '{"a": 1}'
+
+
+def test_line_reader():
+    reader = LineReader(iter(['abc\n', 'de\n', 'f\n']))
+
+    assert reader.read(5) == 'abc\nd'
+    assert reader.read(5) == 'e\nf\n'
+    assert reader.read(5) == ''
+
+
+@pytest.mark.django_db
+def test_copy_rows_returns_pks_for_foreign_keys():
+    locations = [Location(city_name='WASHINGTON'), {'city_name': 'TAB\tCITY', 'state_code': None}]
+
+    location_ids = copy_rows(Location, locations)
+
+    assert location_ids[0] == locations[0].location_id
+    assert location_ids[1] == locations[1]['location_id']
+    assert Location.objects.get(location_id=location_ids[1]).city_name == 'TAB\tCITY'
+
+    legal_entity = LegalEntity(recipient_name='', location=locations[0], business_categories=['small_business'])
+    copy_rows(LegalEntity, [legal_entity])
+
+    legal_entity = LegalEntity.objects.get(legal_entity_id=legal_entity.legal_entity_id)
+    assert legal_entity.location.city_name == 'WASHINGTON'
+    assert legal_entity.recipient_name == ''
+    assert legal_entity.business_categories == ['small_business']
+    assert legal_entity.create_date is not None
+
+    # The sequence keeps counting after the copied rows
+    assert Location.objects.create().location_id > max(location_ids)
@@ -0,0 +1,121 @@
+import json
+from unittest.mock import Mock
+
+import pandas as pd
+
+from usaspending_api.etl import es_etl_helpers
+
+
+def test_csv_doc_gen(tmpdir):
+    csv_file = tmpdir.join('transactions.csv')
+    csv_file.write('generated_unique_transaction_id,piid,transaction_amount,action_date\n'
+                   'CONT_TX_1,ABC,10.00,2018-01-31\n'
+                   'CONT_TX_2,,5.50,not a date\n'
+                   'CONT_TX_3,DEF,1,2018-02-01\n')
+
+    bodies = list(es_etl_helpers.csv_doc_gen(str(csv_file), None, rows=2))
+
+    assert len(bodies) == 2
+    lines = ''.join(bodies).splitlines()
+    assert [json.loads(line)['index']['_id'] for line in lines[0::2]] == ['CONT_TX_1', 'CONT_TX_2', 'CONT_TX_3']
+    assert json.loads(lines[1]) == {'generated_unique_transaction_id': 'CONT_TX_1', 'piid': 'ABC',
+                                    'transaction_amount': 10.0, 'action_date': '2018-01-31'}
+    doc = json.loads(lines[3])
+    assert (doc['piid'], doc['transaction_amount'], doc['action_date']) == (None, 5.5, None)
+
+
+def test_parallel_post_to_es_sends_every_body():
+    client = Mock()
+    client.bulk.side_effect = lambda body, **kwargs: {
+        'items': [{'index': {'status': 400, 'error': {}} if doc == 'bad' else {'status': 201}} for doc in body]
+    }
+
+    bodies = (['ok'] * 4 if i != 3 else ['ok', 'bad'] for i in range(5))
+    success, failed = es_etl_helpers.parallel_post_to_es(client, bodies, 'index', thread_count=2)
+
+    assert (success, failed) == (17, 1)
+    assert client.bulk.call_count == 5
+    assert {call[1]['index'] for call in client.bulk.call_args_list} == {'index'}
+
+
+def test_csv_chunk_gen_casts_columns(tmpdir):
+    csv_file = tmpdir.join('transactions.csv')
+    csv_file.write('generated_unique_transaction_id,piid,transaction_amount,transaction_fiscal_year,action_date,'
+                   'update_date\n'
+                   'CONT_TX_1,"A ""B"" C",10.00,2018,2018-01-31,2018-02-01 00:00:00+00\n'
+                   'CONT_TX_2,,5.5,2018,not a date,\n')
+
+    chunk = next(es_etl_helpers.csv_chunk_gen(str(csv_file), 10, None))
+    bodies = list(es_etl_helpers.bulk_ndjson(chunk, rows=1))
+
+    assert len(bodies) == 2
+    action, doc = bodies[0].splitlines()
+    assert action == '{"index":{"_id":"CONT_TX_1"}}'
+    assert json.loads(doc) == {
+        'generated_unique_transaction_id': 'CONT_TX_1',
+        'piid': 'A "B" C',
+        'transaction_amount': 10.0,
+        'transaction_fiscal_year': 2018,
+        'action_date': '2018-01-31',
+        'update_date': 1517443200000,
+    }
+    doc = json.loads(bodies[1].splitlines()[1])
+    assert (doc['piid'], doc['transaction_amount'], doc['action_date'], doc['update_date']) == (None, 5.5, None, None)
+
+
+def test_bulk_ndjson_separates_records():
+    chunk = pd.DataFrame({'generated_unique_transaction_id': ['ASST_TX_1', 'ASST_TX_"2"'],
+                          'award_description': ['},{"', 'two'],
+                          'transaction_amount': [1.0, None]},
+                         columns=['generated_unique_transaction_id', 'award_description', 'transaction_amount'])
+
+    body = next(es_etl_helpers.bulk_ndjson(chunk))
+
+    assert body.endswith('\n')
+    lines = body.splitlines()
+    assert [json.loads(line) for line in lines[0::2]] == [{'index': {'_id': 'ASST_TX_1'}},
+                                                          {'index': {'_id': 'ASST_TX_"2"'}}]
+    assert [json.loads(line) for line in lines[1::2]] == [
+        {'generated_unique_transaction_id': 'ASST_TX_1', 'award_description': '},{"', 'transaction_amount': 1.0},
+        {'generated_unique_transaction_id': 'ASST_TX_"2"', 'award_description': 'two', 'transaction_amount': None},
+    ]
+
+
+def test_bulk_ndjson_value_ending_in_record_separator():
+    chunk = pd.DataFrame({'generated_unique_transaction_id': ['ASST_TX_1', 'ASST_TX_2', 'ASST_TX_3'],
+                          'award_description': ['x},{', 'two', 'three'],
+                          'piid': ['A', 'B', 'C']},
+                         columns=['generated_unique_transaction_id', 'award_description', 'piid'])
+
+    lines = next(es_etl_helpers.bulk_ndjson(chunk)).splitlines()
+
+    assert len(lines) == 6
+    for action, doc in zip(lines[0::2], lines[1::2]):
+        assert json.loads(action)['index']['_id'] == json.loads(doc)['generated_unique_transaction_id']
+    assert json.loads(lines[1])['award_description'] == 'x},{'
+
+
+def test_delete_transactions_from_es_deletes_from_every_index():
+    client = Mock()
+    client.delete_by_query.side_effect = [{'deleted': 2}, {'deleted': 0}]
+
+    deleted = es_etl_helpers.delete_transactions_from_es(client, {'CONT_TX_2', 'ASST_TX_1', 'CONT_TX_1'},
+                                                         {'root_index': 'transactions'}, rows=2)
+
+    assert deleted == 2
+    assert [call[1]['index'] for call in client.delete_by_query.call_args_list] == ['transactions-*'] * 2
+    assert [call[1]['body'] for call in client.delete_by_query.call_args_list] == [
+        {'query': {'ids': {'values': ['ASST_TX_1', 'CONT_TX_1']}}},
+        {'query': {'ids': {'values': ['CONT_TX_2']}}},
+    ]
+
+
+def test_streaming_post_to_es_counts_errors():
+    client = Mock()
+    client.bulk.side_effect = [
+        {'items': [{'index': {'status': 201}}, {'index': {'status': 400, 'error': {'type': 'parse'}}}]},
+        {'items': [{'delete': {'status': 404, 'result': 'not_found'}}]},
+    ]
+
+    assert es_etl_helpers.streaming_post_to_es(client, ['body 1', 'body 2'], 'index') == (2, 1)
+    client.bulk.assert_called_with(body='body 2', index='index', doc_type='transaction_mapping')
@@ -0,0 +1,61 @@
+import re
+from datetime import date
+from decimal import Decimal
+
+import dateutil.parser
+import pytest
+
+from usaspending_api.etl.management.load_base import load_data_into_model, mapping_plan, parse_date_string
+from usaspending_api.references.models import Location
+
+
+@pytest.mark.parametrize('date_string', [
+    '2017-01-31', '2017-01-31 12:30:00', '2017-01-31T12:30:00Z', '01/31/2017', '13/01/2017', '20170131',
+    'January 31, 2017', '2017-1-5'
+])
+def test_parse_date_string_reads_dates_as_dateutil_does(date_string):
+    assert parse_date_string(date_string) == dateutil.parser.parse(date_string).date()
+
+
+@pytest.mark.parametrize('date_string', ['', '2017-02-30', 'not a date'])
+def test_parse_date_string_invalid(date_string):
+    with pytest.raises(ValueError):
+        parse_date_string(date_string)
+
+
+def test_load_data_into_model_precedence():
+    row = {'city_name': 'FROM DATA', 'state': 'FROM FIELD MAP', 'state_code': 'FROM DATA', 'zip5': 'FROM DATA',
+           'city_code': None, 'certified_date': '2017-01-31 00:00:00', 'last_modified_date': 'bad date'}
+    field_map = {'state_code': 'state', 'zip5': 'zip', 'county_name': 'county'}
+    value_map = {'zip5': 'FROM VALUE MAP', 'recipient_flag': True}
+
+    location = load_data_into_model(Location(), row, field_map=field_map, value_map=value_map, as_dict=True)
+
+    assert location == {
+        'data_source': 'DBR', 'city_name': 'FROM DATA', 'state_code': 'FROM FIELD MAP', 'zip5': 'FROM VALUE MAP',
+        'recipient_flag': True, 'certified_date': date(2017, 1, 31), 'last_modified_date': 'bad date'
+    }
+
+    # Columns of the field map missing from the row fall back to the row's own columns
+    location = load_data_into_model(Location(), {'state_code': 'FROM DATA'}, field_map=field_map)
+    assert location.state_code == 'FROM DATA'
+    assert location.county_name is None
+
+
+def test_load_data_into_model_reverse():
+    location = load_data_into_model(Location(), {'zip5': '20001', 'zip4': '1234'}, reverse=re.compile('^zip5$'),
+                                    as_dict=True)
+
+    assert location['zip5'] == Decimal('-20001')
+    assert location['zip4'] == '1234'
+
+
+def test_mapping_plan_is_built_once_per_mapping():
+    field_map = {'state_code': 'state'}
+    load_data_into_model(Location(), {'state': 'VA'}, field_map=field_map, value_map={'zip5': '1'})
+    hits = mapping_plan.cache_info().hits
+
+    location = load_data_into_model(Location(), {'state': 'MD'}, field_map=dict(field_map), value_map={'zip5': '2'})
+
+    assert mapping_plan.cache_info().hits == hits + 1
+    assert (location.state_code, location.zip5) == ('MD', '2')
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+import pytest
+
+from usaspending_api.etl.matview_build_helpers import BuildStep, load_specs, plan_matview_build, run_steps
+
+
+def make_spec(name, sql, indexes=('pk',)):
+    return {
+        'final_name': name,
+        'matview_sql': ['SELECT', '  id', 'FROM', '  ' + sql],
+        'indexes': [{'name': index, 'columns': [{'name': 'id'}]} for index in indexes],
+    }
+
+
+def test_plan_matview_build_orders_steps():
+    specs = OrderedDict([('view_a', make_spec('view_a', 'awards', indexes=('pk', 'type')))])
+    steps, swap_sql = plan_matview_build(specs)
+
+    assert list(steps) == ['view_a:drops', 'view_a:create', 'view_a:index:pk', 'view_a:index:type', 'view_a:ready']
+    assert steps['view_a:create'].depends_on == ['view_a:drops']
+    assert steps['view_a:index:type'].depends_on == ['view_a:create']
+    assert steps['view_a:ready'].depends_on == ['view_a:index:pk', 'view_a:index:type']
+    assert steps['view_a:create'].sql[0].startswith('CREATE MATERIALIZED VIEW view_a_temp AS')
+    assert swap_sql[0] == 'ALTER MATERIALIZED VIEW IF EXISTS view_a RENAME TO view_a_old;'
+    assert 'ALTER MATERIALIZED VIEW view_a_temp RENAME TO view_a;' in swap_sql
+
+
+def test_plan_matview_build_selects_from_new_matviews():
+    specs = OrderedDict([
+        ('view_b', make_spec('view_b', 'view_a_other JOIN view_a ON true')),
+        ('view_a', make_spec('view_a', 'awards')),
+    ])
+    steps, swap_sql = plan_matview_build(specs)
+
+    assert steps['view_b:create'].depends_on == ['view_b:drops', 'view_a:ready']
+    assert 'view_a_other JOIN view_a_temp ON true' in steps['view_b:create'].sql[0]
+
+
+def test_load_specs():
+    specs = load_specs(['summary_view'])
+
+    assert list(specs) == ['summary_view']
+    assert load_specs()['universal_transaction_matview']['indexes']
+
+
+def test_run_steps_respects_dependencies_and_parallelism():
+    steps = OrderedDict((step.name, step) for step in [
+        BuildStep('create', ['create']),
+        BuildStep('index_1', ['index'], ['create']),
+        BuildStep('index_2', ['index'], ['create']),
+        BuildStep('ready', ['ready'], ['index_1', 'index_2']),
+    ])
+    lock = threading.Lock()
+    started, running, most_running = [], [0], [0]
+
+    def execute(step):
+        with lock:
+            started.append(step.name)
+            running[0] += 1
+            most_running[0] = max(most_running[0], running[0])
+        with lock:
+            running[0] -= 1
+
+    timings = run_steps(steps, execute, max_parallel=2)
+
+    assert set(timings) == set(steps)
+    assert started[0] == 'create'
+    assert started[-1] == 'ready'
+    assert most_running[0] <= 2
+
+
+def test_run_steps_stops_after_failure():
+    steps = OrderedDict((step.name, step) for step in [
+        BuildStep('create', ['create']),
+        BuildStep('index', ['index'], ['create']),
+    ])
+    started = []
+
+    def execute(step):
+        started.append(step.name)
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        run_steps(steps, execute, max_parallel=2)
+    assert started == ['create']
@@ -0,0 +1,53 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from psycopg2.extras import execute_values
+
+from usaspending_api.references.models import Location
+
+logger = logging.getLogger('console')
+
+UPDATE_HASHES_SQL = """
+    UPDATE references_location AS rl
+    SET    location_hash = hashes.location_hash
+    FROM   (VALUES %s) AS hashes (location_id, location_hash)
+    WHERE  rl.location_id = hashes.location_id"""
+
+
+def backfill_location_hashes(batch_size=10000, recompute=False):
+    """
+    Sets location_hash to content_hash() for Locations without one, such as rows created before the column existed or
+    changed by a raw SQL fix, which clears it. Returns the number of Locations hashed
+    """
+    locations = Location.objects.order_by('location_id')
+    if not recompute:
+        locations = locations.filter(location_hash__isnull=True)
+
+    hashed = 0
+    last_location_id = 0
+    with connection.cursor() as cursor:
+        while True:
+            batch = list(locations.filter(location_id__gt=last_location_id)[:batch_size])
+            if not batch:
+                break
+            execute_values(cursor.cursor, UPDATE_HASHES_SQL,
+                           [(location.location_id, location.content_hash()) for location in batch],
+                           page_size=batch_size)
+            hashed += len(batch)
+            last_location_id = batch[-1].location_id
+    return hashed
+
+
+class Command(BaseCommand):
+    help = 'Sets the location_hash of Locations which have none, so the bulk loaders can reuse them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=10000, help='Locations hashed per query')
+        parser.add_argument('--all', action='store_true', help='Recompute the hash of every Location')
+
+    def handle(self, *args, **options):
+        start = time.time()
+        hashed = backfill_location_hashes(options['batch'], recompute=options['all'])
+        logger.info('Hashed {} Locations in {} seconds'.format(hashed, time.time() - start))
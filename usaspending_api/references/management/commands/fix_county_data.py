@@ -3,6 +3,8 @@ import logging
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from usaspending_api.references.management.commands.backfill_location_hashes import backfill_location_hashes
+
 logger = logging.getLogger('console')
 
 
@@ -259,7 +261,8 @@ class Command(BaseCommand):
                 SET county_code = tc.county_code,
                     county_name = CASE WHEN rl.county_name IS NULL
                                         THEN tc.county_name
-                                        ELSE rl.county_name END
+                                        ELSE rl.county_name END,
+                    location_hash = NULL
                 FROM transaction_combined AS tc
                 WHERE tc.location_id = rl.location_id
                     AND rl.county_code IS NULL
@@ -286,7 +289,8 @@ class Command(BaseCommand):
                 SET county_code = tc.county_code,
                     county_name = CASE WHEN rl.county_name IS NULL
                                         THEN tc.county_name
-                                        ELSE rl.county_name END
+                                        ELSE rl.county_name END,
+                    location_hash = NULL
                 FROM transaction_combined AS tc
                 WHERE tc.location_id = rl.location_id
                     AND rl.county_code IS NULL
@@ -311,7 +315,8 @@ class Command(BaseCommand):
                 SET county_code = tc.county_code,
                     county_name = CASE WHEN rl.county_name IS NULL
                                         THEN tc.county_name
-                                        ELSE rl.county_name END
+                                        ELSE rl.county_name END,
+                    location_hash = NULL
                 FROM transaction_combined AS tc
                 WHERE tc.place_of_performance_id = rl.location_id
                     AND rl.county_code IS NULL
@@ -336,14 +341,20 @@ class Command(BaseCommand):
                 SET county_code = tc.county_code,
                     county_name = CASE WHEN rl.county_name IS NULL
                                         THEN tc.county_name
-                                        ELSE rl.county_name END
+                                        ELSE rl.county_name END,
+                    location_hash = NULL
                 FROM transaction_combined AS tc
                 WHERE tc.place_of_performance_id = rl.location_id
                     AND rl.county_code IS NULL
                     AND UPPER(rl.location_country_code) = 'USA'"""
         )
 
-        logger.info("Finished FPDS PPOP location updates, finished location updates")
+        logger.info("Finished FPDS PPOP location updates, rehashing the updated locations")
+
+        # The updated Locations' hashes were cleared, as they can only be computed by the model
+        backfill_location_hashes()
+
+        logger.info("Rehashed the updated locations, finished location updates")
 
     def add_arguments(self, parser):
         parser.add_argument('-mv', '--matview', help='Create the matviews, make sure they do not already exist',
@@ -4,6 +4,8 @@ import time
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from usaspending_api.references.management.commands.backfill_location_hashes import backfill_location_hashes
+
 
 class Command(BaseCommand):
     help = 'One-time fixer to fill missing location.zip5 from zip4'
@@ -29,7 +31,8 @@ class Command(BaseCommand):
           LIMIT {limit}
        )
        UPDATE references_location rl
-       SET    zip5 = SUBSTRING(zip4 FROM '{regexp}')
+       SET    zip5 = SUBSTRING(zip4 FROM '{regexp}'),
+              location_hash = NULL
        FROM   target_ids
        WHERE  rl.location_id = target_ids.location_id;
     """.format(
@@ -52,5 +55,7 @@ class Command(BaseCommand):
                 elapsed = time.time() - start_time
                 self.logger.info('Batch of <= {} fixed in {} seconds'.format(
                     self.LIMIT, elapsed))
+        # The fixed Locations' hashes were cleared, as they can only be computed by the model
+        backfill_location_hashes()
         overall_elapsed = time.time() - overall_start_time
         self.logger.info('Finished in {} seconds'.format(overall_elapsed))
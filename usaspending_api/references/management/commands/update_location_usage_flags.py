@@ -3,6 +3,7 @@ import logging
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 
+from usaspending_api.references.management.commands.backfill_location_hashes import backfill_location_hashes
 from usaspending_api.references.models import Location, LegalEntity
 from usaspending_api.awards.models import Award
 from usaspending_api.awards.models import TransactionNormalized
@@ -19,8 +20,8 @@ class Command(BaseCommand):
         # greatly reduce readability
         q1 = Q(location_id__in=LegalEntity.objects.values('location'))
 
-        Location.objects.filter(q1).update(recipient_flag=True)
-        Location.objects.filter(~q1).update(recipient_flag=False)
+        Location.objects.filter(q1).exclude(recipient_flag=True).update(recipient_flag=True, location_hash=None)
+        Location.objects.filter(~q1).exclude(recipient_flag=False).update(recipient_flag=False, location_hash=None)
 
         # Locations have a pop flag if the number of the following models referencing them
         # is greater than or equal to 1
@@ -30,5 +31,10 @@ class Command(BaseCommand):
 
         final_q = q1 | q2
 
-        Location.objects.filter(final_q).update(place_of_performance_flag=True)
-        Location.objects.filter(~final_q).update(place_of_performance_flag=False)
+        Location.objects.filter(final_q).exclude(place_of_performance_flag=True) \
+            .update(place_of_performance_flag=True, location_hash=None)
+        Location.objects.filter(~final_q).exclude(place_of_performance_flag=False) \
+            .update(place_of_performance_flag=False, location_hash=None)
+
+        # The flags are part of a Location's hash, so those changed are rehashed
+        backfill_location_hashes()
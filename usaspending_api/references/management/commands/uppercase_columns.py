@@ -3,6 +3,8 @@ import logging
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from usaspending_api.references.management.commands.backfill_location_hashes import backfill_location_hashes
+
 logger = logging.getLogger('console')
 
 
@@ -16,6 +18,10 @@ class Command(BaseCommand):
                 logger.info("Updating {} table columns".format(table))
                 db_cursor.execute(sql_string)
 
+            # The updated Locations' hashes were cleared, as they can only be computed by the model
+            logger.info("Rehashing updated references_location rows")
+            backfill_location_hashes()
+
             logger.info("Completed uppercase fixes")
 
 
@@ -120,7 +126,8 @@ UPPERCASE_UPDATES = {
             city_name = UPPER(city_name),
             address_line1 = UPPER(address_line1),
             congressional_code = UPPER(congressional_code),
-            zip4 = UPPER(zip4)
+            zip4 = UPPER(zip4),
+            location_hash = NULL
         WHERE create_date >= '2018-02-08'
             AND create_date <= '2018-02-23'
             AND (UPPER(transaction_unique_id) != transaction_unique_id
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.4 on 2018-03-12 14:08
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('references', '0013_create_recipient_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='location',
+            name='location_hash',
+            field=models.TextField(blank=True, null=True, db_index=True),
+        ),
+    ]
@@ -1,6 +1,11 @@
+import contextlib
+import hashlib
+import json
 import logging
 import re
 
+from collections import OrderedDict
+
 from django.db import models
 from django.db.models import F, Q
 from django.utils.text import slugify
@@ -11,6 +16,100 @@ from usaspending_api.references.abbreviations import code_to_state, state_to_cod
 from usaspending_api.references.helpers import canonicalize_string
 
 
+class CityCountyIndex:
+    """
+    In-memory RefCityCountyCode lookup answering the filters of Location.load_city_county_data(). There is a dict per
+    combination of filtered fields, built from the rows the first time that combination is looked up
+    """
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.lookups = {}
+
+    def find(self, filters):
+        fields = tuple(sorted(filters))
+        lookup = self.lookups.get(fields)
+        if lookup is None:
+            lookup = self.lookups[fields] = self.build_lookup(fields)
+        return lookup.get(tuple(filters[field] for field in fields), (None, 0))
+
+    def build_lookup(self, fields):
+        """Maps the values of the fields to the first row having them and how many rows do"""
+        lookup = {}
+        for row in self.rows:
+            key = tuple(row[field] for field in fields)
+            first, count = lookup.get(key, (row, 0))
+            lookup[key] = (first, count + 1)
+        return lookup
+
+
+class LocationRegistry:
+    """
+    location_ids of Locations keyed on their content_hash(), for loaders to point rows at an existing Location rather
+    than inserting a duplicate. The most recently used hashes are kept in a bounded LRU, and the rest are looked up on
+    the indexed location_hash column
+    """
+
+    MAX_ENTRIES = 100000
+    LOOKUP_BATCH_SIZE = 10000
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.location_ids = OrderedDict()
+
+    def get(self, location_hash):
+        location_id = self.location_ids.get(location_hash)
+        if location_id is not None:
+            self.location_ids.move_to_end(location_hash)
+        return location_id
+
+    def add(self, location_hash, location_id):
+        self.location_ids[location_hash] = location_id
+        self.location_ids.move_to_end(location_hash)
+        while len(self.location_ids) > self.max_entries:
+            self.location_ids.popitem(last=False)
+
+    def lookup(self, location_hashes):
+        """Adds the location_ids of existing Locations having the hashes, one per hash"""
+        location_hashes = list(location_hashes)
+        for start in range(0, len(location_hashes), self.LOOKUP_BATCH_SIZE):
+            batch = location_hashes[start:start + self.LOOKUP_BATCH_SIZE]
+            existing = Location.objects.filter(location_hash__in=batch).order_by('location_id'). \
+                values_list('location_hash', 'location_id')
+            for location_hash, location_id in existing:
+                if location_hash not in self.location_ids:
+                    self.add(location_hash, location_id)
+
+    def resolve(self, locations):
+        """
+        Hashes the unsaved Locations and points those matching an existing Location at it. Locations repeated within
+        the list are replaced by their first occurrence, so the list keeps its positions. Returns the first
+        occurrences of Locations which don't exist yet, for the caller to insert and then remember()
+        """
+        for location in locations:
+            location.location_hash = location.content_hash()
+        self.lookup({location.location_hash for location in locations
+                     if location.location_hash not in self.location_ids})
+
+        new_locations = OrderedDict()
+        for position, location in enumerate(locations):
+            location_hash = location.location_hash
+            if location_hash in new_locations:
+                locations[position] = new_locations[location_hash]
+                continue
+            location_id = self.get(location_hash)
+            if location_id is None:
+                new_locations[location_hash] = location
+            else:
+                location.location_id = location_id
+                location._state.adding = False
+        return list(new_locations.values())
+
+    def remember(self, locations):
+        for location in locations:
+            self.add(location.location_hash, location.location_id)
+
+
 class RefCityCountyCode(models.Model):
     city_county_code_id = models.AutoField(primary_key=True)
     state_code = models.TextField(blank=True, null=True)
@@ -29,6 +128,40 @@ class RefCityCountyCode(models.Model):
         managed = True
         db_table = 'ref_city_county_code'
 
+    # Fields filtered on and filled in by Location.load_city_county_data()
+    LOCATION_FIELDS = ('city_code', 'county_code', 'state_code', 'city_name', 'county_name')
+
+    # Process-wide CityCountyIndex, while a load runs within indexed()
+    index = None
+
+    @classmethod
+    @contextlib.contextmanager
+    def indexed(cls):
+        """
+        Loads every row once, for find_unique() to answer from memory instead of querying for each Location of a
+        load. Rows changed while it's loaded aren't seen
+        """
+        if cls.index is not None:
+            # Already loaded by the load this one is part of
+            yield cls.index
+            return
+        cls.index = CityCountyIndex(cls.objects.values(*cls.LOCATION_FIELDS))
+        try:
+            yield cls.index
+        finally:
+            cls.index = None
+
+    @classmethod
+    def find_unique(cls, filters):
+        """Returns the LOCATION_FIELDS of the first row matching the filters and the number of rows which match"""
+        if cls.index is not None:
+            return cls.index.find(filters)
+        matched_reference = cls.objects.filter(Q(**filters))
+        count = matched_reference.count()
+        if count == 1:
+            return matched_reference.values(*cls.LOCATION_FIELDS).first(), count
+        return None, count
+
     @classmethod
     def canonicalize(cls):
         """
@@ -266,6 +399,12 @@ class Location(DataSourceTrackedModel, DeleteIfChildlessMixin):
     is_fpds = models.BooleanField(blank=False, null=False, default=False, verbose_name="Is FPDS")
     transaction_unique_id = models.TextField(blank=False, null=False, default="NONE",
                                              verbose_name="Transaction Unique ID")
+    # content_hash() as of the last save, to find an identical Location
+    location_hash = models.TextField(blank=True, null=True, db_index=True)
+
+    # Fields left out of content_hash(): the key and bookkeeping of the row rather than the location itself
+    UNHASHED_FIELDS = ('location_id', 'location_hash', 'reporting_period_start', 'reporting_period_end',
+                       'last_modified_date', 'certified_date', 'create_date', 'update_date')
 
     def pre_save(self):
         self.load_city_county_data()
@@ -274,8 +413,15 @@ class Location(DataSourceTrackedModel, DeleteIfChildlessMixin):
 
     def save(self, *args, **kwargs):
         self.pre_save()
+        self.location_hash = self.content_hash()
         super(Location, self).save(*args, **kwargs)
 
+    def content_hash(self):
+        """MD5 of the location's canonicalized fields, which are the same for Locations differing only in bookkeeping"""
+        values = [field.get_prep_value(getattr(self, field.attname)) for field in self._meta.concrete_fields
+                  if field.name not in self.UNHASHED_FIELDS]
+        return hashlib.md5(json.dumps(values).encode('utf-8')).hexdigest()
+
     def fill_missing_state_data(self):
         """Fills in blank US state names or codes from its counterpart"""
 
@@ -335,20 +481,19 @@ class Location(DataSourceTrackedModel, DeleteIfChildlessMixin):
             if not q_kwargs:
                 return
 
-            matched_reference = RefCityCountyCode.objects.filter(Q(**q_kwargs))
+            matched_reference, count = RefCityCountyCode.find_unique(q_kwargs)
             # We only load the data if our matched reference count is one; otherwise,
             # we don't have data (count=0) or the match is ambiguous (count>1)
-            if matched_reference.count() == 1:
+            if count == 1:
                 # Load this data
-                matched_reference = matched_reference.first()
-                self.city_code = matched_reference.city_code
-                self.county_code = matched_reference.county_code
-                self.state_code = matched_reference.state_code
-                self.city_name = matched_reference.city_name
-                self.county_name = matched_reference.county_name
+                self.city_code = matched_reference['city_code']
+                self.county_code = matched_reference['county_code']
+                self.state_code = matched_reference['state_code']
+                self.city_name = matched_reference['city_name']
+                self.county_name = matched_reference['county_name']
             else:
                 logging.getLogger('debug').info("Could not find single matching city/county for following arguments:" +
-                                                str(q_kwargs) + "; got " + str(matched_reference.count()))
+                                                str(q_kwargs) + "; got " + str(count))
 
 
 class LegalEntity(DataSourceTrackedModel):
@@ -0,0 +1,79 @@
+"""
+Times Location.load_city_county_data over a synthetic load of US locations, answered from a CityCountyIndex of
+synthetic reference rows, against the previous queries per location.
+
+    python -m usaspending_api.references.tests.benchmark_city_county_index [--locations 1000000] [--query-sample 2000]
+
+Querying a million locations takes hours, so the queries are timed for --query-sample locations against the
+ref_city_county_code table of DATABASE_URL and extrapolated. Pass --query-sample 0 to skip them.
+"""
+import argparse
+import django
+import os
+import random
+import timeit
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+from usaspending_api.references.models import CityCountyIndex, Location, RefCityCountyCode  # noqa: E402
+
+STATES = ['VA', 'MD', 'DC', 'CA', 'TX', 'NY', 'FL', 'WA', 'OH', 'MN']
+
+
+def reference_rows(count):
+    return [{'city_code': '{:05d}'.format(row), 'county_code': '{:03d}'.format(row % 300),
+             'state_code': STATES[row % len(STATES)], 'city_name': 'CITY {}'.format(row // 2),
+             'county_name': 'COUNTY {}'.format(row % 300)}
+            for row in range(count)]
+
+
+def locations(count, rows):
+    """Locations filtered on the combinations loaders see: codes, names, or a mix, some of them ambiguous"""
+    result = []
+    for _ in range(count):
+        row = random.choice(rows)
+        choice = random.random()
+        if choice < 0.4:
+            fields = {'city_code': row['city_code'], 'county_code': row['county_code']}
+        elif choice < 0.8:
+            fields = {'city_name': row['city_name'], 'state_code': row['state_code']}
+        else:
+            fields = {'county_name': row['county_name'], 'state_code': row['state_code']}
+        result.append(Location(location_country_code='USA', **fields))
+    return result
+
+
+def fill(locations):
+    for location in locations:
+        location.load_city_county_data()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--locations', type=int, default=1000000, help='US locations loaded')
+    parser.add_argument('--reference-rows', type=int, default=40000, help='Synthetic RefCityCountyCode rows')
+    parser.add_argument('--query-sample', type=int, default=2000, help='Locations filled by querying the database')
+    args = parser.parse_args()
+
+    rows = reference_rows(args.reference_rows)
+    load = locations(args.locations, rows)
+
+    RefCityCountyCode.index = CityCountyIndex(rows)
+    try:
+        seconds = timeit.timeit(lambda: fill(load), number=1)
+    finally:
+        RefCityCountyCode.index = None
+    print('{:<10} {:.1f} s for {} locations ({:.1f} us each)'.format(
+        'index', seconds, args.locations, seconds / args.locations * 1e6))
+
+    if args.query_sample:
+        sample = locations(args.query_sample, rows)
+        seconds = timeit.timeit(lambda: fill(sample), number=1)
+        print('{:<10} {:.1f} s for {} locations, ~{:.0f} s extrapolated ({:.1f} us each)'.format(
+            'queries', seconds, args.query_sample, seconds / args.query_sample * args.locations,
+            seconds / args.query_sample * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,9 @@
+from django.core.management import call_command
 from model_mommy import mommy
 import pytest
 
 from usaspending_api.common.api_request_utils import GeoCompleteHandler
-from usaspending_api.references.models import Location, RefCityCountyCode
+from usaspending_api.references.models import CityCountyIndex, Location, LocationRegistry, RefCityCountyCode
 
 
 @pytest.mark.django_db
@@ -16,6 +17,91 @@ def test_location_reference_fill():
     assert location.state_code == city_county_code.state_code
 
 
+@pytest.mark.django_db
+def test_location_reference_fill_from_index():
+    city_county_code = mommy.make(
+        'references.RefCityCountyCode', city_code="A", county_code="B", _fill_optional=True)
+    mommy.make('references.RefCityCountyCode', city_code="C", county_code="D", state_code="VA", _quantity=2)
+
+    with RefCityCountyCode.indexed():
+        # Changes to the table aren't seen until the index is loaded again
+        RefCityCountyCode.objects.all().delete()
+        location = mommy.make(
+            'references.Location', location_country_code="USA", city_code="A", county_code="B")
+        ambiguous_location = mommy.make(
+            'references.Location', location_country_code="USA", county_code="D", state_code="VA")
+    assert RefCityCountyCode.index is None
+
+    assert location.city_name == city_county_code.city_name
+    assert location.county_name == city_county_code.county_name
+    assert location.state_code == city_county_code.state_code
+    assert ambiguous_location.city_code is None
+
+
+def test_city_county_index_matches_exactly_one_row():
+    rows = [
+        {'city_code': 'A', 'county_code': 'B', 'state_code': 'VA', 'city_name': 'ONE', 'county_name': 'FIRST'},
+        {'city_code': 'C', 'county_code': 'B', 'state_code': 'VA', 'city_name': 'TWO', 'county_name': 'FIRST'},
+    ]
+    index = CityCountyIndex(rows)
+
+    assert index.find({'city_code': 'A', 'county_code': 'B'}) == (rows[0], 1)
+    assert index.find({'county_code': 'B', 'state_code': 'VA'}) == (rows[0], 2)
+    assert index.find({'city_name': 'two'}) == (None, 0)
+
+
+@pytest.mark.django_db
+def test_location_content_hash():
+    location = mommy.make('references.Location', city_name='RESTON', state_code='VA', recipient_flag=True)
+    same = Location(city_name='RESTON', state_code='VA', recipient_flag=True, certified_date='2018-01-01')
+
+    assert location.location_hash == location.content_hash() == same.content_hash()
+    assert Location(city_name='RESTON', state_code='VA').content_hash() != same.content_hash()
+    assert Location(city_name='RESTON', state_code='VA', recipient_flag=True, zip5='').content_hash() != \
+        same.content_hash()
+
+
+@pytest.mark.django_db
+def test_location_registry_reuses_identical_locations():
+    existing = mommy.make('references.Location', city_name='RESTON', state_code='VA', recipient_flag=True)
+    locations = [Location(city_name='RESTON', state_code='VA', recipient_flag=True),
+                 Location(city_name='ARLINGTON', state_code='VA', recipient_flag=True),
+                 Location(city_name='ARLINGTON', state_code='VA', recipient_flag=True)]
+    registry = LocationRegistry(max_entries=1)
+
+    new_locations = registry.resolve(locations)
+
+    assert locations[0].location_id == existing.location_id
+    assert new_locations == [locations[1]]
+    assert locations[2] is locations[1]
+
+    new_locations[0].save()
+    registry.remember(new_locations)
+    assert registry.get(locations[1].location_hash) == locations[1].location_id
+    # Only the most recent hash is kept in memory, and the others are looked up again
+    assert registry.get(existing.location_hash) is None
+    assert registry.resolve([Location(city_name='RESTON', state_code='VA', recipient_flag=True)]) == []
+
+
+@pytest.mark.django_db
+def test_backfill_location_hashes():
+    locations = [mommy.make('references.Location', city_name='RESTON', state_code='VA') for _ in range(3)]
+    # As a raw SQL fix leaves them
+    Location.objects.filter(location_id__in=[locations[0].location_id, locations[1].location_id]) \
+        .update(city_name='ARLINGTON', location_hash=None)
+    Location.objects.filter(location_id=locations[2].location_id).update(location_hash='stale')
+
+    call_command('backfill_location_hashes', '--batch', '1')
+
+    backfilled = list(Location.objects.order_by('location_id'))
+    assert [location.location_hash for location in backfilled] == \
+        [backfilled[0].content_hash(), backfilled[0].content_hash(), 'stale']
+    assert backfilled[0].location_hash != locations[0].location_hash
+
+    call_command('backfill_location_hashes', '--all')
+    assert Location.objects.get(location_id=locations[2].location_id).location_hash == locations[2].location_hash
+
+
 @pytest.mark.django_db
 def test_location_state_fill():
     "Test populating missing state info"
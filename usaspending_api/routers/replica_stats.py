@@ -0,0 +1,72 @@
+import threading
+import time
+
+from contextlib import contextmanager
+
+# Weight given to the latest query when smoothing the latency of a database
+LATENCY_SMOOTHING = 0.2
+
+
+class DatabaseStats:
+    def __init__(self):
+        self.in_flight = 0
+        self.latency = None
+        self.lag = 0
+        self.lag_checked = None
+        self.checking_lag = False
+
+
+class ReplicaStats:
+    """
+    Per-process in-flight query counts, smoothed query latency and replication lag of each database alias, shared by
+    the threads of the process
+    """
+
+    def __init__(self, latency_smoothing=LATENCY_SMOOTHING):
+        self.latency_smoothing = latency_smoothing
+        self.databases = {}
+        self.lock = threading.Lock()
+
+    def get(self, alias):
+        with self.lock:
+            return self.databases.setdefault(alias, DatabaseStats())
+
+    @contextmanager
+    def track(self, alias):
+        stats = self.get(alias)
+        with self.lock:
+            stats.in_flight += 1
+        start = time.time()
+        try:
+            yield
+        finally:
+            latency = time.time() - start
+            with self.lock:
+                stats.in_flight -= 1
+                if stats.latency is None:
+                    stats.latency = latency
+                else:
+                    stats.latency += self.latency_smoothing * (latency - stats.latency)
+
+    def claim_lag_check(self, alias, interval):
+        """Whether the calling thread is to check the database's lag: one thread at a time, once per interval"""
+        stats = self.get(alias)
+        with self.lock:
+            if stats.checking_lag or (stats.lag_checked is not None and time.time() - stats.lag_checked < interval):
+                return False
+            stats.checking_lag = True
+            return True
+
+    def finish_lag_check(self, alias, lag):
+        stats = self.get(alias)
+        with self.lock:
+            stats.lag = lag
+            stats.lag_checked = time.time()
+            stats.checking_lag = False
+
+    def clear(self):
+        with self.lock:
+            self.databases.clear()
+
+
+replica_stats = ReplicaStats()
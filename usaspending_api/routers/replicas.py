@@ -1,7 +1,13 @@
+import logging
+import psycopg2
 import random
 
+from django.conf import settings
+from django.db import connections
+
 from usaspending_api.references.models import FilterHash
 from usaspending_api.download.models import DownloadJob
+from usaspending_api.routers.replica_stats import replica_stats
 
 """
 The USAspending API is a *mostly* readonly application. This
@@ -9,27 +15,111 @@ router is used to balance loads between multiple databases
 defined by the environment variables in settings.py, and
 handle the models that are *not* readonly appropriately.
 
-It splits requests among two databases but you can add more.
+Reads are split among any number of weighted read replicas
+(DB_R1, DB_R2, ...) and, unless its read weight is 0, the
+source database. Each database's weight is divided by its
+in-flight queries and recent latency, and replicas lagging
+behind the source are left out until they catch up.
+"""
+
+logger = logging.getLogger('console')
+
+SOURCE_DATABASE = 'db_source'
+
+# Floor of each database's latency, so that a few very fast queries can't starve the others of reads
+MIN_LATENCY = 0.01
+
+# Seconds since the last replayed transaction, or 0 if everything received has been replayed (an idle source)
+REPLICATION_LAG_SQL = """
+SELECT CASE
+    WHEN pg_last_xlog_receive_location() = pg_last_xlog_replay_location() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
 """
 
 
 class ReadReplicaRouter(object):
 
+    def __init__(self):
+        self.replica_weights = settings.DATABASE_REPLICA_WEIGHTS
+        self.read_weights = dict(self.replica_weights)
+        if settings.DB_SOURCE_READ_WEIGHT > 0:
+            self.read_weights[SOURCE_DATABASE] = settings.DB_SOURCE_READ_WEIGHT
+        self.max_lag = settings.REPLICA_MAX_LAG_SECONDS
+        self.lag_check_interval = settings.REPLICA_LAG_CHECK_INTERVAL
+
     def db_for_read(self, model, **hints):
         # these are the only models we write to; to deal with replication lag just get them from the source db
         if model in [FilterHash, DownloadJob]:
-            return 'db_source'
-        return random.choice(['db_source', 'db_r1'])
+            return SOURCE_DATABASE
+        weights = {alias: weight for alias, weight in self.read_weights.items() if self.is_healthy(alias)}
+        # Fall back to the source when every replica is down or lagging
+        return choose_database(weights) or SOURCE_DATABASE
 
     def db_for_write(self, model, **hints):
         # write to source db only (bc read replicas)
-        return 'db_source'
+        return SOURCE_DATABASE
 
     def allow_relation(self, obj1, obj2, **hints):
-        db_list = ('db_source', 'db_r1')
+        db_list = [SOURCE_DATABASE] + list(self.replica_weights)
         if obj1._state.db in db_list and obj2._state.db in db_list:
             return True
         return None
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         return True
+
+    def is_healthy(self, alias):
+        if alias == SOURCE_DATABASE:
+            return True
+
+        if replica_stats.claim_lag_check(alias, self.lag_check_interval):
+            # Other threads keep using the last known lag while it's checked
+            lag = float('inf')
+            try:
+                lag = get_replication_lag(alias)
+            except Exception:
+                logger.exception('Unable to check the replication lag of {}'.format(alias))
+            finally:
+                replica_stats.finish_lag_check(alias, lag)
+            if lag > self.max_lag:
+                logger.warning('Leaving {} out of reads, {} seconds behind the source'.format(alias, lag))
+        return replica_stats.get(alias).lag <= self.max_lag
+
+
+def get_replication_lag(alias):
+    """
+    Checked on a connection of its own, which gives up after REPLICA_LAG_CHECK_TIMEOUT seconds, so that an unreachable
+    replica holds up the request checking it for no longer than that
+    """
+    timeout = settings.REPLICA_LAG_CHECK_TIMEOUT
+    params = connections[alias].get_connection_params()
+    params.update(connect_timeout=timeout, options='-c statement_timeout={}'.format(timeout * 1000))
+    connection = psycopg2.connect(**params)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICATION_LAG_SQL)
+            lag = cursor.fetchone()[0]
+    finally:
+        connection.close()
+    # NULL if the database isn't a replica at all
+    return float(lag or 0)
+
+
+def choose_database(weights):
+    """Weighted random choice of database, after dividing each weight by its in-flight queries and latency"""
+    effective_weights = []
+    for alias, weight in sorted(weights.items()):
+        stats = replica_stats.get(alias)
+        latency = max(stats.latency or MIN_LATENCY, MIN_LATENCY)
+        effective_weights.append((alias, weight / ((1 + stats.in_flight) * latency)))
+
+    total = sum(weight for alias, weight in effective_weights)
+    if total <= 0:
+        return None
+    point = random.uniform(0, total)
+    for alias, weight in effective_weights:
+        point -= weight
+        if point <= 0:
+            return alias
+    return effective_weights[-1][0]
@@ -0,0 +1,77 @@
+import pytest
+import threading
+from unittest.mock import MagicMock, patch
+
+from usaspending_api.download.models import DownloadJob
+from usaspending_api.routers import replicas
+from usaspending_api.routers.replica_stats import replica_stats
+
+
+@pytest.fixture
+def router(settings, monkeypatch):
+    settings.DATABASE_REPLICA_WEIGHTS = {'db_r1': 1, 'db_r2': 1}
+    settings.DB_SOURCE_READ_WEIGHT = 0
+    settings.REPLICA_MAX_LAG_SECONDS = 60
+    replica_stats.clear()
+    monkeypatch.setattr(replicas, 'get_replication_lag', lambda alias: {'db_r1': 0, 'db_r2': 600}[alias])
+    yield replicas.ReadReplicaRouter()
+    replica_stats.clear()
+
+
+def test_lagging_replicas_and_source_left_out_of_reads(router):
+    assert {router.db_for_read(None) for i in range(50)} == {'db_r1'}
+    assert router.db_for_read(DownloadJob) == 'db_source'
+
+
+def test_falls_back_to_source(router, monkeypatch):
+    monkeypatch.setattr(replicas, 'get_replication_lag', lambda alias: float('inf'))
+    router.lag_check_interval = 0
+    assert router.db_for_read(None) == 'db_source'
+
+
+def test_busy_databases_chosen_less_often():
+    replica_stats.clear()
+    replica_stats.get('db_r1').in_flight = 100
+    choices = [replicas.choose_database({'db_r1': 1, 'db_r2': 1}) for i in range(200)]
+    replica_stats.clear()
+
+    assert choices.count('db_r2') > 150
+
+
+def test_one_thread_checks_the_lag_at_a_time(router, monkeypatch):
+    checking, release = threading.Event(), threading.Event()
+    checks = []
+
+    def slow_lag(alias):
+        checks.append(alias)
+        checking.set()
+        release.wait()
+        return 600
+
+    monkeypatch.setattr(replicas, 'get_replication_lag', slow_lag)
+    checker = threading.Thread(target=router.is_healthy, args=('db_r2',))
+    checker.start()
+    checking.wait()
+    # The last known lag is used while the check runs
+    assert all(router.is_healthy('db_r2') for i in range(10))
+    release.set()
+    checker.join()
+
+    assert checks == ['db_r2']
+    assert not router.is_healthy('db_r2')
+
+
+def test_replication_lag_checked_with_timeouts(settings):
+    settings.REPLICA_LAG_CHECK_TIMEOUT = 2
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (None,)
+    db = MagicMock()
+    db.get_connection_params.return_value = {'database': 'replica', 'host': 'replica-host'}
+
+    with patch.object(replicas, 'connections', {'db_r1': db}), \
+            patch.object(replicas.psycopg2, 'connect', return_value=connection) as connect:
+        assert replicas.get_replication_lag('db_r1') == 0
+
+    connect.assert_called_once_with(database='replica', host='replica-host', connect_timeout=2,
+                                    options='-c statement_timeout=2000')
+    connection.close.assert_called_once_with()
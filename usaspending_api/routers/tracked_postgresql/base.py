@@ -0,0 +1,36 @@
+"""
+PostgreSQL backend which records the in-flight queries and latency of each connection, so that the
+ReadReplicaRouter can steer reads away from busy or slow databases
+"""
+from django.db.backends.postgresql_psycopg2 import base
+from django.db.backends.utils import CursorDebugWrapper, CursorWrapper
+
+from usaspending_api.routers.replica_stats import replica_stats
+
+
+class TrackedCursorWrapper(CursorWrapper):
+    def execute(self, sql, params=None):
+        with replica_stats.track(self.db.alias):
+            return super().execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        with replica_stats.track(self.db.alias):
+            return super().executemany(sql, param_list)
+
+
+class TrackedCursorDebugWrapper(CursorDebugWrapper):
+    def execute(self, sql, params=None):
+        with replica_stats.track(self.db.alias):
+            return super().execute(sql, params)
+
+    def executemany(self, sql, param_list):
+        with replica_stats.track(self.db.alias):
+            return super().executemany(sql, param_list)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def make_cursor(self, cursor):
+        return TrackedCursorWrapper(cursor, self)
+
+    def make_debug_cursor(self, cursor):
+        return TrackedCursorDebugWrapper(cursor, self)
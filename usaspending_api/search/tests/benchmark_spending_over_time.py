@@ -0,0 +1,85 @@
+"""
+Compares building spending_over_time results from rows bucketed and sorted by the database against the previous
+Python bucketing of calendar months, with string keys parsed back by ast.literal_eval while sorting.
+
+    python -m usaspending_api.search.tests.benchmark_spending_over_time [--number 200]
+
+Rows cover every month from FY2008 to the current fiscal year. Only the Python side of the response is timed.
+"""
+import argparse
+import ast
+import django
+import os
+import random
+import timeit
+from collections import OrderedDict
+from datetime import date
+from decimal import Decimal
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+from fiscalyear import FiscalDate  # noqa: E402
+
+from usaspending_api.common.helpers import fy, generate_fiscal_month  # noqa: E402
+from usaspending_api.search.v2.views.search import time_period_results  # noqa: E402
+
+FIRST_FISCAL_YEAR = 2008
+
+
+def calendar_month_rows():
+    """Rows as previously returned by the database: calendar months, in no particular order"""
+    rows = [{'fiscal_year': fiscal_year, 'month': month,
+             'transaction_amount': Decimal(random.randint(0, 10 ** 12)) / 100}
+            for fiscal_year in range(FIRST_FISCAL_YEAR, fy(date.today()) + 1) for month in range(1, 13)]
+    random.shuffle(rows)
+    return rows
+
+
+def fiscal_period_rows(period):
+    """Rows as returned by the database now: fiscal months or quarters, sorted"""
+    rows = []
+    for fiscal_year in range(FIRST_FISCAL_YEAR, fy(date.today()) + 1):
+        for number in range(1, 13 if period == 'month' else 5):
+            rows.append({'fiscal_year': fiscal_year, period: number,
+                         'transaction_amount': Decimal(random.randint(0, 10 ** 12)) / 100})
+    return rows
+
+
+def previous_results(rows, period):
+    group_results = OrderedDict()
+    for trans in rows:
+        if period == 'month':
+            number = generate_fiscal_month(date(year=2017, day=1, month=trans['month']))
+        else:
+            number = FiscalDate(2017, trans['month'], 1).quarter
+        key = str({'fiscal_year': str(trans['fiscal_year']), period: str(number)})
+        if group_results.get(key) is None:
+            group_results[key] = trans['transaction_amount']
+        elif trans['transaction_amount']:
+            group_results[key] = group_results.get(key) + trans['transaction_amount']
+
+    sorted_group_results = sorted(
+        group_results.items(),
+        key=lambda k: (ast.literal_eval(k[0])['fiscal_year'], int(ast.literal_eval(k[0])[period])))
+    return [{'time_period': ast.literal_eval(key), 'aggregated_amount': float(value) if value else float(0)}
+            for key, value in sorted_group_results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=200, help='Times each response is built')
+    args = parser.parse_args()
+
+    calendar_rows = calendar_month_rows()
+    print('FY{}-FY{}, {} month rows'.format(FIRST_FISCAL_YEAR, fy(date.today()), len(calendar_rows)))
+    for period in ('month', 'quarter'):
+        period_rows = fiscal_period_rows(period)
+        for name, build in (('python bucketing', lambda: previous_results(calendar_rows, period)),
+                            ('database bucketing', lambda: time_period_results(period_rows, period))):
+            seconds = timeit.timeit(build, number=args.number)
+            print('{:<8} {:<20} {:.1f} us per response'.format(period, name, seconds / args.number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
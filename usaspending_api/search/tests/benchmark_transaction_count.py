@@ -0,0 +1,100 @@
+"""
+Compares the latency of spending_by_transaction_count's single _msearch request against the previous sequential
+search per award category, using a local stand-in for the Elasticsearch cluster.
+
+    python -m usaspending_api.search.tests.benchmark_transaction_count [--latency-ms 20] [--number 20]
+
+The stand-in answers every _search and _msearch with recorded-style count responses after --latency-ms, which models
+the network round trip and per-request overhead of a real cluster, not the cost of the searches themselves.
+"""
+import argparse
+import django
+import json
+import os
+import threading
+import time
+import timeit
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'usaspending_api.settings')
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from elasticsearch import Elasticsearch  # noqa: E402
+
+from usaspending_api.awards.v2.lookups.elasticsearch_lookups import indices_to_award_types  # noqa: E402
+from usaspending_api.core.elasticsearch import client  # noqa: E402
+from usaspending_api.search.v2.elasticsearch_helper import get_total_results  # noqa: E402
+from usaspending_api.search.v2.elasticsearch_helper import spending_by_transaction_count  # noqa: E402
+
+SEARCH_RESPONSE = {
+    'took': 3,
+    'timed_out': False,
+    '_shards': {'total': 5, 'successful': 5, 'skipped': 0, 'failed': 0},
+    'hits': {'total': 12345, 'max_score': 0.0, 'hits': []}
+}
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def make_handler(latency):
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request_body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency)
+            if self.path.split('?')[0].endswith('/_msearch'):
+                searches = len([line for line in request_body.splitlines() if line.strip()]) // 2
+                response = {'responses': [SEARCH_RESPONSE] * searches}
+            else:
+                response = SEARCH_RESPONSE
+            body = json.dumps(response).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_POST
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+def previous_transaction_count(request_data):
+    response = {}
+    for category in indices_to_award_types.keys():
+        total = get_total_results(request_data['keyword'], category)
+        if total is None:
+            return None
+        response['direct_payments' if category == 'directpayments' else category] = total
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency-ms', type=float, default=20, help='Stand-in latency of each request')
+    parser.add_argument('--number', type=int, default=20, help='Times each count is requested')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.latency_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # Every request has to reach the stand-in, rather than the query cache
+    settings.ES_QUERY_CACHE_TIMEOUT = 0
+    client.CLIENT = Elasticsearch('http://127.0.0.1:{}'.format(server.server_address[1]))
+
+    request_data = {'keyword': 'computer'}
+    assert previous_transaction_count(request_data) == spending_by_transaction_count(request_data)
+    for name, count in (('sequential _search', previous_transaction_count),
+                        ('single _msearch', spending_by_transaction_count)):
+        seconds = timeit.timeit(lambda: count(request_data), number=args.number)
+        print('{:<20} {:.1f} ms per request'.format(name, seconds / args.number * 1000))
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import patch
+
+from django.db import connection
+
+from usaspending_api.search.v2 import elasticsearch_helper
+
+
+def test_spending_by_transaction_count_single_round_trip():
+    totals = {'contracts': 5, 'directpayments': 4, 'grants': 3, 'loans': 2, 'other': 1}
+    requests = []
+
+    def msearch(searches, **kwargs):
+        requests.append(searches)
+        return [{'hits': {'total': totals[index.split('-')[-1].rstrip('*')], 'hits': []}} for index, body in searches]
+
+    with patch.object(elasticsearch_helper, 'TRANSACTIONS_INDEX_ROOT', 'transactions'), \
+            patch.object(elasticsearch_helper, 'es_client_msearch', side_effect=msearch):
+        results = elasticsearch_helper.spending_by_transaction_count({'keyword': 'test'})
+
+    assert results == {'contracts': 5, 'direct_payments': 4, 'grants': 3, 'loans': 2, 'other': 1}
+    assert len(requests) == 1
+    assert all(body['size'] == 0 for index, body in requests[0])
+
+
+def test_spending_by_transaction_count_failed_search():
+    responses = [{'hits': {'total': 1, 'hits': []}}] * 4 + [{'error': {'type': 'index_not_found_exception'}}]
+
+    with patch.object(elasticsearch_helper, 'es_client_msearch', return_value=responses):
+        assert elasticsearch_helper.spending_by_transaction_count({'keyword': 'test'}) is None
+    with patch.object(elasticsearch_helper, 'es_client_msearch', return_value=None):
+        assert elasticsearch_helper.spending_by_transaction_count({'keyword': 'test'}) is None
+
+
+def test_get_download_ids_streams_every_batch():
+    pages = [[{'_source': {'transaction_id': i}} for i in range(start, start + 3)] for start in (0, 3, 6)]
+
+    with patch.object(elasticsearch_helper, 'es_client_scroll', return_value=iter(pages)) as scroll:
+        batches = list(elasticsearch_helper.get_download_ids('test', 'transaction_id', size=3))
+
+    assert batches == [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+    assert scroll.call_args[1]['size'] == 3
+    assert scroll.call_args[1]['body']['sort'] == ['_doc']
+
+
+@pytest.mark.django_db
+def test_store_download_ids_writes_pages_to_a_table():
+    pages = [[{'_source': {'transaction_id': i}} for i in range(start, start + 3)] for start in (0, 3, 5)]
+
+    with patch.object(elasticsearch_helper, 'es_client_scroll', return_value=iter(pages)) as scroll:
+        table = elasticsearch_helper.store_download_ids('test', 'transaction_id')
+        # Stored once per download, however many sources filter on the keyword
+        assert elasticsearch_helper.store_download_ids('test', 'transaction_id') == table
+    assert scroll.call_count == 1
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT id FROM {} ORDER BY id'.format(table))
+        assert [row[0] for row in cursor.fetchall()] == [0, 1, 2, 3, 4, 5, 6, 7]
+
+    elasticsearch_helper.drop_download_id_tables()
+    assert elasticsearch_helper.DOWNLOAD_ID_TABLES == {}
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s)', [table])
+        assert cursor.fetchone()[0] is None
@@ -1,8 +1,12 @@
 import json
 
 import pytest
+from model_mommy import mommy
 from rest_framework import status
 
+from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.search.v2.category_aggregation import add_cfda_popular_names, get_category_groups
+
 
 @pytest.mark.skip
 @pytest.mark.django_db
@@ -92,3 +96,24 @@ def test_naics_autocomplete_failure(client):
         content_type='application/json',
         data=json.dumps({}))
     assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_category_groups():
+    categories = [{"category": "awarding_agency", "scope": "agency"}, {"category": "cfda_programs"}]
+    assert get_category_groups(categories) == [("awarding_agency", "agency"), ("cfda_programs", None)]
+
+    with pytest.raises(InvalidParameterException):
+        get_category_groups([{"category": "awarding_agency", "scope": "office"}])
+
+
+@pytest.mark.django_db
+def test_add_cfda_popular_names():
+    mommy.make('references.Cfda', program_number='10.553', program_title='School Breakfast', popular_name='SBP')
+    mommy.make('references.Cfda', program_number='10.555', program_title='School Lunch', popular_name='NSLP')
+    results = [{"cfda_program_number": "10.553", "program_title": "School Breakfast"},
+               {"cfda_program_number": "10.555", "program_title": "Renamed"},
+               {"cfda_program_number": "99.999", "program_title": "Missing"}]
+
+    add_cfda_popular_names(results)
+
+    assert [result["popular_name"] for result in results] == ["SBP", None, None]
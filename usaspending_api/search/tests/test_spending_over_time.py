@@ -1,9 +1,15 @@
 import json
+from decimal import Decimal
 
 import pytest
+from django.core.cache import caches
 from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from usaspending_api.common.cache_decorator import cache_response, local_response_cache
 from usaspending_api.search.tests.test_mock_data_search import all_filters
+from usaspending_api.search.v2.views.search import time_period_results
 
 
 @pytest.mark.skip
@@ -43,3 +49,38 @@ def test_spending_over_time_failure(client):
         content_type='application/json',
         data=json.dumps({'group': 'fiscal_year'}))
     assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_time_period_results():
+    rows = [{'fiscal_year': 2017, 'quarter': 4, 'transaction_amount': Decimal('10.50')},
+            {'fiscal_year': 2018, 'quarter': 1, 'transaction_amount': None}]
+
+    assert time_period_results(rows, 'quarter') == [
+        {'time_period': {'fiscal_year': '2017', 'quarter': '4'}, 'aggregated_amount': 10.5},
+        {'time_period': {'fiscal_year': '2018', 'quarter': '1'}, 'aggregated_amount': 0.0},
+    ]
+    assert time_period_results([{'fiscal_year': 2018, 'transaction_amount': Decimal('1')}]) == [
+        {'time_period': {'fiscal_year': '2018'}, 'aggregated_amount': 1.0}]
+
+
+class PlannedView(APIView):
+    """Responds as the search views do, with the plan in a Matview-Plan header, through a real cache"""
+
+    @cache_response(cache='default')
+    def post(self, request):
+        return Response({'results': []}, headers={'Matview-Plan': 'summary_transaction_view (~100 rows)'})
+
+
+def test_matview_plan_header_survives_cached_hit(rf):
+    caches['default'].clear()
+    local_response_cache.clear()
+    view = PlannedView.as_view()
+    data = json.dumps({'group': 'fiscal_year', 'filters': {'keyword': 'test'}})
+
+    first = view(rf.post('/api/v2/search/spending_over_time/', data=data, content_type='application/json'))
+    second = view(rf.post('/api/v2/search/spending_over_time/', data=data, content_type='application/json'))
+
+    assert first['Cache-Trace'].startswith('set-cache')
+    assert second['Cache-Trace'].startswith('hit')
+    assert second['Matview-Plan'] == first['Matview-Plan'] == 'summary_transaction_view (~100 rows)'
+    assert json.loads(second.content.decode('utf-8')) == {'results': []}
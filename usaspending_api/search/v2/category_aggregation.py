@@ -0,0 +1,147 @@
+"""
+Aggregates spending by several categories over the same award filters in a single query, using GROUPING SETS over the
+filtered universal_transaction_matview rather than filtering the matview again for every category
+"""
+from collections import OrderedDict
+from django.db import connections
+
+from usaspending_api.awards.models_matviews import UniversalTransactionView
+from usaspending_api.awards.v2.filters.matview_filters import matview_search_filter
+from usaspending_api.awards.v2.lookups.lookups import award_type_mapping, loan_type_mapping
+from usaspending_api.common.exceptions import InvalidParameterException
+from usaspending_api.common.helpers import get_simple_pagination_metadata
+from usaspending_api.references.models import Cfda
+
+# (category, scope): matview columns grouped on, and the names they're returned as. Groups are left out when their
+# first column is null, except for the groups in NULLABLE_GROUPS
+CATEGORY_GROUPS = OrderedDict([
+    (('awarding_agency', 'agency'), [('awarding_toptier_agency_name', 'agency_name'),
+                                     ('awarding_toptier_agency_abbreviation', 'agency_abbreviation')]),
+    (('awarding_agency', 'subagency'), [('awarding_subtier_agency_name', 'agency_name'),
+                                        ('awarding_subtier_agency_abbreviation', 'agency_abbreviation')]),
+    (('funding_agency', 'agency'), [('funding_toptier_agency_name', 'agency_name'),
+                                    ('funding_toptier_agency_abbreviation', 'agency_abbreviation')]),
+    (('funding_agency', 'subagency'), [('funding_subtier_agency_name', 'agency_name'),
+                                       ('funding_subtier_agency_abbreviation', 'agency_abbreviation')]),
+    (('recipient', 'duns'), [('recipient_id', 'legal_entity_id'), ('recipient_name', 'recipient_name')]),
+    (('recipient', 'parent_duns'), [('parent_recipient_unique_id', 'parent_recipient_unique_id'),
+                                    ('recipient_name', 'recipient_name')]),
+    (('cfda_programs', None), [('cfda_number', 'cfda_program_number'), ('cfda_title', 'program_title')]),
+    (('industry_codes', 'psc'), [('product_or_service_code', 'psc_code')]),
+    (('industry_codes', 'naics'), [('naics_code', 'naics_code'), ('naics_description', 'naics_description')]),
+])
+NULLABLE_GROUPS = [('recipient', 'duns')]
+
+CATEGORY_SQL = """
+WITH filtered AS ({filtered_sql}),
+grouped AS (
+    SELECT
+        GROUPING({columns}) AS grouping_id,
+        {columns},
+        SUM(CASE WHEN type IN %s THEN original_loan_subsidy_cost ELSE 0 END) AS total_subsidy_cost,
+        SUM(CASE WHEN NOT (type IN %s) THEN federal_action_obligation ELSE 0 END) AS total_obligation
+    FROM filtered
+    GROUP BY GROUPING SETS ({grouping_sets})
+),
+ranked AS (
+    SELECT
+        *,
+        ROW_NUMBER() OVER (PARTITION BY grouping_id ORDER BY aggregated_amount DESC) AS row_rank
+    FROM (SELECT *, {aggregated_amount} AS aggregated_amount FROM grouped WHERE {group_conditions}) AS aggregated
+)
+SELECT * FROM ranked WHERE row_rank > %s AND row_rank <= %s ORDER BY grouping_id, row_rank
+"""
+
+
+def get_category_groups(categories):
+    """Returns the (category, scope) pairs requested, in order, validating each of them"""
+    pairs = []
+    for category in categories:
+        if not isinstance(category, dict) or 'category' not in category:
+            raise InvalidParameterException("Each of categories must have a category")
+        pair = (category['category'], category.get('scope'))
+        if pair not in CATEGORY_GROUPS:
+            raise InvalidParameterException("{} is not a valid category and scope".format(pair))
+        pairs.append(pair)
+    return pairs
+
+
+def get_aggregated_amount_sql(filter_types):
+    """SQL equivalent of the aggregated amount of filter_helpers.sum_transaction_amount()"""
+    if not set(filter_types) & set(loan_type_mapping):
+        return 'COALESCE(total_obligation, 0)'
+    elif set(filter_types) <= set(loan_type_mapping):
+        return 'COALESCE(total_subsidy_cost, 0)'
+    return 'COALESCE(total_subsidy_cost, 0) + COALESCE(total_obligation, 0)'
+
+
+def spending_by_categories(categories, filters, limit, page):
+    """Returns a page of spending by each of the requested categories, in the order they were requested"""
+    pairs = get_category_groups(categories)
+    filter_types = filters['award_type_codes'] if 'award_type_codes' in filters else award_type_mapping
+
+    columns = []
+    for pair in pairs:
+        for column, name in CATEGORY_GROUPS[pair]:
+            if column not in columns:
+                columns.append(column)
+
+    # GROUPING() sets a bit, first column first, for each column a grouping set doesn't include
+    grouping_ids = OrderedDict()
+    for pair in pairs:
+        group_columns = [column for column, name in CATEGORY_GROUPS[pair]]
+        grouping_ids[pair] = sum(1 << (len(columns) - 1 - i) for i, column in enumerate(columns)
+                                 if column not in group_columns)
+
+    group_conditions = []
+    for pair, grouping_id in grouping_ids.items():
+        condition = 'grouping_id = {}'.format(grouping_id)
+        if pair not in NULLABLE_GROUPS:
+            condition += ' AND {} IS NOT NULL'.format(CATEGORY_GROUPS[pair][0][0])
+        group_conditions.append('({})'.format(condition))
+
+    queryset = matview_search_filter(filters, UniversalTransactionView) \
+        .values('type', 'federal_action_obligation', 'original_loan_subsidy_cost', *columns)
+    filtered_sql, filtered_params = queryset.query.get_compiler(using=queryset.db).as_sql()
+
+    sql = CATEGORY_SQL.format(
+        filtered_sql=filtered_sql,
+        columns=', '.join(columns),
+        grouping_sets=', '.join('({})'.format(', '.join(column for column, name in CATEGORY_GROUPS[pair]))
+                                for pair in grouping_ids),
+        aggregated_amount=get_aggregated_amount_sql(filter_types),
+        group_conditions=' OR '.join(group_conditions))
+    loan_types = tuple(loan_type_mapping)
+    params = list(filtered_params) + [loan_types, loan_types, (page - 1) * limit, page * limit + 1]
+
+    rows_by_grouping_id = {}
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        column_names = [description[0] for description in cursor.description]
+        for row in cursor.fetchall():
+            row = dict(zip(column_names, row))
+            rows_by_grouping_id.setdefault(row['grouping_id'], []).append(row)
+
+    results = []
+    for pair in pairs:
+        rows = rows_by_grouping_id.get(grouping_ids[pair], [])
+        category_results = [OrderedDict([(name, row[column]) for column, name in CATEGORY_GROUPS[pair]] +
+                                        [('aggregated_amount', row['aggregated_amount'])]) for row in rows[:limit]]
+        if pair[0] == 'cfda_programs':
+            add_cfda_popular_names(category_results)
+        results.append({'category': pair[0], 'scope': pair[1], 'results': category_results,
+                        'page_metadata': get_simple_pagination_metadata(len(rows), limit, page)})
+    return results
+
+
+def add_cfda_popular_names(results):
+    """Sets the popular_name of each CFDA program in the results with a single lookup, instead of one per program"""
+    popular_names = {}
+    cfdas = Cfda.objects \
+        .filter(program_number__in={result['cfda_program_number'] for result in results}) \
+        .values('program_number', 'program_title', 'popular_name')
+    for cfda in cfdas:
+        popular_names.setdefault((cfda['program_number'], cfda['program_title']), cfda['popular_name'])
+
+    for result in results:
+        result['popular_name'] = popular_names.get((result['cfda_program_number'], result['program_title']))
@@ -1,19 +1,24 @@
 import logging
+import os
 import re
 from django.conf import settings
+from django.db import connection
+from psycopg2.extras import execute_values
 
 from usaspending_api.awards.v2.lookups.elasticsearch_lookups import KEYWORD_DATATYPE_FIELDS
 from usaspending_api.awards.v2.lookups.elasticsearch_lookups import indices_to_award_types
 from usaspending_api.awards.v2.lookups.elasticsearch_lookups import TRANSACTIONS_LOOKUP
-from usaspending_api.core.elasticsearch.client import es_client_query
+from usaspending_api.core.elasticsearch.client import es_client_msearch, es_client_query, es_client_scroll
 logger = logging.getLogger('console')
 
 TRANSACTIONS_INDEX_ROOT = settings.TRANSACTIONS_INDEX_ROOT
-DOWNLOAD_QUERY_SIZE = settings.DOWNLOAD_QUERY_SIZE
 KEYWORD_DATATYPE_FIELDS = ['{}.raw'.format(i) for i in KEYWORD_DATATYPE_FIELDS]
 
 TRANSACTIONS_LOOKUP.update({v: k for k, v in TRANSACTIONS_LOOKUP.items()})
 
+# Tables of the ids matching each (keyword, field) of the process's current download, until it drops them
+DOWNLOAD_ID_TABLES = {}
+
 
 def preprocess(keyword):
     """Remove Lucene special characters instead of escaping for now"""
@@ -57,7 +62,7 @@ def base_query(keyword, fields=KEYWORD_DATATYPE_FIELDS):
     return query
 
 
-def search_transactions(request_data, lower_limit, limit):
+def search_transactions(request_data, lower_limit, limit, search_after=None):
     '''
     filters: dictionary
     fields: list
@@ -65,8 +70,10 @@ def search_transactions(request_data, lower_limit, limit):
     order: string
     lower_limit: integer
     limit: integer
+    search_after: sort values of the hit to start after, instead of skipping lower_limit hits
 
     if transaction_type_code not found, return results for contracts
+    Returns whether it succeeded, the results (or an error message), the total hits and the sort values of each hit
     '''
     keyword = request_data['keyword']
     query_fields = [TRANSACTIONS_LOOKUP[i] for i in request_data['fields']]
@@ -77,11 +84,15 @@ def search_transactions(request_data, lower_limit, limit):
         'from': lower_limit,
         'size': limit,
         'query': base_query(keyword),
-        'sort': [{
-            query_sort: {
-                'order': request_data['order']}
-        }]
+        # transaction_id breaks ties, so that every hit has a place in the order for search_after
+        'sort': [
+            {query_sort: {'order': request_data['order']}},
+            {'transaction_id': {'order': request_data['order']}}
+        ]
     }
+    if search_after is not None:
+        query['from'] = 0
+        query['search_after'] = search_after
 
     for index, award_types in indices_to_award_types.items():
         if sorted(award_types) == sorted(request_data['award_type_codes']):
@@ -89,15 +100,15 @@ def search_transactions(request_data, lower_limit, limit):
             break
     else:
         logger.exception('Bad/Missing Award Types. Did not meet 100% of a category\'s types')
-        return False, 'Bad/Missing Award Types requested', None
+        return False, 'Bad/Missing Award Types requested', None, None
 
     response = es_client_query(index=index_name, body=query, retries=10)
     if response:
         total = response['hits']['total']
         results = format_for_frontend(response['hits']['hits'])
-        return True, results, total
+        return True, results, total, [hit['sort'] for hit in response['hits']['hits']]
     else:
-        return False, 'There was an error connecting to the ElasticSearch cluster', None
+        return False, 'There was an error connecting to the ElasticSearch cluster', None, None
 
 
 def get_total_results(keyword, sub_index, retries=3):
@@ -116,17 +127,24 @@ def get_total_results(keyword, sub_index, retries=3):
 
 
 def spending_by_transaction_count(request_data):
+    """Counts the transactions matching the keyword in each category's indices, in a single _msearch round trip"""
     keyword = request_data['keyword']
-    response = {}
+    categories = list(indices_to_award_types.keys())
+    searches = [('{}-{}*'.format(TRANSACTIONS_INDEX_ROOT, category), {'query': base_query(keyword), 'size': 0})
+                for category in categories]
+
+    responses = es_client_msearch(searches, retries=3)
+    if responses is None:
+        return None
 
-    for category in indices_to_award_types.keys():
-        total = get_total_results(keyword, category)
-        if total is not None:
-            if category == 'directpayments':
-                category = 'direct_payments'
-            response[category] = total
-        else:
-            return total
+    response = {}
+    for category, result in zip(categories, responses):
+        if 'error' in result:
+            logger.error('Unable to count {} transactions: {}'.format(category, result['error']))
+            return None
+        if category == 'directpayments':
+            category = 'direct_payments'
+        response[category] = result['hits']['total']
     return response
 
 
@@ -163,44 +181,49 @@ def get_download_ids(keyword, field, size=10000):
     returns a generator that
     yields list of transaction ids in chunksize SIZE
 
-    Note: this only works for fields in ES of integer type.
+    Every match is streamed with a scroll, in index order (_doc), which is the cheapest for ES to return
     '''
     index_name = '{}-*'.format(TRANSACTIONS_INDEX_ROOT)
-    n_iter = DOWNLOAD_QUERY_SIZE // size
-
-    max_iterations = 10
-    total = get_total_results(keyword, '*', max_iterations)
-    if total is None:
-        logger.error('Error retrieving total results. Max number of attempts reached')
-        return
-    required_iter = (total // size) + 1
-    n_iter = min(max(1, required_iter), n_iter)
-    for i in range(n_iter):
-        query = {
-            "_source": [field],
-            "query": base_query(keyword),
-            "aggs": {
-                "results": {
-                    "terms": {
-                        "field": field,
-                        "include": {
-                            "partition": i,
-                            "num_partitions": n_iter
-                        },
-                        "size": size
-                    }
-                }
-            },
-            "size": 0
-        }
+    query = {
+        "_source": [field],
+        "query": base_query(keyword),
+        "sort": ["_doc"]
+    }
 
-        response = es_client_query(index=index_name, body=query, retries=max_iterations, timeout='3m')
-        if not response:
-            raise Exception('Breaking generator, unable to reach cluster')
-        results = []
-        for result in response['aggregations']['results']['buckets']:
-            results.append(result['key'])
-        yield results
+    for hits in es_client_scroll(index=index_name, body=query, size=size, retries=10):
+        yield [hit['_source'][field] for hit in hits]
+
+
+def store_download_ids(keyword, field):
+    '''
+    Writes the ids of every match to a table, a scroll page at a time, and returns the table's name for the download's
+    query to filter on, so that the query stays small however many transactions match. It's a regular table as the
+    download's query runs in a psql session of its own. Each keyword is stored once per download, until
+    drop_download_id_tables()
+    '''
+    table = DOWNLOAD_ID_TABLES.get((keyword, field))
+    if table:
+        return table
+
+    table = 'download_keyword_ids_{}_{}'.format(os.getpid(), len(DOWNLOAD_ID_TABLES))
+    ids_stored = 0
+    with connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS {0}; CREATE TABLE {0} (id INTEGER PRIMARY KEY)'.format(table))
+        DOWNLOAD_ID_TABLES[(keyword, field)] = table
+        for ids in get_download_ids(keyword, field):
+            execute_values(cursor.cursor, 'INSERT INTO {} (id) VALUES %s ON CONFLICT DO NOTHING'.format(table),
+                           [(id_,) for id_ in ids], page_size=len(ids))
+            ids_stored += len(ids)
+        cursor.execute('ANALYZE {}'.format(table))
+    logger.info('Found {} transactions based on keyword: {}'.format(ids_stored, keyword))
+    return table
+
+
+def drop_download_id_tables():
+    with connection.cursor() as cursor:
+        for table in DOWNLOAD_ID_TABLES.values():
+            cursor.execute('DROP TABLE IF EXISTS {}'.format(table))
+    DOWNLOAD_ID_TABLES.clear()
 
 
 def get_sum_and_count_aggregation_results(keyword):
@@ -1,9 +1,5 @@
-import ast
 import logging
 
-from collections import OrderedDict
-from datetime import date
-from fiscalyear import FiscalDate
 from functools import total_ordering
 
 from rest_framework.response import Response
@@ -11,14 +7,15 @@ from rest_framework.views import APIView
 
 from usaspending_api.common.cache_decorator import cache_response
 from django.db.models import Sum, Count, F, Value, FloatField
-from django.db.models.functions import ExtractMonth, Cast, Coalesce
+from django.db.models.functions import Cast, Coalesce
 
 from usaspending_api.awards.models_matviews import UniversalAwardView
 from usaspending_api.awards.models_matviews import UniversalTransactionView
 from usaspending_api.awards.v2.filters.location_filter_geocode import geocode_filter_locations
 from usaspending_api.awards.v2.filters.matview_filters import matview_search_filter
-from usaspending_api.awards.v2.filters.filter_helpers import sum_transaction_amount
+from usaspending_api.awards.v2.filters.filter_helpers import fiscal_period, seek_after, sum_transaction_amount
 from usaspending_api.awards.v2.filters.view_selector import can_use_view
+from usaspending_api.awards.v2.filters.view_selector import get_plan_header
 from usaspending_api.awards.v2.filters.view_selector import get_view_queryset
 from usaspending_api.awards.v2.filters.view_selector import spending_by_award_count
 from usaspending_api.awards.v2.filters.view_selector import spending_by_geography
@@ -32,12 +29,13 @@ from usaspending_api.awards.v2.lookups.matview_lookups import loan_award_mapping
 from usaspending_api.awards.v2.lookups.matview_lookups import non_loan_assistance_award_mapping
 from usaspending_api.common.exceptions import ElasticsearchConnectionException
 from usaspending_api.common.exceptions import InvalidParameterException
-from usaspending_api.common.helpers import generate_fiscal_month, get_simple_pagination_metadata
+from usaspending_api.common.helpers import decode_page_cursor, encode_page_cursor
+from usaspending_api.common.helpers import get_simple_pagination_metadata
 from usaspending_api.core.validator.award_filter import AWARD_FILTER
 from usaspending_api.core.validator.pagination import PAGINATION
 from usaspending_api.core.validator.tinyshield import TinyShield
 from usaspending_api.references.abbreviations import code_to_state, fips_to_code, pad_codes
-from usaspending_api.references.models import Cfda
+from usaspending_api.search.v2.category_aggregation import add_cfda_popular_names, spending_by_categories
 from usaspending_api.search.v2.elasticsearch_helper import search_transactions
 from usaspending_api.search.v2.elasticsearch_helper import spending_by_transaction_count
 from usaspending_api.search.v2.elasticsearch_helper import spending_by_transaction_sum_and_count
@@ -46,6 +44,18 @@ from usaspending_api.search.v2.elasticsearch_helper import spending_by_transacti
 logger = logging.getLogger(__name__)
 
 
+def time_period_results(rows, period=None):
+    """
+    Converts rows of fiscal_year, the period ('month' or 'quarter', if any) and transaction_amount, already sorted, to
+    the spending_over_time results: [{'time_period': {'fiscal_year': '2017', 'quarter': '3'}, 'aggregated_amount': 2.0}]
+    """
+    if period is None:
+        return [{'time_period': {'fiscal_year': str(row['fiscal_year'])},
+                 'aggregated_amount': float(row['transaction_amount'] or 0)} for row in rows]
+    return [{'time_period': {'fiscal_year': str(row['fiscal_year']), period: str(row[period])},
+             'aggregated_amount': float(row['transaction_amount'] or 0)} for row in rows]
+
+
 class SpendingOverTimeVisualizationViewSet(APIView):
     """
     This route takes award filters, and returns spending by time. The amount of time is denoted by the "group" value.
@@ -66,90 +76,37 @@ class SpendingOverTimeVisualizationViewSet(APIView):
         if group not in potential_groups:
             raise InvalidParameterException('group does not have a valid value')
 
-        queryset = spending_over_time(filters)
+        # only months need the action_date, so grouping by fiscal year can be answered by views without it
+        columns = ['fiscal_year', 'type', 'federal_action_obligation', 'original_loan_subsidy_cost']
+        if group not in ('fy', 'fiscal_year'):
+            columns.append('action_date')
+        queryset = spending_over_time(filters, columns)
         filter_types = filters['award_type_codes'] if 'award_type_codes' in filters else award_type_mapping
 
         # define what values are needed in the sql query
-        queryset = queryset.values('action_date', 'federal_action_obligation', 'original_loan_subsidy_cost')
-
-        # build response
-        response = {'group': group, 'results': []}
-        nested_order = ''
-
-        group_results = OrderedDict()  # list of time_period objects ie {"fy": "2017", "quarter": "3"} : 1000
-
-        if group == 'fy' or group == 'fiscal_year':
-
-            fy_set = sum_transaction_amount(queryset.values('fiscal_year'), filter_types=filter_types)
-
-            for trans in fy_set:
-                key = {'fiscal_year': str(trans['fiscal_year'])}
-                key = str(key)
-                group_results[key] = trans['transaction_amount']
-
-        elif group == 'm' or group == 'month':
-
-            month_set = queryset.annotate(month=ExtractMonth('action_date')) \
-                .values('fiscal_year', 'month')
-            month_set = sum_transaction_amount(month_set, filter_types=filter_types)
-
-            for trans in month_set:
-                # Convert month to fiscal month
-                fiscal_month = generate_fiscal_month(date(year=2017, day=1, month=trans['month']))
-
-                key = {'fiscal_year': str(trans['fiscal_year']), 'month': str(fiscal_month)}
-                key = str(key)
-                group_results[key] = trans['transaction_amount']
-            nested_order = 'month'
-        else:  # quarterly, take months and add them up
-
-            month_set = queryset.annotate(month=ExtractMonth('action_date')) \
-                .values('fiscal_year', 'month')
-            month_set = sum_transaction_amount(month_set, filter_types=filter_types)
+        queryset = queryset.values(*columns[2:])
 
-            for trans in month_set:
-                # Convert month to quarter
-                quarter = FiscalDate(2017, trans['month'], 1).quarter
+        # fiscal months and quarters are bucketed and sorted by the database, so rows come back in response order
+        if group in ('fy', 'fiscal_year'):
+            period = None
+            group_fields = ['fiscal_year']
+        else:
+            period = 'month' if group in ('m', 'month') else 'quarter'
+            queryset = queryset.annotate(**{period: fiscal_period(queryset.model, period)})
+            group_fields = ['fiscal_year', period]
+        period_set = sum_transaction_amount(queryset.values(*group_fields), filter_types=filter_types) \
+            .order_by(*group_fields)
 
-                key = {'fiscal_year': str(trans['fiscal_year']), 'quarter': str(quarter)}
-                key = str(key)
+        response = {'group': group, 'results': time_period_results(period_set, period)}
 
-                # If key exists {fy : quarter}, aggregate
-                if group_results.get(key) is None:
-                    group_results[key] = trans['transaction_amount']
-                else:
-                    if trans['transaction_amount']:
-                        group_results[key] = group_results.get(key) + trans['transaction_amount']
-                    else:
-                        group_results[key] = group_results.get(key)
-            nested_order = 'quarter'
-
-        # convert result into expected format, sort by key to meet front-end specs
-        results = []
-        # Expected results structure
-        # [{
-        # 'time_period': {'fy': '2017', 'quarter': '3'},
-        # 	'aggregated_amount': '200000000'
-        # }]
-        sorted_group_results = sorted(
-            group_results.items(),
-            key=lambda k: (
-                ast.literal_eval(k[0])['fiscal_year'],
-                int(ast.literal_eval(k[0])[nested_order])) if nested_order else (ast.literal_eval(k[0])['fiscal_year']))
-
-        for key, value in sorted_group_results:
-            key_dict = ast.literal_eval(key)
-            result = {'time_period': key_dict, 'aggregated_amount': float(value) if value else float(0)}
-            results.append(result)
-        response['results'] = results
-
-        return Response(response)
+        return Response(response, headers={'Matview-Plan': get_plan_header(queryset.model)})
 
 
 class SpendingByCategoryVisualizationViewSet(APIView):
     """
     This route takes award filters, and returns spending by the defined category/scope.
     The category is defined by the category keyword, and the scope is defined by is denoted by the scope keyword.
+    Several category/scope pairs can be requested at once as a list of categories, which are aggregated together.
     endpoint_doc: /advanced_award_search/spending_by_category.md
     """
     @cache_response()
@@ -160,6 +117,7 @@ class SpendingByCategoryVisualizationViewSet(APIView):
         json_request = request.data
         category = json_request.get("category", None)
         scope = json_request.get("scope", None)
+        categories = json_request.get("categories", None)
         filters = json_request.get("filters", None)
         limit = json_request.get("limit", 10)
         page = json_request.get("page", 1)
@@ -167,6 +125,14 @@ class SpendingByCategoryVisualizationViewSet(APIView):
         lower_limit = (page - 1) * limit
         upper_limit = page * limit
 
+        if categories is not None:
+            if not isinstance(categories, list) or not categories:
+                raise InvalidParameterException("categories must be a list of category/scope pairs")
+            if filters is None:
+                raise InvalidParameterException("Missing one or more required request parameters: filters")
+            results = spending_by_categories(categories, filters, limit, page)
+            return Response({"limit": limit, "results": results})
+
         if category is None:
             raise InvalidParameterException("Missing one or more required request parameters: category")
         potential_categories = ["awarding_agency", "funding_agency", "recipient", "cfda_programs", "industry_codes"]
@@ -310,17 +276,7 @@ class SpendingByCategoryVisualizationViewSet(APIView):
                 results = list(queryset[lower_limit:upper_limit + 1])
                 page_metadata = get_simple_pagination_metadata(len(results), limit, page)
                 results = results[:limit]
-                for trans in results:
-                    trans['popular_name'] = None
-                    # small DB hit every loop here
-                    cfda = Cfda.objects \
-                        .filter(
-                            program_title=trans['program_title'],
-                            program_number=trans['cfda_program_number']) \
-                        .values('popular_name').first()
-
-                    if cfda:
-                        trans['popular_name'] = cfda['popular_name']
+                add_cfda_popular_names(results)
 
             else:
                 queryset = queryset \
@@ -467,7 +423,7 @@ class SpendingByGeographyVisualizationViewSet(APIView):
                 'results': self.state_results(kwargs, fields_list, loc_lookup)
             }
 
-            return Response(state_response)
+            return Response(state_response, headers={'Matview-Plan': get_plan_header(self.queryset.model)})
 
         else:
             # County and district scope will need to select multiple fields
@@ -497,7 +453,7 @@ class SpendingByGeographyVisualizationViewSet(APIView):
                     'results': self.county_results(state_lookup, county_name)
                 }
 
-                return Response(county_response)
+                return Response(county_response, headers={'Matview-Plan': get_plan_header(self.queryset.model)})
             else:
                 self.county_district_queryset(
                     kwargs,
@@ -513,7 +469,7 @@ class SpendingByGeographyVisualizationViewSet(APIView):
                     'results': self.district_results(state_lookup)
                 }
 
-                return Response(district_response)
+                return Response(district_response, headers={'Matview-Plan': get_plan_header(self.queryset.model)})
 
     def state_results(self, filter_args, lookup_fields, loc_lookup):
         # Adding additional state filters if specified
@@ -622,6 +578,7 @@ class SpendingByAwardVisualizationViewSet(APIView):
         order = json_request.get("order", "asc")
         limit = json_request.get("limit", 10)
         page = json_request.get("page", 1)
+        cursor = json_request.get("cursor", None)
 
         lower_limit = (page - 1) * limit
         upper_limit = page * limit
@@ -638,6 +595,8 @@ class SpendingByAwardVisualizationViewSet(APIView):
                 "Missing one or more required request parameters: filters['award_type_codes']")
         if order not in ["asc", "desc"]:
             raise InvalidParameterException("Invalid value for order: {}".format(order))
+        if cursor is not None and not isinstance(cursor, str):
+            raise InvalidParameterException("Invalid value for cursor: {}".format(cursor))
 
         sort = json_request.get("sort", fields[0])
         if sort not in fields:
@@ -656,22 +615,31 @@ class SpendingByAwardVisualizationViewSet(APIView):
                 values.add(non_loan_assistance_award_mapping.get(field))
 
         # Modify queryset to be ordered if we specify "sort" in the request
+        sort_fields = []
         if sort and "no intersection" not in filters["award_type_codes"]:
             if set(filters["award_type_codes"]) <= set(contract_type_mapping):
-                sort_filters = [award_contracts_mapping[sort]]
+                sort_fields = [award_contracts_mapping[sort]]
             elif set(filters["award_type_codes"]) <= set(loan_type_mapping):  # loans
-                sort_filters = [loan_award_mapping[sort]]
+                sort_fields = [loan_award_mapping[sort]]
             else:  # assistance data
-                sort_filters = [non_loan_assistance_award_mapping[sort]]
+                sort_fields = [non_loan_assistance_award_mapping[sort]]
 
             if sort == "Award ID":
-                sort_filters = ["piid", "fain", "uri"]
-            if order == 'desc':
-                sort_filters = ['-' + sort_filter for sort_filter in sort_filters]
-
-            queryset = queryset.order_by(*sort_filters).values(*list(values))
-
-        limited_queryset = queryset[lower_limit:upper_limit + 1]
+                sort_fields = ["piid", "fain", "uri"]
+
+        # award_id breaks ties, so that every award has a place in the order for cursors to seek to
+        sort_fields.append('award_id')
+        sort_filters = [('-' if order == 'desc' else '') + sort_field for sort_field in sort_fields]
+        queryset = queryset.order_by(*sort_filters).values(*list(values))
+
+        if cursor:
+            # Keyset pagination: seek past the last award of the previous page instead of counting through OFFSET
+            after = decode_page_cursor(cursor, sort_filters)
+            if len(after) != len(sort_fields):
+                raise InvalidParameterException("Invalid cursor: {}".format(cursor))
+            limited_queryset = list(seek_after(queryset, sort_fields, after, order == 'desc')[:limit + 1])
+        else:
+            limited_queryset = list(queryset[lower_limit:upper_limit + 1])
         has_next = len(limited_queryset) > limit
 
         results = []
@@ -694,13 +662,20 @@ class SpendingByAwardVisualizationViewSet(APIView):
                         row["Award ID"] = award[id_type]
                         break
             results.append(row)
+
+        next_cursor = None
+        if has_next:
+            last_award = limited_queryset[limit - 1]
+            next_cursor = encode_page_cursor(sort_filters, [last_award[sort_field] for sort_field in sort_fields])
+
         # build response
         response = {
             'limit': limit,
             'results': results,
             'page_metadata': {
                 'page': page,
-                'hasNext': has_next
+                'hasNext': has_next,
+                'cursor': next_cursor
             }
         }
 
@@ -753,7 +728,7 @@ class SpendingByAwardCountVisualizationViewSet(APIView):
             results[result_key] += award['category_count']
 
         # build response
-        return Response({"results": results})
+        return Response({"results": results}, headers={'Matview-Plan': get_plan_header(queryset.model)})
 
 
 class SpendingByTransactionVisualizationViewSet(APIView):
@@ -775,6 +750,7 @@ class SpendingByTransactionVisualizationViewSet(APIView):
 
         models = [
             {'name': 'fields', 'key': 'fields', 'type': 'array', 'array_type': 'text', 'text_type': 'search'},
+            {'name': 'cursor', 'key': 'cursor', 'type': 'text', 'text_type': 'search', 'optional': True},
         ]
         models.extend(AWARD_FILTER)
         models.extend(PAGINATION)
@@ -786,12 +762,22 @@ class SpendingByTransactionVisualizationViewSet(APIView):
         if validated_payload['sort'] not in validated_payload['fields']:
             raise InvalidParameterException("Sort value not found in fields: {}".format(validated_payload['sort']))
 
+        # Keyset pagination: ES seeks past the last transaction of the previous page instead of counting through from
+        sort_key = [validated_payload['sort'], validated_payload['order']]
+        search_after = None
+        if validated_payload.get('cursor'):
+            search_after = decode_page_cursor(validated_payload['cursor'], sort_key)
+
         lower_limit = (validated_payload['page'] - 1) * validated_payload['limit']
-        success, response, total = search_transactions(validated_payload, lower_limit, validated_payload['limit'] + 1)
+        success, response, total, sort_values = search_transactions(
+            validated_payload, lower_limit, validated_payload['limit'] + 1, search_after)
         if not success:
             raise InvalidParameterException(response)
 
         metadata = get_simple_pagination_metadata(len(response), validated_payload['limit'], validated_payload['page'])
+        metadata['cursor'] = None
+        if metadata['hasNext']:
+            metadata['cursor'] = encode_page_cursor(sort_key, sort_values[validated_payload['limit'] - 1])
 
         results = []
         for transaction in response[:validated_payload['limit']]:
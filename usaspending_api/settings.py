@@ -7,6 +7,7 @@ https://docs.djangoproject.com/en/1.11/ref/settings/
 """
 
 import os
+import re
 import dj_database_url
 import sys
 from django.utils.crypto import get_random_string
@@ -44,6 +45,15 @@ BULK_DOWNLOAD_S3_BUCKET_NAME = ""
 BULK_DOWNLOAD_SQS_QUEUE_NAME = ""
 BULK_DOWNLOAD_AWS_REGION = ""
 MONTHLY_DOWNLOAD_S3_BUCKET_NAME = ""
+# Pipe psql output straight into the split, zipped CSVs instead of writing, re-reading and re-writing it on disk
+BULK_DOWNLOAD_STREAM_TO_ZIP = os.environ.get('BULK_DOWNLOAD_STREAM_TO_ZIP', '').lower() == 'true'
+# Number of psql exports run at once for a download with several sources (e.g. contracts and assistance); when above 1
+# each source is exported to its own csv in parallel and the csvs are zipped one at a time as they complete
+BULK_DOWNLOAD_WORKERS = int(os.environ.get('BULK_DOWNLOAD_WORKERS') or 1)
+# Identical requests reuse an earlier download's file until the data is next loaded, for at most this many hours; the
+# least recently used files are evicted once their total size is above the max bytes (see evict_cached_downloads)
+BULK_DOWNLOAD_CACHE_TTL_HOURS = int(os.environ.get('BULK_DOWNLOAD_CACHE_TTL_HOURS') or 24)
+BULK_DOWNLOAD_CACHE_MAX_BYTES = int(os.environ.get('BULK_DOWNLOAD_CACHE_MAX_BYTES') or 500 * 1024 ** 3)
 BROKER_AGENCY_BUCKET_NAME = ""
 
 # Application definition
@@ -130,9 +140,23 @@ DATABASES = {'default': dj_database_url.config(conn_max_age=10)}
 
 # read replica env vars... if not set, default DATABASE_URL will get used
 # if only one set, this will error out (single DB should use DATABASE_URL)
+# any number of replicas can be set as DB_R1, DB_R2, ..., each weighted by an optional DB_R<n>_WEIGHT
+DATABASE_REPLICA_WEIGHTS = {}
+# weight of the source in read rotation; 0 keeps reads off of it unless every replica is unhealthy
+DB_SOURCE_READ_WEIGHT = float(os.environ.get('DB_SOURCE_READ_WEIGHT') or 1)
+# replicas further behind the source than this are left out of reads, checked once per interval
+REPLICA_MAX_LAG_SECONDS = int(os.environ.get('REPLICA_MAX_LAG_SECONDS') or 300)
+REPLICA_LAG_CHECK_INTERVAL = int(os.environ.get('REPLICA_LAG_CHECK_INTERVAL') or 30)
+# seconds a lag check may take to connect or run before the replica is left out of reads until the next check
+REPLICA_LAG_CHECK_TIMEOUT = int(os.environ.get('REPLICA_LAG_CHECK_TIMEOUT') or 2)
 if os.environ.get('DB_SOURCE') or os.environ.get('DB_R1'):
     DATABASES['db_source'] = dj_database_url.parse(os.environ.get('DB_SOURCE'), conn_max_age=10)
-    DATABASES['db_r1'] = dj_database_url.parse(os.environ.get('DB_R1'), conn_max_age=10)
+    for replica_var in sorted(var for var in os.environ if re.match(r'^DB_R\d+$', var)):
+        DATABASES[replica_var.lower()] = dj_database_url.parse(os.environ.get(replica_var), conn_max_age=10)
+        DATABASE_REPLICA_WEIGHTS[replica_var.lower()] = float(os.environ.get(replica_var + '_WEIGHT') or 1)
+    for alias in ['db_source'] + list(DATABASE_REPLICA_WEIGHTS):
+        # tracks the in-flight queries and latency of each database for the router
+        DATABASES[alias]['ENGINE'] = 'usaspending_api.routers.tracked_postgresql'
     DATABASE_ROUTERS = ['usaspending_api.routers.replicas.ReadReplicaRouter']
 
 # import a second database connection for ETL, connecting to the data broker
@@ -296,6 +320,10 @@ CACHE_ENVIRONMENTS = {
 # Set the usaspending-cache to whatever our environment cache dictates
 CACHES["usaspending-cache"] = CACHE_ENVIRONMENTS[CACHE_ENVIRONMENT]
 
+# Per-process LRU of rendered responses in front of the usaspending-cache; a timeout of 0 disables it
+LOCAL_RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('LOCAL_RESPONSE_CACHE_MAX_ENTRIES') or 500)
+LOCAL_RESPONSE_CACHE_TIMEOUT = int(os.environ.get('LOCAL_RESPONSE_CACHE_TIMEOUT') or 60)
+
 # DRF extensions
 REST_FRAMEWORK_EXTENSIONS = {
     # Not caching errors, these are logged to exceptions.log
@@ -322,8 +350,16 @@ SPAGHETTI_SAUCE = {
 # Elasticsearch
 ES_HOSTNAME = ""
 TRANSACTIONS_INDEX_ROOT = os.environ.get('ES_TRX_ROOT') or 'future-transactions'
-DOWNLOAD_QUERY_SIZE = 500000
 ES_TIMEOUT = 30
+# Identical ES queries are answered from a per-process cache for this many seconds (0 disables it)
+ES_QUERY_CACHE_TIMEOUT = int(os.environ.get('ES_QUERY_CACHE_TIMEOUT') or 30)
+ES_QUERY_CACHE_MAX_ENTRIES = int(os.environ.get('ES_QUERY_CACHE_MAX_ENTRIES') or 500)
+# Retries wait a random time of up to ES_RETRY_BACKOFF seconds, doubled each retry, up to ES_RETRY_MAX_BACKOFF
+ES_RETRY_BACKOFF = float(os.environ.get('ES_RETRY_BACKOFF') or 0.1)
+ES_RETRY_MAX_BACKOFF = float(os.environ.get('ES_RETRY_MAX_BACKOFF') or 5)
+# After this many failures in a row, ES requests fail fast until a trial request succeeds, every timeout seconds
+ES_CIRCUIT_BREAKER_FAILURES = int(os.environ.get('ES_CIRCUIT_BREAKER_FAILURES') or 5)
+ES_CIRCUIT_BREAKER_RESET_TIMEOUT = int(os.environ.get('ES_CIRCUIT_BREAKER_RESET_TIMEOUT') or 30)
 
 LONG_TO_TERSE_LABELS = {
     "allocation_transfer_agency_id": "allocation_transfer_agency_id",
@@ -45,6 +45,7 @@ urlpatterns = [
     url(r'^api/v2/spending/', include('usaspending_api.spending_explorer.v2.urls')),
     url(r'^api-auth/', include('rest_framework.urls', namespace='rest_framework')),
     url(r'^docs/', include('usaspending_api.api_docs.urls')),
+    url(r'^status/cache/', views.CacheStatsView.as_view()),
     url(r'^status/', views.StatusView.as_view()),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 
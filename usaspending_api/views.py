@@ -1,7 +1,12 @@
 from django.http import HttpResponse
 from django.views import View
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 import json
 
+from usaspending_api.common.cache_decorator import cache_stats
+
 
 class StatusView(View):
     def get(self, request, format=None):
@@ -9,3 +14,11 @@ class StatusView(View):
             "status": "running"
         }
         return HttpResponse(json.dumps(response_object))
+
+
+class CacheStatsView(APIView):
+    """Response cache hit, miss and byte counters by path, for the process serving the request. Admins only"""
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, format=None):
+        return Response({"paths": cache_stats.as_dict()})